@@ -1,11 +1,10 @@
 from pathlib import Path
 import pandas as pd
 import numpy as np
+from pandas.core.dtypes.cast import find_common_type
 
+from src.pipeline.registry import SeriesPlugin, get_series
 
-F1_PATH = Path("data/f1/processed/f1_features.csv")
-F2_PATH = Path("data/f2/processed/f2_features.csv")
-F3_PATH = Path("data/f3/processed/f3_features.csv")
 
 OUTPUT_DIR = Path("data/all_series/processed")
 OUTPUT_PATH = OUTPUT_DIR / "all_series_master_features.csv"
@@ -17,88 +16,131 @@ def _load_csv(path: Path) -> pd.DataFrame:
     return pd.read_csv(path, low_memory=False)
 
 
-def load_f1_features(path: Path = F1_PATH) -> pd.DataFrame:
-    df = _load_csv(path)
-
-    # Harmonisierung Spaltennamen
-    df["series"] = "F1"  # safety
-    # F1 hat 'year' schon, Teamname heisst 'constructor_name'
-    if "team_name" not in df.columns and "constructor_name" in df.columns:
-        df["team_name"] = df["constructor_name"]
-
-    return df
-
-
-def load_f2_features(path: Path = F2_PATH) -> pd.DataFrame:
-    df = _load_csv(path)
-
-    # F2-Features haben bereits 'year' (aus race_date abgeleitet)
-    df["series"] = "F2"  # safety
-    # team_name existiert bereits
+def load_series_features(plugin: SeriesPlugin, path: Path | None = None) -> pd.DataFrame:
+    """Season-Features einer registrierten Serie, auf die gemeinsamen Spaltennamen gebracht."""
+    df = plugin.prepare(_load_csv(Path(path) if path is not None else plugin.features_path))
+    df["series"] = plugin.name  # safety
     return df
 
 
-def load_f3_features(path: Path = F3_PATH) -> pd.DataFrame:
-    df = _load_csv(path)
-
-    # F3-Features benutzen 'season' als Jahres-Spalte -> in 'year' umbenennen
-    if "season" in df.columns and "year" not in df.columns:
-        df = df.rename(columns={"season": "year"})
-
-    df["series"] = "F3"  # safety
-
-    return df
+def feature_paths(series: tuple[str, ...] | None = None) -> dict[str, Path]:
+    """Serie -> Season-Features für die Master-Tabelle (alle registrierten Serien)."""
+    return {p.name: p.features_path for p in get_series(series)}
 
 
 def build_all_series_master_features(
-    f1_path: Path = F1_PATH,
-    f2_path: Path = F2_PATH,
-    f3_path: Path = F3_PATH,
+    series: tuple[str, ...] | None = None,
     output_path: Path = OUTPUT_PATH,
 ) -> Path:
     """
-    Führt F1-, F2- und F3-Season-Features in einer Master-Tabelle zusammen.
+    Führt die Season-Features aller registrierten Serien (F1, F2, F3, ...)
+    in einer Master-Tabelle zusammen.
     - Harmonisiert Kernspalten (year, team_name)
-    - Vereinheitlicht die Spaltenmenge (Union aller Features)
-    - Fügt fehlende Spalten je Serie mit NaN hinzu
+    - Vereinheitlicht die Spaltenmenge (Union aller Features, gemeinsamer dtype)
+    - Fehlende Spalten einer Serie bleiben NaN
     """
 
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    f1 = load_f1_features(f1_path)
-    f2 = load_f2_features(f2_path)
-    f3 = load_f3_features(f3_path)
+    combined = build_all_series_master_frame(series)
 
-    # --- Spaltenmenge vereinheitlichen (Union) ---
+    combined.to_csv(output_path, index=False)
+    print(f"✅ All-series master features written to: {output_path} "
+          f"(rows={combined.shape[0]}, cols={combined.shape[1]})")
 
-    all_columns = sorted(set(f1.columns) | set(f2.columns) | set(f3.columns))
+    return output_path
 
-    def align_columns(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
-        for c in cols:
-            if c not in df.columns:
-                df[c] = np.nan
-        # Nur diese Spalten, in gleicher Reihenfolge
-        return df[cols].copy()
 
-    f1_aligned = align_columns(f1, all_columns)
-    f2_aligned = align_columns(f2, all_columns)
-    f3_aligned = align_columns(f3, all_columns)
+def build_all_series_master_frame(series: tuple[str, ...] | None = None) -> pd.DataFrame:
+    """Merge-Teil von build_all_series_master_features ohne Schreiben."""
+    return merge_series_frames([load_series_features(p) for p in get_series(series)])
 
-    # --- Zusammenführen ---
 
-    combined = pd.concat([f1_aligned, f2_aligned, f3_aligned], ignore_index=True)
+SORT_COLUMNS = ["series", "year", "driver_name"]
 
-    # Optional: sortieren nach Serie, Jahr, Fahrername
-    sort_cols = [c for c in ["series", "year", "driver_name"] if c in combined.columns]
-    if sort_cols:
-        combined = combined.sort_values(sort_cols).reset_index(drop=True)
 
-    combined.to_csv(output_path, index=False)
-    print(f"✅ All-series master features written to: {output_path} "
-          f"(rows={combined.shape[0]}, cols={combined.shape[1]})")
+def _common_dtype(dtypes: list):
+    """
+    Gemeinsamer dtype wie bei pd.concat; None = Spalte fehlt in der Serie.
 
-    return output_path
+    Fehlt die Spalte, zählt sie nur, wenn die vorhandenen dtypes keine
+    fehlenden Werte fassen (int -> float64, bool -> object). Nullable
+    Extension-dtypes (Int64, boolean, str, ...) bleiben erhalten.
+    """
+    present = [d for d in dtypes if d is not None]
+    if len(present) < len(dtypes) and not all(_holds_na(d) for d in present):
+        present.append(np.dtype(float))
+    if all(d == present[0] for d in present):
+        return present[0]
+    return find_common_type(present)
+
+
+def _holds_na(dtype) -> bool:
+    return not isinstance(dtype, np.dtype) or dtype.kind not in "iub"
+
+
+def union_schema(frames: list[pd.DataFrame]) -> dict:
+    """
+    Spaltenmenge (sortiert) und gemeinsamer dtype aller Serien. Fehlt eine
+    Spalte in einer Serie, wird sie dort mit fehlenden Werten aufgefüllt.
+    """
+    columns = sorted(set().union(*(df.columns for df in frames)))
+    schema = {}
+    for c in columns:
+        dtypes = [df[c].dtype if c in df.columns else None for df in frames]
+        schema[c] = _common_dtype(dtypes)
+    return schema
+
+
+def _sort_order(frames: list[pd.DataFrame], sort_cols: list[str]) -> np.ndarray:
+    """Stabile Sortierreihenfolge über alle Serien (NaN zuletzt), ohne die Tabelle zu kopieren."""
+    keys = []
+    for c in sort_cols:
+        values = pd.concat([df[c] if c in df.columns else pd.Series(np.nan, index=df.index) for df in frames],
+                           ignore_index=True)
+        codes, _ = pd.factorize(values, sort=True)
+        keys.append(np.where(codes < 0, codes.max() + 1, codes))
+    return np.lexsort(keys[::-1])
+
+
+def merge_series_frames(
+    frames: list[pd.DataFrame],
+    sort_cols: list[str] = SORT_COLUMNS,
+) -> pd.DataFrame:
+    """
+    Beliebig viele Serien-Tabellen zu einer Master-Tabelle (Union der Spalten).
+
+    Schema und Sortierung werden vorab bestimmt; jede Spalte wird einmal in
+    voller Länge angelegt und direkt an den sortierten Positionen befüllt
+    (kein Auffüllen pro Serie, kein concat, kein nachträgliches Sortieren).
+    """
+    frames = [df.reset_index(drop=True) for df in frames]
+    schema = union_schema(frames)
+    n = sum(len(df) for df in frames)
+
+    sort_cols = [c for c in sort_cols if c in schema]
+    order = _sort_order(frames, sort_cols) if sort_cols else np.arange(n)
+    # Zielposition jeder Eingabezeile
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n)
+    offsets = np.cumsum([0] + [len(df) for df in frames])
+
+    data = {}
+    for c, dtype in schema.items():
+        # Extension-dtypes (z.B. str) über object befüllen und am Ende umwandeln
+        storage = dtype if isinstance(dtype, np.dtype) else np.dtype(object)
+        column = np.empty(n, dtype=storage)
+        for df, start, stop in zip(frames, offsets[:-1], offsets[1:]):
+            target = position[start:stop]
+            if c in df.columns:
+                column[target] = df[c].to_numpy().astype(storage, copy=False)
+            else:
+                column[target] = storage.type("NaT") if storage.kind in "Mm" else np.nan
+        # dtype explizit, sonst wird aus object-Spalten wieder str abgeleitet
+        data[c] = pd.Series(column, dtype=dtype, copy=False)
+
+    return pd.DataFrame(data, copy=False)
 
 
 if __name__ == "__main__":
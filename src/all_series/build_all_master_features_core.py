@@ -1,20 +1,32 @@
 from pathlib import Path
 import pandas as pd
 
+from src.pipeline.registry import get_series
+
 OUT = Path("data/all_series/processed/all_series_master_features_core.csv")
 
-FILES = [
-    Path("data/f1/processed/f1_features_core.csv"),
-    Path("data/f2/processed/f2_features.csv"),
-    Path("data/f3/processed/f3_features.csv"),
-]
+
+def core_files(series: tuple[str, ...] | None = None) -> list[Path]:
+    """Core-Features aller registrierten Serien, die ein Core-Set haben."""
+    return [p.core_path for p in get_series(series) if p.core_path is not None]
+
 
 def main() -> None:
+    df = build_master_core_frame()
+
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(OUT, index=False)
+    print(f"Saved: {OUT} rows={len(df)} cols={len(df.columns)}")
+
+
+def build_master_core_frame(files: list[Path] | None = None) -> pd.DataFrame:
+    if files is None:
+        files = core_files()
     dfs = []
-    for p in FILES:
+    for p in files:
         if not p.exists():
             raise FileNotFoundError(f"Missing file: {p}")
-        dfs.append(pd.read_csv(p))
+        dfs.append(pd.read_csv(Path(p)))
 
     df = pd.concat(dfs, ignore_index=True)
 
@@ -24,11 +36,7 @@ def main() -> None:
 
     # optionale stabile Sortierung
     df = df.sort_values(["series", "year", "driver_name"], ignore_index=True)
-
-
-    OUT.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUT, index=False)
-    print(f"Saved: {OUT} rows={len(df)} cols={len(df.columns)}")
+    return df
 
 if __name__ == "__main__":
     main()
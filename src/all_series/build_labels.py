@@ -0,0 +1,192 @@
+"""
+Label f1_entry und zeitbasierte Train/Test-Splits (aus Notebook 02).
+
+Aus der Core-Master-Tabelle werden die F2/F3-Saisons gelabelt:
+    first_f1_year   erstes F1-Jahr desselben driver_code
+    f1_entry        first_f1_year liegt nach der Saison
+Pro (series, year, driver_code) bleibt die Zeile mit den meisten Rennen
+(dann Punkten); Saisons im Jahr des F1-Debüts fallen raus.
+
+Neben der Label-Datei liegt eine Zustandsdatei (<datei>.state.json) mit dem
+Hash der F2/F3-Zeilen und der verwendeten first_f1_year-Zuordnung. Ändert
+sich nur die F1-Historie, werden beim nächsten Lauf nur die Zeilen der
+Fahrer neu gelabelt, deren first_f1_year sich verschoben hat. Ändern sich
+die F2/F3-Zeilen oder fehlt der Zustand, wird komplett neu gebaut.
+
+Splits für mehrere Cutoffs entstehen aus derselben Label-Tabelle:
+    train_upto_<cutoff>.csv   year <= cutoff
+    test_after_<cutoff>.csv   cutoff < year <= test_end
+
+Beispiel:
+    python -m src.all_series.build_labels --cutoffs 2019 2020 2021
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.all_series.build_all_master_features_core import OUT as MASTER_CORE_PATH
+
+OUTPUT_DIR = Path("data/model_input")
+OUTPUT_PATH = OUTPUT_DIR / "f2_f3_features_with_f1_label.csv"
+SPLIT_DIR = OUTPUT_DIR / "splits"
+
+KEY = ["series", "year", "driver_code"]
+JUNIOR_SERIES = ["F2", "F3"]
+DEFAULT_CUTOFFS = [2021]
+TEST_END = 2023
+
+
+def first_f1_years(df: pd.DataFrame) -> pd.Series:
+    """Erstes F1-Jahr pro driver_code (ohne fehlende Codes)."""
+    f1 = df[(df["series"] == "F1") & ~df["driver_code"].isin(["\\N"]) & df["driver_code"].notna()]
+    return f1.groupby("driver_code")["year"].min()
+
+
+def junior_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """F2/F3-Zeilen, eine pro (series, year, driver_code), sortiert nach KEY."""
+    non_f1 = df[df["series"].isin(JUNIOR_SERIES)]
+    return non_f1.sort_values(
+        KEY + ["n_races", "total_points"], ascending=[True, True, True, False, False]
+    ).drop_duplicates(KEY, keep="first")
+
+
+def label_rows(junior: pd.DataFrame, first_f1_year: pd.Series) -> pd.DataFrame:
+    """Label per Join auf first_f1_year, Same-Year-Konflikte entfernt."""
+    out = junior.copy()
+    out["first_f1_year"] = out["driver_code"].map(first_f1_year).astype(float)
+    out["f1_entry"] = out["first_f1_year"].notna() & (out["first_f1_year"] > out["year"])
+    return out[~(out["first_f1_year"] == out["year"])]
+
+
+def build_label_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Label-Tabelle aus der Core-Master-Tabelle (voller Build)."""
+    return label_rows(junior_rows(df), first_f1_years(df))
+
+
+def state_path(output_path: str | Path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".state.json")
+
+
+def read_state(output_path: str | Path) -> dict | None:
+    sp = state_path(output_path)
+    if not Path(output_path).exists() or not sp.exists():
+        return None
+    try:
+        return json.loads(sp.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_state(output_path: str | Path, junior_hash: str, first_f1_year: pd.Series) -> None:
+    payload = {
+        "junior_hash": junior_hash,
+        "first_f1_year": {str(k): int(v) for k, v in first_f1_year.items()},
+    }
+    state_path(output_path).write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+
+
+def _frame_hash(df: pd.DataFrame) -> str:
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def changed_drivers(old: dict[str, int], new: pd.Series) -> set[str]:
+    """driver_codes, deren first_f1_year dazukam, wegfiel oder sich änderte."""
+    new_map = {str(k): int(v) for k, v in new.items()}
+    return {code for code in old.keys() | new_map.keys() if old.get(code) != new_map.get(code)}
+
+
+def update_labels(
+    input_path: str | Path = MASTER_CORE_PATH,
+    output_path: str | Path = OUTPUT_PATH,
+    full: bool = False,
+) -> pd.DataFrame:
+    """
+    Label-Datei aktualisieren und zurückgeben. Ohne gültigen Zustand oder
+    mit full=True wird komplett neu gebaut.
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    if not input_path.exists():
+        raise FileNotFoundError(f"Expected file not found: {input_path}")
+
+    df = pd.read_csv(input_path)
+    junior = junior_rows(df)
+    first = first_f1_years(df)
+    junior_hash = _frame_hash(junior)
+
+    state = None if full else read_state(output_path)
+    if state is None or state.get("junior_hash") != junior_hash:
+        print("ℹ️ Labels: voller Build")
+        labels = label_rows(junior, first)
+    else:
+        changed = changed_drivers(state.get("first_f1_year", {}), first)
+        if not changed:
+            print(f"✅ Labels up to date: {output_path}")
+            return pd.read_csv(output_path, float_precision="round_trip")
+
+        print(f"ℹ️ Labels: {len(changed)} Fahrer mit geändertem first_f1_year neu gelabelt")
+        existing = pd.read_csv(output_path, float_precision="round_trip")
+        kept = existing[~existing["driver_code"].isin(changed)]
+        fresh = label_rows(junior[junior["driver_code"].isin(changed)], first)
+        labels = pd.concat([kept, fresh], ignore_index=True).sort_values(KEY, kind="mergesort")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    labels.to_csv(output_path, index=False)
+    write_state(output_path, junior_hash, first)
+    print(f"✅ Labels written to: {output_path} (rows={len(labels)}, positives={int(labels['f1_entry'].sum())})")
+    return labels
+
+
+def write_splits(
+    labels: pd.DataFrame,
+    cutoffs: list[int] = DEFAULT_CUTOFFS,
+    test_end: int = TEST_END,
+    out_dir: str | Path = SPLIT_DIR,
+) -> list[Path]:
+    """Train/Test-Dateien für alle Cutoffs; Jahre werden einmal eingeordnet."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    cutoffs = sorted({int(c) for c in cutoffs})
+    year = labels["year"].to_numpy()
+    # Index des ersten Cutoffs >= year: Zeile ist im Train von cutoffs[j] genau dann, wenn slot <= j
+    slot = np.searchsorted(cutoffs, year, side="left")
+    in_test_range = year <= test_end
+
+    paths = []
+    for j, cutoff in enumerate(cutoffs):
+        train = labels[slot <= j]
+        test = labels[(slot > j) & in_test_range]
+        train_path = out_dir / f"train_upto_{cutoff}.csv"
+        test_path = out_dir / f"test_after_{cutoff}.csv"
+        train.to_csv(train_path, index=False)
+        test.to_csv(test_path, index=False)
+        print(f"✅ Split {cutoff}: train={len(train)} (pos={int(train['f1_entry'].sum())}), "
+              f"test={len(test)} (pos={int(test['f1_entry'].sum())})")
+        paths += [train_path, test_path]
+    return paths
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="F2/F3-Labels (f1_entry) und zeitbasierte Splits")
+    parser.add_argument("--cutoffs", type=int, nargs="+", default=DEFAULT_CUTOFFS, help="Train bis einschliesslich Jahr")
+    parser.add_argument("--test-end", type=int, default=TEST_END, help="Letztes Testjahr")
+    parser.add_argument("--input", type=Path, default=MASTER_CORE_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--split-dir", type=Path, default=SPLIT_DIR)
+    parser.add_argument("--full", action="store_true", help="Zustand ignorieren, komplett neu labeln")
+    args = parser.parse_args(argv)
+
+    labels = update_labels(args.input, args.output, full=args.full)
+    write_splits(labels, args.cutoffs, args.test_end, args.split_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Karriere-Features über mehrere Saisons auf der All-Series-Master-Tabelle.
+
+Pro Zeile (Fahrer, Serie, Jahr) kommen dazu:
+    career_*     kumuliert über alle Serien, alle Saisons bis einschliesslich year
+    *_{W}y       Fenster der letzten W Jahre (year-W, year], W aus
+                 racing_criteria.json (points_window_years)
+    prev_*       Vorsaison desselben Fahrers in derselben Serie
+    delta_*      aktuelle Saison minus Vorsaison
+
+Es fliessen nur Saisons bis zum Jahr der Zeile ein (keine Zukunftsdaten).
+Fahrer werden über die person_id aus dem Crosswalk (src/all_series/identity.py)
+identifiziert; ohne Crosswalk wie beim Labeling über driver_code, fehlt der
+Code (ältere F1-Jahre), zählt der Name.
+
+Gerechnet wird ohne Schleife über Fahrer: Zeilen einmal nach (Fahrer, Jahr)
+sortieren, kumulative Summen bilden und Fenster per searchsorted als
+Differenz zweier Präfixsummen lesen. Aufwand ~ n log n in der Zeilenzahl.
+
+Beispiel:
+    python -m src.all_series.build_rolling_features
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.all_series.build_all_master_features import OUTPUT_DIR, OUTPUT_PATH as MASTER_PATH
+from src.all_series.identity import OUTPUT_PATH as CROSSWALK_PATH, attach_person_ids
+from src.common.features import require_columns
+
+OUTPUT_PATH = OUTPUT_DIR / "all_series_rolling_features.csv"
+CRITERIA_PATH = Path("src/knowledge_base/racing_criteria.json")
+
+# Zählgrössen, die kumuliert und im Fenster summiert werden (fehlend = 0)
+SUM_COLUMNS = {
+    "n_races": "n_races",
+    "points": "total_points",
+    "wins": "wins",
+    "podiums": "podiums",
+}
+
+
+def window_years_from_criteria(path: str | Path = CRITERIA_PATH) -> int:
+    """points_window_years aus den F1-Anforderungen (Superlizenz-Fenster)."""
+    with open(path, encoding="utf-8") as f:
+        criteria = json.load(f)
+    return int(criteria["series_rules"]["f1"]["requirements"]["points_window_years"])
+
+
+def driver_keys(df: pd.DataFrame, crosswalk: pd.DataFrame | None = None) -> pd.Series:
+    """Fahrer-Identität über alle Serien: person_id, sonst driver_code, sonst driver_name."""
+    code = df["driver_code"].astype("string").str.strip()
+    code = code.mask(code.isin(["", "\\N"]))
+    name = "name:" + df["driver_name"].astype("string").str.strip()
+    keys = code.fillna(name)
+    if crosswalk is not None:
+        keys = ("person:" + attach_person_ids(df, crosswalk)).fillna(keys)
+    return keys
+
+
+def _segments(*keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sortierreihenfolge nach keys (erster Key zuerst) und Start-Offsets gleicher Schlüssel."""
+    order = np.lexsort(keys[::-1])
+    change = np.zeros(max(len(order) - 1, 0), dtype=bool)
+    for key in keys:
+        k = key[order]
+        change |= k[1:] != k[:-1]
+    starts = np.r_[0, np.flatnonzero(change) + 1] if len(order) else np.zeros(0, dtype=np.int64)
+    return order, starts
+
+
+def _prefix_before(cs: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Präfixsumme vor Position idx (0 für idx == 0)."""
+    zero = np.zeros((1,) + cs.shape[1:])
+    return np.concatenate([zero, cs])[idx]
+
+
+def build_rolling_frame(
+    master: pd.DataFrame,
+    crosswalk: pd.DataFrame | None = None,
+    window_years: int | None = None,
+) -> pd.DataFrame:
+    """
+    Master-Tabelle plus Karriere-, Fenster- und Vorsaison-Features
+    (gleiche Zeilen, gleiche Reihenfolge). Mit crosswalk werden F1-, F2- und
+    F3-Zeilen derselben Person zusammengezählt.
+    """
+    require_columns(
+        master.columns,
+        {"series", "year", "driver_name", "driver_code", "n_races", "total_points", "wins", "podiums", "avg_finish"},
+        "Rolling features",
+    )
+    if window_years is None:
+        window_years = window_years_from_criteria()
+    w = int(window_years)
+
+    out = master.copy()
+    n = len(out)
+
+    key_codes, _ = pd.factorize(driver_keys(out, crosswalk))
+    years = pd.to_numeric(out["year"], errors="coerce").to_numpy(dtype=float)
+    valid = (key_codes >= 0) & ~np.isnan(years)
+    rows = np.flatnonzero(valid)
+    key = key_codes[rows].astype(np.int64)
+    year = years[rows].astype(np.int64)
+
+    sums = np.column_stack(
+        [pd.to_numeric(out[col], errors="coerce").fillna(0).to_numpy(dtype=float)[rows] for col in SUM_COLUMNS.values()]
+    )
+
+    # --- (Fahrer, Jahr): Saisonsummen über alle Serien ---
+    order, starts = _segments(key, year)
+    season_sums = np.add.reduceat(sums[order], starts, axis=0) if len(starts) else sums[:0]
+    s_key, s_year = key[order][starts], year[order][starts]
+    row_season = np.empty(len(rows), dtype=np.int64)
+    row_season[order] = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+
+    # Erster Eintrag des Fahrers in der Saison-Tabelle
+    driver_start = np.r_[0, np.flatnonzero(s_key[1:] != s_key[:-1]) + 1] if len(s_key) else s_key
+    first_of_driver = np.repeat(driver_start, np.diff(np.r_[driver_start, len(s_key)]))
+
+    cs = np.cumsum(season_sums, axis=0)
+    career = cs - _prefix_before(cs, first_of_driver)
+
+    # Fenster (year - w, year]: erste Saison desselben Fahrers mit Jahr > year - w
+    span = int(s_year.max() - s_year.min() + w + 1) if len(s_year) else 1
+    composite = s_key * span + (s_year - (s_year.min() if len(s_year) else 0))
+    window_start = np.searchsorted(composite, composite - w, side="right")
+    window_start = np.maximum(window_start, first_of_driver)
+    windowed = cs - _prefix_before(cs, window_start)
+
+    career_seasons = np.arange(len(s_key)) - first_of_driver + 1
+    first_year = s_year[first_of_driver]
+
+    def to_rows(values: np.ndarray) -> np.ndarray:
+        full = np.full(n, np.nan)
+        full[rows] = values[row_season]
+        return full
+
+    out["career_first_year"] = to_rows(first_year.astype(float))
+    out["career_years"] = years - out["career_first_year"]
+    out["career_seasons"] = to_rows(career_seasons.astype(float))
+    for i, name in enumerate(SUM_COLUMNS):
+        out[f"career_{name}"] = to_rows(career[:, i])
+    out["career_win_rate"] = out["career_wins"] / out["career_n_races"]
+    out["career_podium_rate"] = out["career_podiums"] / out["career_n_races"]
+    for i, name in enumerate(SUM_COLUMNS):
+        out[f"{name}_{w}y"] = to_rows(windowed[:, i])
+
+    _add_previous_season(out, rows, key, year)
+
+    return out
+
+
+def _add_previous_season(out: pd.DataFrame, rows: np.ndarray, key: np.ndarray, year: np.ndarray) -> None:
+    """prev_*/delta_* aus der Vorsaison desselben Fahrers in derselben Serie."""
+    n = len(out)
+    series_codes, _ = pd.factorize(out["series"].to_numpy()[rows])
+
+    n_races = pd.to_numeric(out["n_races"], errors="coerce").fillna(0).to_numpy(dtype=float)[rows]
+    finish = pd.to_numeric(out["avg_finish"], errors="coerce").to_numpy(dtype=float)[rows]
+    finish_w = np.where(np.isnan(finish), 0.0, finish * n_races)
+    finish_n = np.where(np.isnan(finish), 0.0, n_races)
+    wins = pd.to_numeric(out["wins"], errors="coerce").fillna(0).to_numpy(dtype=float)[rows]
+    podiums = pd.to_numeric(out["podiums"], errors="coerce").fillna(0).to_numpy(dtype=float)[rows]
+
+    # Mehrere Zeilen pro (Fahrer, Serie, Jahr), z.B. Teamwechsel -> nach Rennen gewichtet
+    order, starts = _segments(key, series_codes, year)
+    stacked = np.column_stack([n_races, wins, podiums, finish_w, finish_n])[order]
+    season = np.add.reduceat(stacked, starts, axis=0) if len(starts) else stacked
+    s_key = key[order][starts]
+    s_series = series_codes[order][starts]
+    s_year = year[order][starts]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_rate = season[:, 1] / season[:, 0]
+        podium_rate = season[:, 2] / season[:, 0]
+        avg_finish = season[:, 3] / season[:, 4]
+
+    # Vorgänger in der sortierten Saison-Tabelle, falls gleicher Fahrer und gleiche Serie
+    same = np.r_[False, (s_key[1:] == s_key[:-1]) & (s_series[1:] == s_series[:-1])]
+    prev = np.where(same, np.arange(len(s_key)) - 1, -1)
+
+    series_start = np.flatnonzero(~same)
+    first_in_series = np.repeat(series_start, np.diff(np.r_[series_start, len(s_key)]))
+    series_seasons = np.arange(len(s_key)) - first_in_series + 1
+
+    row_season = np.empty(len(rows), dtype=np.int64)
+    row_season[order] = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+
+    def lagged(values: np.ndarray) -> np.ndarray:
+        return np.where(prev >= 0, values[np.maximum(prev, 0)], np.nan)
+
+    def to_rows(values: np.ndarray) -> np.ndarray:
+        full = np.full(n, np.nan)
+        full[rows] = values[row_season]
+        return full
+
+    out["series_seasons"] = to_rows(series_seasons.astype(float))
+    out["prev_season_year"] = to_rows(lagged(s_year.astype(float)))
+    for name, current in [("win_rate", win_rate), ("podium_rate", podium_rate), ("avg_finish", avg_finish)]:
+        previous = lagged(current)
+        out[f"prev_{name}"] = to_rows(previous)
+        out[f"delta_{name}"] = to_rows(current - previous)
+
+
+def build_rolling_features(
+    input_path: str | Path = MASTER_PATH,
+    output_path: str | Path = OUTPUT_PATH,
+    window_years: int | None = None,
+    crosswalk_path: str | Path = CROSSWALK_PATH,
+) -> Path:
+    """Liest die Master-Tabelle, ergänzt die Karriere-Features und schreibt sie."""
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    if not input_path.exists():
+        raise FileNotFoundError(f"Expected file not found: {input_path}")
+
+    crosswalk = None
+    if Path(crosswalk_path).exists():
+        crosswalk = pd.read_csv(crosswalk_path, low_memory=False)
+    else:
+        print(f"ℹ️ No person crosswalk at {crosswalk_path}, using driver_code as identity")
+
+    rolling = build_rolling_frame(pd.read_csv(input_path, low_memory=False), crosswalk, window_years)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    rolling.to_csv(output_path, index=False)
+    print(f"✅ All-series rolling features written to: {output_path} "
+          f"(rows={rolling.shape[0]}, cols={rolling.shape[1]})")
+    return output_path
+
+
+if __name__ == "__main__":
+    build_rolling_features()
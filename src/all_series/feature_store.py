@@ -0,0 +1,318 @@
+"""
+Feature Store über die All-Series-Master-Tabelle (Core).
+
+Statt die ganze Tabelle für jeden Fahrer / jedes Jahr mit einer Maske zu
+filtern, wird sie einmal nach (driver_code, series, year) sortiert und mit
+einem Index abgelegt:
+
+    data/all_series/feature_store/
+        features.parquet   Tabelle, sortiert nach (driver_code, series, year)
+        index.npz          sortierte Schlüssel + Jahres-Index
+        meta.json          Quelle (Pfad, Grösse, mtime, SHA-256)
+
+Abfragen laufen per Binärsuche (searchsorted) auf den sortierten Schlüsseln,
+also O(log n) pro Schlüssel, auch als Batch für tausende Fahrer.
+
+"As-of" heisst: pro Serie die letzte Saison mit year <= as_of_year. Spätere
+Saisons sind damit nie im Ergebnis (gleiche Regel wie beim Labeling).
+
+Ändert sich die Quelle, wird der Store beim Öffnen neu gebaut.
+
+Beispiel:
+    python -m src.all_series.feature_store VER --as-of 2016
+    python -m src.all_series.feature_store VER LEC NOR --as-of 2018 --series F2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.all_series.build_all_master_features_core import OUT as SOURCE_PATH
+from src.common.features import require_columns
+from src.common.io import read_table, write_table
+from src.pipeline.cache import hash_path
+
+STORE_DIR = Path("data/all_series/feature_store")
+KEY_COLUMNS = ["driver_code", "series", "year"]
+
+
+def normalize_driver_codes(values) -> pd.Series:
+    """driver_code wie im Demo-Runner: Grossbuchstaben, ohne Leerzeichen; '\\N' und leer -> fehlend."""
+    codes = pd.Series(values, dtype="string").str.strip().str.upper()
+    return codes.mask(codes.isin(["", "\\N", "NAN"]))
+
+
+@dataclass
+class FeatureStore:
+    table: pd.DataFrame        # sortiert nach (driver_code, series, year)
+    drivers: np.ndarray        # eindeutige driver_codes, sortiert
+    series: np.ndarray         # eindeutige Serien, sortiert
+    keys: np.ndarray           # zusammengesetzter Schlüssel je Zeile (aufsteigend)
+    year_order: np.ndarray     # Zeilen nach Jahr sortiert
+    year_sorted: np.ndarray    # Jahre in year_order-Reihenfolge
+    year_min: int
+    year_span: int
+
+    # --- Aufbau ---
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> FeatureStore:
+        require_columns(df.columns, KEY_COLUMNS, "Feature store")
+        table = df.copy()
+        table["driver_code"] = normalize_driver_codes(table["driver_code"])
+        table["year"] = pd.to_numeric(table["year"], errors="coerce").astype("Int64")
+        table = table.dropna(subset=["year"])
+
+        drivers = np.sort(np.asarray(table["driver_code"].dropna().unique(), dtype=str))
+        series = np.sort(np.asarray(table["series"].astype(str).unique(), dtype=str))
+        year_min = int(table["year"].min()) if len(table) else 0
+        year_span = int(table["year"].max()) - year_min + 1 if len(table) else 1
+
+        # Zeilen ohne driver_code ans Ende (Code = len(drivers)), nur über year abfragbar
+        d_idx = np.searchsorted(drivers, table["driver_code"].fillna("").to_numpy(dtype=str))
+        d_idx = np.where(table["driver_code"].isna().to_numpy(), len(drivers), d_idx)
+        s_idx = np.searchsorted(series, table["series"].astype(str).to_numpy())
+        years = table["year"].to_numpy(dtype=np.int64)
+
+        keys = cls._compose(d_idx, s_idx, years, len(series), year_min, year_span)
+        order = np.argsort(keys, kind="stable")
+        table = table.iloc[order].reset_index(drop=True)
+        keys = keys[order]
+
+        years = years[order]
+        year_order = np.argsort(years, kind="stable")
+        return cls(
+            table=table,
+            drivers=drivers,
+            series=series,
+            keys=keys,
+            year_order=year_order,
+            year_sorted=years[year_order],
+            year_min=year_min,
+            year_span=year_span,
+        )
+
+    @staticmethod
+    def _compose(d_idx, s_idx, years, n_series: int, year_min: int, year_span: int) -> np.ndarray:
+        d_idx = np.asarray(d_idx, dtype=np.int64)
+        s_idx = np.asarray(s_idx, dtype=np.int64)
+        years = np.asarray(years, dtype=np.int64)
+        return (d_idx * n_series + s_idx) * year_span + (years - year_min)
+
+    # --- Ablage ---
+
+    def save(self, store_dir: str | Path = STORE_DIR, source_path: str | Path | None = None) -> Path:
+        store_dir = Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        write_table(self.table, store_dir / "features.parquet")
+        np.savez(
+            store_dir / "index.npz",
+            drivers=self.drivers,
+            series=self.series,
+            keys=self.keys,
+            year_order=self.year_order,
+            year_sorted=self.year_sorted,
+            bounds=np.array([self.year_min, self.year_span]),
+        )
+        meta = {"source": _source_signature(source_path) if source_path is not None else None}
+        (store_dir / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return store_dir
+
+    @classmethod
+    def load(cls, store_dir: str | Path = STORE_DIR) -> FeatureStore:
+        store_dir = Path(store_dir)
+        table = read_table(store_dir / "features.parquet")
+        with np.load(store_dir / "index.npz", allow_pickle=False) as idx:
+            year_min, year_span = (int(v) for v in idx["bounds"])
+            return cls(
+                table=table,
+                drivers=idx["drivers"],
+                series=idx["series"],
+                keys=idx["keys"],
+                year_order=idx["year_order"],
+                year_sorted=idx["year_sorted"],
+                year_min=year_min,
+                year_span=year_span,
+            )
+
+    # --- Abfragen ---
+
+    def _driver_index(self, drivers) -> np.ndarray:
+        """Position der driver_codes in self.drivers, -1 wenn unbekannt."""
+        codes = normalize_driver_codes(drivers).fillna("").to_numpy(dtype=str)
+        pos = np.searchsorted(self.drivers, codes)
+        pos_clipped = np.minimum(pos, max(len(self.drivers) - 1, 0))
+        found = (pos < len(self.drivers)) & (self.drivers[pos_clipped] == codes) if len(self.drivers) else pos < 0
+        return np.where(found, pos, -1)
+
+    def _series_index(self, series: str | Iterable[str] | None) -> np.ndarray:
+        if series is None:
+            return np.arange(len(self.series))
+        wanted = [series] if isinstance(series, str) else list(series)
+        unknown = set(wanted) - set(self.series)
+        if unknown:
+            raise KeyError(f"Unbekannte Serie(n): {sorted(unknown)} (vorhanden: {list(self.series)})")
+        return np.searchsorted(self.series, wanted)
+
+    def _rows_between(self, lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Zeilen der Bereiche [lo, hi) und zu welchem Bereich sie gehören."""
+        counts = np.maximum(hi - lo, 0)
+        which = np.repeat(np.arange(len(lo)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(lo, counts) + offsets, which
+
+    def get_features_batch(
+        self,
+        drivers: Iterable[str],
+        as_of_years: int | Iterable[int],
+        series: str | Iterable[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        As-of-Lookup für viele Fahrer auf einmal.
+
+        Pro (Fahrer, Serie) die letzte Saison mit year <= as_of_year; bei
+        doppelten Schlüsseln alle Zeilen dieser Saison. Spalten query_driver
+        und as_of_year zeigen, zu welcher Anfrage eine Zeile gehört.
+        Unbekannte Fahrer oder Fahrer ohne Saison bis as_of_year fehlen.
+        """
+        drivers = list(drivers)
+        as_of = np.broadcast_to(np.asarray(as_of_years, dtype=np.int64), (len(drivers),))
+        d_idx = self._driver_index(drivers)
+        s_idx = self._series_index(series)
+
+        # Anfrage x Serie
+        q = np.repeat(np.arange(len(drivers)), len(s_idx))
+        q_series = np.tile(s_idx, len(drivers))
+        q_driver = d_idx[q]
+        q_year = np.minimum(as_of[q], self.year_min + self.year_span - 1)
+        ok = (q_driver >= 0) & (q_year >= self.year_min)
+
+        # Schlüssel der ersten möglichen Saison (Blockanfang) und des Stichjahrs
+        n_series, driver = len(self.series), np.maximum(q_driver, 0)
+        block = self._compose(driver, q_series, self.year_min, n_series, self.year_min, self.year_span)
+        target = self._compose(
+            driver, q_series, np.maximum(q_year, self.year_min), n_series, self.year_min, self.year_span
+        )
+
+        hi = np.searchsorted(self.keys, target, side="right")
+        last = hi - 1
+        ok &= last >= 0
+        last_key = self.keys[np.maximum(last, 0)]
+        ok &= last_key >= block
+        lo = np.searchsorted(self.keys, last_key, side="left")
+
+        rows, which = self._rows_between(lo[ok], hi[ok])
+        hits = np.flatnonzero(ok)[which]
+
+        result = self.table.iloc[rows].reset_index(drop=True)
+        result.insert(0, "as_of_year", as_of[q[hits]])
+        result.insert(0, "query_driver", np.asarray(drivers, dtype=object)[q[hits]])
+        return result
+
+    def get_features(self, driver: str, as_of_year: int, series: str | Iterable[str] | None = None) -> pd.DataFrame:
+        """As-of-Features eines Fahrers: pro Serie die letzte Saison mit year <= as_of_year."""
+        return self.get_features_batch([driver], as_of_year, series).drop(columns=["query_driver", "as_of_year"])
+
+    def get_history(self, driver: str, as_of_year: int | None = None) -> pd.DataFrame:
+        """Alle Saisons eines Fahrers (optional nur bis as_of_year), nach Serie und Jahr."""
+        d = self._driver_index([driver])[0]
+        if d < 0:
+            return self.table.iloc[0:0]
+        width = len(self.series) * self.year_span
+        lo = np.searchsorted(self.keys, d * width, side="left")
+        hi = np.searchsorted(self.keys, (d + 1) * width, side="left")
+        rows = self.table.iloc[lo:hi]
+        if as_of_year is not None:
+            rows = rows[rows["year"] <= as_of_year]
+        return rows.reset_index(drop=True)
+
+    def get_season(self, year: int, series: str | None = None) -> pd.DataFrame:
+        """Alle Fahrer einer Saison (optional einer Serie)."""
+        lo = np.searchsorted(self.year_sorted, year, side="left")
+        hi = np.searchsorted(self.year_sorted, year, side="right")
+        rows = self.table.iloc[np.sort(self.year_order[lo:hi])]
+        if series is not None:
+            rows = rows[rows["series"] == series]
+        return rows.reset_index(drop=True)
+
+
+def _source_signature(path: str | Path) -> dict:
+    path = Path(path)
+    stat = path.stat()
+    return {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": hash_path(path)}
+
+
+def _is_fresh(store_dir: Path, source_path: Path) -> bool:
+    meta_path = store_dir / "meta.json"
+    if not meta_path.exists() or not (store_dir / "index.npz").exists() or not (store_dir / "features.parquet").exists():
+        return False
+    try:
+        source = json.loads(meta_path.read_text(encoding="utf-8"))["source"]
+    except (OSError, ValueError, KeyError):
+        return False
+    if not source:
+        return False
+    stat = source_path.stat()
+    if source.get("size") == stat.st_size and source.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    # mtime geändert (z.B. nach git checkout): Inhalt vergleichen
+    return source.get("sha256") == hash_path(source_path)
+
+
+def build_feature_store(
+    source_path: str | Path = SOURCE_PATH,
+    store_dir: str | Path = STORE_DIR,
+) -> FeatureStore:
+    """Baut den Store aus der Master-Tabelle und legt ihn ab."""
+    source_path = Path(source_path)
+    store = FeatureStore.from_frame(read_table(source_path))
+    store.save(store_dir, source_path)
+    print(f"✅ Feature store written to: {store_dir} (rows={len(store.table)}, drivers={len(store.drivers)})")
+    return store
+
+
+def open_feature_store(
+    source_path: str | Path = SOURCE_PATH,
+    store_dir: str | Path = STORE_DIR,
+) -> FeatureStore:
+    """Öffnet den abgelegten Store; ist er veraltet oder fehlt er, wird er neu gebaut."""
+    source_path = Path(source_path)
+    store_dir = Path(store_dir)
+    if not source_path.exists():
+        raise FileNotFoundError(f"Expected file not found: {source_path}")
+    if _is_fresh(store_dir, source_path):
+        return FeatureStore.load(store_dir)
+    print(f"ℹ️ Feature store fehlt oder ist veraltet, baue neu aus {source_path}")
+    return build_feature_store(source_path, store_dir)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="As-of-Abfragen auf der All-Series-Master-Tabelle")
+    parser.add_argument("drivers", nargs="*", help="driver_codes, z.B. VER LEC")
+    parser.add_argument("--as-of", type=int, default=None, help="Stichjahr (Standard: letztes Jahr)")
+    parser.add_argument("--series", default=None, help="Nur diese Serie (F1, F2, F3)")
+    parser.add_argument("--source", type=Path, default=SOURCE_PATH)
+    parser.add_argument("--store-dir", type=Path, default=STORE_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="Store neu bauen")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        store = build_feature_store(args.source, args.store_dir)
+    else:
+        store = open_feature_store(args.source, args.store_dir)
+
+    if args.drivers:
+        as_of = args.as_of if args.as_of is not None else store.year_min + store.year_span - 1
+        result = store.get_features_batch(args.drivers, as_of, args.series)
+        with pd.option_context("display.max_columns", 12, "display.width", 160):
+            print(result if len(result) else "Keine Treffer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Personen-Zuordnung über F1, F2 und F3 (person_id-Crosswalk).
+
+F2/F3 führen Fahrer als 'A  Albon' + Code, F1 als 'Alexander Albon' mit
+driver_id; driver_code allein kollidiert (PER: Pérez / Peroni, SCH) und
+fehlt bei vielen historischen F1-Fahrern. Hier wird jede Erwähnung
+    F1:    eine driver_id
+    F2/F3: ein (driver_name, driver_code) pro Serie
+einer Person zugeordnet.
+
+Ablauf:
+    1. Namen normalisieren (Akzente, Gross/klein, Leerzeichen) und in
+       Initiale + Nachname zerlegen
+    2. Blocking über einen invertierten Index: Nachnamen-Trigramme,
+       driver_code und Team-Jahr (Team in Saison y oder y+1, der übliche
+       Aufstieg F3 -> F2 im selben Team) -> Kandidatenpaare nur zwischen
+       Erwähnungen, die sich einen Schlüssel teilen. Sehr häufige
+       Trigramme und Team-Jahre (> MAX_POSTINGS Erwähnungen) werden
+       ignoriert, der Aufwand bleibt damit unter quadratisch.
+    3. Score pro Paar: Nachnamen-Ähnlichkeit (Trigramm-Jaccard über alle
+       Trigramme, auch die beim Blocking ignorierten), Initiale,
+       Code, gemeinsames Team (F3 -> F2 häufig dasselbe Team). Abweichende
+       Initialen schliessen ein Paar aus. Zeitlich muss es passen: die
+       tiefere Serie endet höchstens MAX_GAP_YEARS vor bzw.
+       MAX_OVERLAP_YEARS nach dem Start in der höheren Serie.
+    4. Paare absteigend nach Score zusammenführen; eine Person hat pro
+       Serie höchstens eine Erwähnung (und damit höchstens eine driver_id).
+
+person_id: 'F1-<driver_id>' für Personen mit F1-Start, sonst
+'<Serie>-<name>-<erstes Jahr>' der frühesten Erwähnung (z.B. 'F3-a-iwasa-2021').
+
+Beispiel:
+    python -m src.all_series.identity
+"""
+from __future__ import annotations
+
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.all_series.build_all_master_features import OUTPUT_DIR, OUTPUT_PATH as MASTER_PATH
+from src.common.features import require_columns
+from src.pipeline.registry import series_levels
+
+OUTPUT_PATH = OUTPUT_DIR / "person_crosswalk.csv"
+
+MAX_POSTINGS = 500
+MIN_SCORE = 0.7
+MAX_GAP_YEARS = 10
+MAX_OVERLAP_YEARS = 3
+
+WEIGHTS = {"surname": 0.5, "initial": 0.2, "code": 0.2, "team": 0.1}
+
+CROSSWALK_COLUMNS = [
+    "person_id",
+    "series",
+    "driver_id",
+    "driver_name",
+    "driver_code",
+    "first_year",
+    "last_year",
+    "match_score",
+]
+
+
+def normalize_name(values: pd.Series) -> pd.Series:
+    """Kleinbuchstaben, ohne Akzente und Satzzeichen, einfache Leerzeichen."""
+    def _plain(s: str) -> str:
+        return "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+
+    text = values.astype("string").fillna("").map(_plain, na_action="ignore")
+    return (
+        text.str.lower()
+        .str.replace(r"[^a-z0-9 ]+", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _trigrams(surname: str) -> list[str]:
+    padded = f"#{surname}#"
+    return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+
+def build_mentions(master: pd.DataFrame) -> pd.DataFrame:
+    """
+    Eine Zeile pro Erwähnung: F1 pro driver_id, sonst pro
+    (series, driver_name, driver_code). Mit Jahresspanne und Teams.
+    """
+    require_columns(master.columns, {"series", "year", "driver_name", "driver_code", "team_name"}, "Identity")
+    df = master[[c for c in ["series", "year", "driver_id", "driver_name", "driver_code", "team_name"] if c in master]]
+    df = df.copy()
+    if "driver_id" not in df.columns:
+        df["driver_id"] = np.nan
+
+    df["mention_key"] = _mention_keys(df)
+    df["series"] = df["series"].astype(str).str.upper()
+    df["driver_code"] = _clean_codes(df["driver_code"])
+    df["name_norm"] = normalize_name(df["driver_name"])
+    df["team_norm"] = normalize_name(df["team_name"])
+    df["year"] = pd.to_numeric(df["year"], errors="coerce")
+
+    mentions = (
+        df.groupby("mention_key", sort=True)
+        .agg(
+            series=("series", "first"),
+            driver_id=("driver_id", "first"),
+            driver_name=("driver_name", "first"),
+            driver_code=("driver_code", "first"),
+            name_norm=("name_norm", "first"),
+            first_year=("year", "min"),
+            last_year=("year", "max"),
+        )
+        .reset_index()
+    )
+    team_pairs = df.loc[df["team_norm"] != "", ["mention_key", "team_norm"]].drop_duplicates()
+    teams = team_pairs.groupby("mention_key")["team_norm"].agg(frozenset)
+    mentions["teams"] = [teams.get(k, frozenset()) for k in mentions["mention_key"]]
+    seasons = df.loc[(df["team_norm"] != "") & df["year"].notna(), ["mention_key", "team_norm", "year"]]
+    team_years = (
+        seasons.assign(team_year=list(zip(seasons["team_norm"], seasons["year"].astype(int))))
+        .groupby("mention_key")["team_year"]
+        .agg(frozenset)
+    )
+    mentions["team_years"] = [team_years.get(k, frozenset()) for k in mentions["mention_key"]]
+
+    tokens = mentions["name_norm"].str.split(" ")
+    mentions["initial"] = tokens.str[0].str[:1]
+    mentions["surname"] = tokens.str[1:].str.join(" ")
+    # Einzelnes Namensteil (z.B. nur Nachname) -> als Nachname verwenden
+    single = mentions["surname"] == ""
+    mentions.loc[single, "surname"] = mentions.loc[single, "name_norm"]
+    mentions.loc[single, "initial"] = ""
+    mentions["grams"] = mentions["surname"].map(lambda s: frozenset(_trigrams(s)))
+
+    # Stufe auf der Nachwuchsleiter aus der Serien-Registry (unbekannt = ganz unten)
+    mentions["rank"] = mentions["series"].map(series_levels()).fillna(-1).astype(int)
+    return mentions
+
+
+def candidate_pairs(mentions: pd.DataFrame, max_postings: int = MAX_POSTINGS) -> pd.DataFrame:
+    """
+    Kandidatenpaare (m_a, m_b) mit rank[m_a] < rank[m_b] über den
+    invertierten Index: gemeinsames Nachnamen-Trigramm, gleicher
+    driver_code oder gemeinsames Team-Jahr.
+    """
+    rank = mentions["rank"].to_numpy()
+    grams = _postings(mentions["grams"], max_postings)
+    # Gleicher Code blockt ebenfalls (auch bei ganz anderer Schreibweise des Namens)
+    codes = _postings(mentions["driver_code"])
+    # Team in Saison y -> Schlüssel y und y+1: Aufstieg im selben Team ins Folgejahr
+    team_years = _postings(
+        mentions["team_years"].map(lambda tys: [f"{team}|{year + d}" for team, year in tys for d in (0, 1)]),
+        max_postings,
+    )
+    pairs = pd.concat([_pairs_sharing_key(p, rank) for p in (grams, codes, team_years)], ignore_index=True)
+    return pairs.drop_duplicates().sort_values(["m_a", "m_b"]).reset_index(drop=True)
+
+
+def _postings(keys: pd.Series, max_postings: int | None = None) -> pd.DataFrame:
+    """Invertierter Index (key, m); Schlüssel mit > max_postings Erwähnungen fallen weg."""
+    postings = keys.rename("key").rename_axis("m").explode().dropna().reset_index().drop_duplicates()
+    if max_postings is not None:
+        postings = postings[postings.groupby("key")["m"].transform("size") <= max_postings]
+    return postings
+
+
+def _pairs_sharing_key(postings: pd.DataFrame, rank: np.ndarray) -> pd.DataFrame:
+    by_key = postings.merge(postings, on="key", suffixes=("_a", "_b"))
+    by_key = by_key[rank[by_key["m_a"].to_numpy()] < rank[by_key["m_b"].to_numpy()]]
+    return by_key[["m_a", "m_b"]]
+
+
+def score_pairs(mentions: pd.DataFrame, pairs: pd.DataFrame) -> pd.DataFrame:
+    """Score je Kandidatenpaar, zeitlich unplausible Paare werden verworfen."""
+    a = pairs["m_a"].to_numpy()
+    b = pairs["m_b"].to_numpy()
+
+    grams = mentions["grams"].to_numpy()
+    shared = np.fromiter((len(grams[i] & grams[j]) for i, j in zip(a, b)), dtype=np.int64, count=len(a))
+    n_grams = mentions["grams"].map(len).to_numpy()
+    surname_sim = shared / (n_grams[a] + n_grams[b] - shared)
+
+    initial = mentions["initial"].to_numpy(dtype=object)
+    same_initial = (initial[a] == initial[b]) & (initial[a] != "")
+    # Verschiedene Initialen = verschiedene Personen (D. vs. M. Schumacher)
+    other_initial = (initial[a] != initial[b]) & (initial[a] != "") & (initial[b] != "")
+
+    code = mentions["driver_code"].fillna("").to_numpy(dtype=object)
+    same_code = (code[a] == code[b]) & (code[a] != "")
+
+    teams = mentions["teams"].to_numpy()
+    shared_team = np.fromiter((bool(teams[i] & teams[j]) for i, j in zip(a, b)), dtype=bool, count=len(a))
+
+    score = (
+        WEIGHTS["surname"] * surname_sim
+        + WEIGHTS["initial"] * same_initial
+        + WEIGHTS["code"] * same_code
+        + WEIGHTS["team"] * shared_team
+    )
+
+    # a ist die tiefere Serie: Ende in a nicht zu lange vor und nicht zu weit nach dem Start in b
+    first = mentions["first_year"].to_numpy()
+    last = mentions["last_year"].to_numpy()
+    gap = first[b] - last[a]
+    plausible = (gap <= MAX_GAP_YEARS) & (gap >= -MAX_OVERLAP_YEARS) & (first[a] <= last[b])
+
+    keep = plausible & ~other_initial & (surname_sim > 0)
+    return pairs.assign(score=score)[keep].reset_index(drop=True)
+
+
+def resolve_persons(mentions: pd.DataFrame, scored: pd.DataFrame, min_score: float = MIN_SCORE) -> pd.DataFrame:
+    """
+    Fasst Erwähnungen zu Personen zusammen (Union-Find, bestes Paar zuerst).
+    Eine Person hat pro Serie höchstens eine Erwähnung.
+    """
+    parent = np.arange(len(mentions))
+    series_of: dict[int, set[str]] = {i: {s} for i, s in enumerate(mentions["series"])}
+    link_score = np.full(len(mentions), np.nan)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    accepted = scored[scored["score"] >= min_score].sort_values(
+        ["score", "m_a", "m_b"], ascending=[False, True, True], kind="mergesort"
+    )
+    for a, b, score in zip(accepted["m_a"], accepted["m_b"], accepted["score"]):
+        ra, rb = find(a), find(b)
+        if ra == rb or series_of[ra] & series_of[rb]:
+            continue
+        parent[rb] = ra
+        series_of[ra] |= series_of.pop(rb)
+        link_score[a] = np.fmax(link_score[a], score)
+        link_score[b] = np.fmax(link_score[b], score)
+
+    roots = np.array([find(i) for i in range(len(mentions))])
+    out = mentions.assign(root=roots, match_score=link_score)
+
+    # person_id: F1-driver_id, sonst früheste Erwähnung der Person
+    f1 = out[out["series"] == "F1"].dropna(subset=["driver_id"])
+    f1_ids = dict(zip(f1["root"], "F1-" + f1["driver_id"].astype(int).astype(str)))
+    earliest = out.sort_values(["first_year", "rank", "mention_key"]).drop_duplicates("root")
+    slug = earliest["name_norm"].str.replace(" ", "-")
+    fallback = earliest["series"] + "-" + slug + "-" + earliest["first_year"].astype("Int64").astype(str)
+    # Namensgleiche Personen im selben Startjahr durchnummerieren
+    dup = fallback.groupby(fallback).cumcount()
+    fallback = fallback.where(dup == 0, fallback + "-" + (dup + 1).astype(str))
+    fallback = dict(zip(earliest["root"], fallback))
+    out["person_id"] = out["root"].map(lambda r: f1_ids.get(r, fallback[r]))
+    return out
+
+
+def build_person_crosswalk(master: pd.DataFrame) -> pd.DataFrame:
+    """Crosswalk (eine Zeile pro Erwähnung) aus der All-Series-Master-Tabelle."""
+    mentions = build_mentions(master)
+    scored = score_pairs(mentions, candidate_pairs(mentions))
+    persons = resolve_persons(mentions, scored)
+    crosswalk = persons[CROSSWALK_COLUMNS].copy()
+    crosswalk["driver_id"] = crosswalk["driver_id"].astype("Int64")
+    crosswalk["first_year"] = crosswalk["first_year"].astype("Int64")
+    crosswalk["last_year"] = crosswalk["last_year"].astype("Int64")
+    return crosswalk.sort_values(["person_id", "first_year", "series"]).reset_index(drop=True)
+
+
+def _clean_codes(values: pd.Series) -> pd.Series:
+    code = values.astype("string").str.strip().str.upper()
+    return code.mask(code.isin(["", "\\N", "NAN"]))
+
+
+def _mention_keys(df: pd.DataFrame) -> pd.Series:
+    """Schlüssel einer Erwähnung: 'F1|<driver_id>' bzw. '<Serie>|<Name>|<Code>'."""
+    series = df["series"].astype(str).str.upper()
+    code = _clean_codes(df["driver_code"])
+    driver_id = df["driver_id"] if "driver_id" in df.columns else pd.Series(np.nan, index=df.index)
+    is_f1 = (series == "F1") & driver_id.notna()
+    f1_key = "F1|" + pd.to_numeric(driver_id, errors="coerce").astype("Int64").astype("string")
+    other_key = series + "|" + normalize_name(df["driver_name"]) + "|" + code.fillna("")
+    return f1_key.where(is_f1, other_key)
+
+
+def attach_person_ids(df: pd.DataFrame, crosswalk: pd.DataFrame) -> pd.Series:
+    """person_id pro Zeile von df (Master-Tabelle oder Auszug), NA ohne Treffer."""
+    require_columns(df.columns, {"series", "driver_name", "driver_code"}, "Identity")
+    lookup = pd.Series(crosswalk["person_id"].to_numpy(), index=_mention_keys(crosswalk).to_numpy())
+    lookup = lookup[~lookup.index.duplicated()]
+    return _mention_keys(df).map(lookup).astype("string").rename("person_id")
+
+
+def build_person_crosswalk_file(
+    input_path: str | Path = MASTER_PATH,
+    output_path: str | Path = OUTPUT_PATH,
+) -> Path:
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    if not input_path.exists():
+        raise FileNotFoundError(f"Expected file not found: {input_path}")
+
+    crosswalk = build_person_crosswalk(pd.read_csv(input_path, low_memory=False))
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    crosswalk.to_csv(output_path, index=False)
+
+    linked = crosswalk.groupby("person_id")["series"].nunique()
+    print(f"✅ Person crosswalk written to: {output_path} "
+          f"(mentions={len(crosswalk)}, persons={len(linked)}, multi-series={(linked > 1).sum()})")
+    return output_path
+
+
+if __name__ == "__main__":
+    build_person_crosswalk_file()
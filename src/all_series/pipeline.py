@@ -0,0 +1,58 @@
+"""Serien-Merge als Pipeline: F1/F2/F3-Features -> Master-Tabellen -> Personen -> Karriere-Features / Labels."""
+from src.all_series import build_all_master_features as master
+from src.all_series import build_all_master_features_core as master_core
+from src.all_series import build_labels as labels
+from src.all_series import build_rolling_features as rolling
+from src.all_series import identity
+from src.pipeline.runner import Artifact, Pipeline, Stage
+
+# Alle registrierten Serien (src/*/pipeline.py mit SERIES)
+SERIES_PATHS = master.feature_paths()
+CORE_FILES = master_core.core_files()
+
+
+ALL_SERIES_PIPELINE = Pipeline(
+    name="all_series",
+    stages=[
+        Stage(
+            "merge",
+            master.build_all_series_master_frame,
+            outputs=("all_series_master_features",),
+            params={"series": tuple(SERIES_PATHS)},
+            sources=tuple(SERIES_PATHS.values()),
+        ),
+        Stage(
+            "merge_core",
+            master_core.build_master_core_frame,
+            outputs=("all_series_master_features_core",),
+            params={"files": CORE_FILES},
+            sources=tuple(CORE_FILES),
+        ),
+        Stage(
+            "identity",
+            identity.build_person_crosswalk,
+            inputs=("all_series_master_features",),
+            outputs=("person_crosswalk",),
+        ),
+        Stage(
+            "rolling",
+            rolling.build_rolling_frame,
+            inputs=("all_series_master_features", "person_crosswalk"),
+            outputs=("all_series_rolling_features",),
+            sources=(rolling.CRITERIA_PATH,),
+        ),
+        Stage(
+            "labels",
+            labels.build_label_frame,
+            inputs=("all_series_master_features_core",),
+            outputs=("f2_f3_features_with_f1_label",),
+        ),
+    ],
+    artifacts={
+        "all_series_master_features": Artifact(master.OUTPUT_PATH, final=True),
+        "all_series_master_features_core": Artifact(master_core.OUT, final=True),
+        "person_crosswalk": Artifact(identity.OUTPUT_PATH, final=True),
+        "all_series_rolling_features": Artifact(rolling.OUTPUT_PATH, final=True),
+        "f2_f3_features_with_f1_label": Artifact(labels.OUTPUT_PATH, final=True),
+    },
+)
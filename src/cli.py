@@ -0,0 +1,54 @@
+"""
+Kommandozeile 'rookie-invest' (Einstiegspunkt aus pyproject.toml).
+
+Beispiel:
+    rookie-invest build
+    rookie-invest build --series F1 F3 --force
+    rookie-invest score
+    rookie-invest serve --port 8765
+"""
+from __future__ import annotations
+
+import argparse
+
+from src.demo import score_batch, serve
+from src.pipeline.build import build_all, parse_start_at
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="rookie-invest", description="rookie_invest_ML Werkzeuge")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Alle Serien parallel bauen, danach Serien-Merge")
+    build.add_argument("--series", nargs="+", default=None, help="Nur diese Serien (z.B. F1 F3), Standard: alle registrierten")
+    build.add_argument("--jobs", type=int, default=None, help="Anzahl Prozesse (Standard: Kerne, max. Anzahl Serien)")
+    build.add_argument("--start-at", action="append", default=None, metavar="PIPELINE:STUFE",
+                       help="Pipeline ab dieser Stufe starten, z.B. f2:clean (mehrfach möglich)")
+    build.add_argument("--write-interim", action="store_true", help="Zwischenstände zusätzlich schreiben")
+    build.add_argument("--force", action="store_true", help="Fingerprints ignorieren, alles neu rechnen")
+    build.add_argument("--no-merge", action="store_true", help="Nur die Serien, ohne all_series")
+
+    score = commands.add_parser("score", help="Alle Jahres-Inputs mit einem Modell-Load bewerten")
+    score_batch.add_arguments(score)
+
+    server = commands.add_parser("serve", help="Lokaler Scoring-Server (warmes Modell + KB, Micro-Batching)")
+    serve.add_arguments(server)
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        build_all(
+            series=args.series,
+            jobs=args.jobs,
+            write_interim=args.write_interim,
+            start_at=parse_start_at(args.start_at),
+            force=args.force,
+            merge=not args.no_merge,
+        )
+    elif args.command == "score":
+        score_batch.run(args)
+    elif args.command == "serve":
+        serve.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,39 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 
+import pandas as pd
+
 
 def require_columns(columns: Iterable[str], required: Iterable[str], context: str) -> None:
     required_set = set(required)
     missing = required_set.difference(columns)
     if missing:
         raise ValueError(f"Missing required columns for {context}: {sorted(missing)}")
+
+
+def groupwise_mode(df: pd.DataFrame, by: list[str], column: str) -> pd.Series:
+    """
+    Häufigster Wert von column pro Gruppe, in einem Durchlauf über alle
+    (Gruppe, Wert)-Paare statt Series.mode() pro Gruppe.
+
+    Fehlende Werte zählen nicht mit; Gruppen ohne Wert bekommen NaN.
+    Bei Gleichstand gewinnt der kleinste Wert (wie Series.mode().iloc[0]).
+    Rückgabe: Series mit den Gruppenschlüsseln als Index.
+    """
+    by = list(by)
+    counts = (
+        df.dropna(subset=[column])
+        .groupby(by + [column], sort=False, observed=True)
+        .size()
+        .rename("_n")
+        .reset_index()
+    )
+    counts = counts.sort_values(
+        by + ["_n", column],
+        ascending=[True] * len(by) + [False, True],
+        kind="mergesort",
+    )
+    top = counts.drop_duplicates(by, keep="first").set_index(by)[column]
+
+    groups = df.groupby(by, observed=True).size().index
+    return top.reindex(groups)
@@ -0,0 +1,160 @@
+"""
+Gemeinsame Lese-/Schreibschicht für die Pipeline-Stufen.
+
+Zwischenstände (data/*/interim) werden spaltenbasiert als Parquet oder
+Arrow IPC (Feather) abgelegt: Typen bleiben erhalten, nichts muss erneut
+als Text geparst werden, und Folgestufen lesen nur die Spalten, die sie
+brauchen. CSV bleibt als Exportformat für die processed-Dateien erhalten.
+
+Das Format wird über die Dateiendung gewählt:
+    .parquet / .pq           -> Parquet (optional hive-partitioniert nach Jahr)
+    .arrow / .feather / .ipc -> Arrow IPC
+    .csv                     -> CSV
+"""
+from __future__ import annotations
+
+import shutil
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import pandas as pd
+
+
+FORMATS_BY_SUFFIX = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "feather",
+    ".feather": "feather",
+    ".ipc": "feather",
+    ".csv": "csv",
+}
+
+
+def detect_format(path: str | Path) -> str:
+    """Leitet das Speicherformat aus der Dateiendung ab."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS_BY_SUFFIX:
+        raise ValueError(
+            f"Unbekanntes Tabellenformat fuer {path}. "
+            f"Erlaubt: {sorted(FORMATS_BY_SUFFIX)}"
+        )
+    return FORMATS_BY_SUFFIX[suffix]
+
+
+def read_columns(path: str | Path) -> list[str]:
+    """Gibt die Spaltennamen zurück, ohne die Daten zu laden."""
+    path = Path(path)
+    fmt = detect_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path, nrows=0).columns.tolist()
+    return _open_dataset(path, fmt).schema.names
+
+
+def read_table(
+    path: str | Path,
+    columns: Iterable[str] | None = None,
+    years: Iterable[int] | None = None,
+    year_col: str = "year",
+) -> pd.DataFrame:
+    """
+    Liest eine Tabelle unabhängig vom Format.
+
+    columns: Projektion. Es werden nur die angegebenen Spalten gelesen,
+             soweit sie in der Datei existieren (Pflichtspalten prüft der
+             Aufrufer mit require_columns).
+    years:   Filter auf year_col. Bei hive-partitionierten Parquet-Daten
+             werden nur die betroffenen Partitionen gelesen.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Table not found: {path}")
+
+    fmt = detect_format(path)
+    wanted = list(dict.fromkeys(columns)) if columns is not None else None
+    year_list = sorted({int(y) for y in years}) if years is not None else None
+
+    read_cols = wanted
+    if read_cols is not None and year_list is not None and year_col not in read_cols:
+        read_cols = read_cols + [year_col]
+
+    if fmt == "csv":
+        usecols = None
+        if read_cols is not None:
+            read_set = set(read_cols)
+            usecols = lambda c: c in read_set  # noqa: E731
+        df = pd.read_csv(path, usecols=usecols, low_memory=False)
+        if year_list is not None:
+            df = df[pd.to_numeric(df[year_col], errors="coerce").isin(year_list)]
+            df = df.reset_index(drop=True)
+    else:
+        df = _read_dataset(path, fmt, read_cols, year_col, year_list)
+
+    if wanted is not None:
+        df = df[[c for c in wanted if c in df.columns]]
+    return df
+
+
+def write_table(
+    df: pd.DataFrame,
+    path: str | Path,
+    partition_cols: Sequence[str] | None = None,
+) -> Path:
+    """
+    Schreibt eine Tabelle im über die Endung gewählten Format.
+
+    partition_cols: nur für Parquet; schreibt ein hive-partitioniertes
+                    Verzeichnis (z.B. .../year=2023/part-0.parquet).
+                    Ein bestehendes Verzeichnis wird vorher ersetzt.
+    """
+    path = Path(path)
+    fmt = detect_format(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if partition_cols and fmt != "parquet":
+        raise ValueError(f"Partitionierung wird nur fuer Parquet unterstuetzt: {path}")
+
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif partition_cols and path.exists():
+        path.unlink()
+
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        if partition_cols:
+            df.to_parquet(path, index=False, partition_cols=list(partition_cols))
+        else:
+            df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
+
+    return path
+
+
+def _open_dataset(path: Path, fmt: str):
+    import pyarrow.dataset as ds
+
+    dataset_format = "parquet" if fmt == "parquet" else "ipc"
+    # Partitionsschlüssel als normale Typen lesen (year -> int), nicht als Dictionary
+    partitioning = ds.HivePartitioning.discover(infer_dictionary=False) if path.is_dir() else None
+    return ds.dataset(path, format=dataset_format, partitioning=partitioning)
+
+
+def _read_dataset(
+    path: Path,
+    fmt: str,
+    columns: list[str] | None,
+    year_col: str,
+    years: list[int] | None,
+) -> pd.DataFrame:
+    import pyarrow.dataset as ds
+
+    dataset = _open_dataset(path, fmt)
+    if columns is not None:
+        columns = [c for c in columns if c in dataset.schema.names]
+
+    # Bei hive-Partitionen greift der Filter auf die Verzeichnisse,
+    # nicht benötigte Jahre werden also gar nicht erst gelesen.
+    row_filter = ds.field(year_col).isin(years) if years is not None else None
+    table = dataset.to_table(columns=columns, filter=row_filter)
+    return table.to_pandas().reset_index(drop=True)
@@ -0,0 +1,114 @@
+"""
+Dataset-Manifest für processed- und model_input-Dateien.
+
+Statt bei jeder Suche alle CSVs im Repo zu öffnen, hält data/manifest.json
+pro Datei Spalten, Zeilenzahl, Grösse und mtime fest. Beim Auffrischen
+werden nur die Dateien neu gelesen, deren mtime oder Grösse sich geändert
+hat; gelöschte Dateien fallen raus. Erfasst werden nur die Daten-Ordner aus
+DATASET_GLOBS, nicht das ganze Repo.
+
+Beispiel:
+    from src.common.manifest import find_datasets
+    find_datasets({"driver_code", "f1_entry"})
+
+    python -m src.common.manifest
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+from pathlib import Path
+
+MANIFEST_PATH = Path("data/manifest.json")
+
+DATASET_GLOBS = [
+    "data/*/processed/*.csv",
+    "data/model_input/*.csv",
+    "data/model_input/*/*.csv",
+]
+
+# Bevorzugte Label-Quelle (volle Label-Tabelle, nicht ein Split)
+LABEL_SOURCE = "data/model_input/f2_f3_features_with_f1_label.csv"
+LABEL_COLUMNS = {"driver_code", "f1_entry"}
+
+
+def _describe(path: Path) -> dict:
+    """Spalten und Zeilenzahl einer CSV (csv-Modul: Zeilenumbrüche in Quotes zählen richtig)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        rows = sum(1 for _ in reader)
+    return {"columns": columns, "rows": rows}
+
+
+def load_manifest(root: str | Path = ".", manifest_path: str | Path = MANIFEST_PATH) -> dict[str, dict]:
+    path = Path(root) / manifest_path
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))["files"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def refresh_manifest(root: str | Path = ".", manifest_path: str | Path = MANIFEST_PATH) -> dict[str, dict]:
+    """Manifest auf den Stand der Platte bringen; liest nur geänderte Dateien."""
+    root = Path(root)
+    old = load_manifest(root, manifest_path)
+
+    files: dict[str, dict] = {}
+    changed = 0
+    for pattern in DATASET_GLOBS:
+        for path in sorted(root.glob(pattern)):
+            key = path.relative_to(root).as_posix()
+            stat = path.stat()
+            entry = old.get(key)
+            if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                entry = {**_describe(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                changed += 1
+            files[key] = entry
+
+    if changed or files.keys() != old.keys():
+        out = root / manifest_path
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(out.name + ".tmp")
+        tmp.write_text(json.dumps({"files": files}, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, out)
+        print(f"ℹ️ Manifest aktualisiert: {changed} von {len(files)} Dateien neu gelesen")
+    return files
+
+
+def find_datasets(
+    columns: set[str],
+    root: str | Path = ".",
+    manifest: dict[str, dict] | None = None,
+) -> list[str]:
+    """Dateien (relativ zu root, sortiert), die alle columns enthalten (Gross/klein egal)."""
+    if manifest is None:
+        manifest = refresh_manifest(root)
+    wanted = {c.lower() for c in columns}
+    return sorted(
+        key for key, entry in manifest.items()
+        if wanted <= {c.lower() for c in entry["columns"]}
+    )
+
+
+def label_source(root: str | Path = ".", manifest: dict[str, dict] | None = None) -> Path:
+    """
+    Datei mit driver_code und f1_entry für die Ex-post-Validierung.
+    Bevorzugt LABEL_SOURCE, sonst die erste passende Datei nach Pfad.
+    """
+    candidates = find_datasets(LABEL_COLUMNS, root, manifest)
+    if not candidates:
+        raise FileNotFoundError(
+            "Keine Datei mit driver_code und f1_entry im Manifest "
+            f"(gesucht in: {', '.join(DATASET_GLOBS)})."
+        )
+    chosen = LABEL_SOURCE if LABEL_SOURCE in candidates else candidates[0]
+    return Path(root) / chosen
+
+
+if __name__ == "__main__":
+    for key, entry in refresh_manifest().items():
+        print(f"{key}: rows={entry['rows']}, cols={len(entry['columns'])}")
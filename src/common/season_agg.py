@@ -0,0 +1,139 @@
+"""
+Generische Season-Aggregation für F1, F2 und F3.
+
+Welche Kennzahlen pro Gruppe (Fahrer-Saison, Team-Saison, ...) gebildet
+werden, steht deklarativ in configs/features_schema.yaml. Eine neue
+Kennzahl ist damit ein Eintrag in der Config, kein neuer Code.
+
+Ablauf von aggregate_groups:
+    1. count_eq/count_le als Bool-Indikatorspalten vorberechnen
+    2. die Spec in benannte Aggregationen übersetzen und mit einem
+       df.groupby(group_by, dropna=...).agg(**named) rechnen
+    3. Raten aus den aggregierten Spalten bilden
+
+Ergebnis und Spaltentypen sind damit exakt die von pandas groupby.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from src.common.features import require_columns
+
+FEATURE_SPEC_PATH = Path("configs/features_schema.yaml")
+
+STATS = ("count", "sum", "mean", "min", "max", "std", "nunique", "count_eq", "count_le")
+
+
+@dataclass(frozen=True)
+class FeatureDef:
+    name: str
+    column: str
+    stat: str
+    value: float | None = None
+
+
+@dataclass(frozen=True)
+class AggregationSpec:
+    name: str
+    group_by: tuple[str, ...]
+    features: tuple[FeatureDef, ...]
+    ratios: tuple[tuple[str, str, str], ...] = ()
+    dropna: bool = True
+
+    @property
+    def input_columns(self) -> list[str]:
+        cols = list(self.group_by)
+        for feat in self.features:
+            if feat.column not in cols:
+                cols.append(feat.column)
+        return cols
+
+
+def parse_feature_spec(name: str, raw: dict) -> AggregationSpec:
+    """Baut eine AggregationSpec aus dem YAML-Eintrag und prüft ihn."""
+    if not raw or "group_by" not in raw or "features" not in raw:
+        raise ValueError(f"Feature-Spec '{name}' braucht 'group_by' und 'features'")
+
+    features = []
+    for feat_name, feat in raw["features"].items():
+        stat = feat.get("stat")
+        if stat not in STATS:
+            raise ValueError(f"Feature-Spec '{name}': unbekannte Statistik {stat!r} für '{feat_name}'")
+        if stat in ("count_eq", "count_le") and feat.get("value") is None:
+            raise ValueError(f"Feature-Spec '{name}': '{feat_name}' ({stat}) braucht 'value'")
+        features.append(FeatureDef(feat_name, feat["column"], stat, feat.get("value")))
+
+    names = {f.name for f in features}
+    ratios = []
+    for ratio_name, (num, den) in (raw.get("ratios") or {}).items():
+        missing = {num, den} - names
+        if missing:
+            raise ValueError(f"Feature-Spec '{name}': Rate '{ratio_name}' verweist auf {sorted(missing)}")
+        ratios.append((ratio_name, num, den))
+
+    return AggregationSpec(
+        name=name,
+        group_by=tuple(raw["group_by"]),
+        features=tuple(features),
+        ratios=tuple(ratios),
+        dropna=bool(raw.get("dropna", True)),
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_specs(path: str, mtime: float) -> dict[str, AggregationSpec]:
+    with open(path, encoding="utf-8") as f:
+        raw = yaml.safe_load(f) or {}
+    return {name: parse_feature_spec(name, entry) for name, entry in (raw.get("aggregations") or {}).items()}
+
+
+def load_feature_spec(name: str, path: str | Path = FEATURE_SPEC_PATH) -> AggregationSpec:
+    """Liest die Aggregations-Spec name aus der Feature-Config."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Feature-Config nicht gefunden: {path}")
+    specs = _load_specs(str(path.resolve()), path.stat().st_mtime)
+    if name not in specs:
+        raise KeyError(f"Keine Aggregation '{name}' in {path} (vorhanden: {sorted(specs)})")
+    return specs[name]
+
+
+def _named_aggregations(df: pd.DataFrame, spec: AggregationSpec) -> tuple[pd.DataFrame, dict]:
+    """
+    Übersetzt spec in benannte Aggregationen für groupby(...).agg(**named).
+
+    count_eq/count_le werden vorab als Bool-Indikatorspalten berechnet
+    (fehlend = False) und dann summiert, damit nur eingebaute Reduktionen
+    von pandas laufen, keine Python-Funktion pro Gruppe.
+    """
+    indicators = {}
+    named = {}
+    for feat in spec.features:
+        if feat.stat in ("count_eq", "count_le"):
+            values = df[feat.column]
+            hit = values == feat.value if feat.stat == "count_eq" else values <= feat.value
+            tmp = f"__{feat.name}"
+            indicators[tmp] = hit.to_numpy(dtype=bool, na_value=False)
+            named[feat.name] = (tmp, "sum")
+        else:
+            named[feat.name] = (feat.column, feat.stat)
+    return df[spec.input_columns].assign(**indicators), named
+
+
+def aggregate_groups(df: pd.DataFrame, spec: AggregationSpec) -> pd.DataFrame:
+    """
+    Aggregiert df nach spec.group_by mit den Features und Raten aus spec.
+    Eine Zeile pro Gruppe, Gruppenschlüssel als Spalten.
+    """
+    require_columns(df.columns, spec.input_columns, f"Aggregation '{spec.name}'")
+
+    work, named = _named_aggregations(df, spec)
+    result = work.groupby(list(spec.group_by), dropna=spec.dropna).agg(**named).reset_index()
+    for ratio_name, num, den in spec.ratios:
+        result[ratio_name] = result[num] / result[den]
+    return result
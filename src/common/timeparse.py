@@ -0,0 +1,159 @@
+"""
+Zeit- und Gap-Angaben aus den FIA-Ergebnistabellen (F2/F3) in Sekunden.
+
+Spaltenweise statt Zelle für Zelle: die üblichen Formen
+    h:mm:ss.fff, m:ss.fff, ss.fff      (Zeiten)
+    +x.xxx, x.xxx                      (Gaps)
+    n LAP / +n LAPS                    (überrundet)
+    DNF, DNS, DSQ, -, leer             (kein Wert)
+werden per Regex für die ganze Spalte auf einmal umgerechnet. Alles, was
+keiner dieser Formen entspricht, geht an die skalaren Funktionen
+parse_time_to_seconds / parse_gap_to_seconds; das Ergebnis ist damit
+identisch zur bisherigen Zelle-für-Zelle-Variante.
+"""
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+NO_VALUE_TOKENS = ("", "-", "DNF", "DNS", "DSQ")
+
+_TIME_RE = r"^(?:(?:(?P<h>[0-9]+):)?(?P<m>[0-9]+):)?(?P<s>[0-9]+(?:\.[0-9]+)?)$"
+_GAP_RE = r"^\+?(?P<s>[0-9]+(?:\.[0-9]+)?)$"
+_LAPS_RE = r"^\+?\s*(?P<n>[0-9]+)\s*LAPS?$"
+
+
+def parse_time_to_seconds(s: str) -> float:
+    """Konvertiert Zeitstring wie '43:01.023' oder '1:47.175' in Sekunden."""
+    if pd.isna(s):
+        return np.nan
+    if isinstance(s, (int, float)):
+        return float(s)
+
+    s = str(s).strip()
+    if s in NO_VALUE_TOKENS:
+        return np.nan
+
+    # Reine Sekunden
+    if re.match(r"^\d+(\.\d+)?$", s):
+        try:
+            return float(s)
+        except ValueError:
+            return np.nan
+
+    parts = s.split(":")
+
+    try:
+        if len(parts) == 3:
+            h = int(parts[0])
+            m = int(parts[1])
+            sec = float(parts[2])
+            return h * 3600 + m * 60 + sec
+        elif len(parts) == 2:
+            m = int(parts[0])
+            sec = float(parts[1])
+            return m * 60 + sec
+        else:
+            return float(s)
+    except ValueError:
+        return np.nan
+
+
+def parse_gap_to_seconds(s: str) -> float:
+    """Konvertiert Gap in Sekunden falls möglich, ignoriert Angaben wie '1 LAP'."""
+    if pd.isna(s):
+        return np.nan
+
+    s = str(s).strip()
+    if s in NO_VALUE_TOKENS:
+        return np.nan
+
+    if "LAP" in s.upper():
+        return np.nan
+
+    s_clean = s.replace("+", "")
+    try:
+        return float(s_clean)
+    except ValueError:
+        return np.nan
+
+
+def _numeric_cells(values: pd.Series) -> pd.Series:
+    """Maske der Zellen, die schon Zahlen sind (nur in object-Spalten möglich)."""
+    if values.dtype != object:
+        return pd.Series(False, index=values.index)
+    return values.map(lambda v: isinstance(v, (int, float)), na_action="ignore").fillna(False).astype(bool)
+
+
+def parse_time_column(values: pd.Series) -> pd.Series:
+    """Spaltenweise Variante von parse_time_to_seconds (gleiche Ergebnisse)."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+
+    index = values.index
+    values = values.reset_index(drop=True)
+    out = pd.Series(np.nan, index=values.index, dtype=float)
+
+    is_number = _numeric_cells(values)
+    out[is_number] = values[is_number].astype(float)
+
+    text = values[values.notna() & ~is_number].astype(str).str.strip()
+    text = text[~text.isin(NO_VALUE_TOKENS)]
+    parts = text.str.extract(_TIME_RE)
+    ok = parts["s"].notna()
+
+    hours = pd.to_numeric(parts.loc[ok, "h"]).fillna(0).astype(float)
+    minutes = pd.to_numeric(parts.loc[ok, "m"]).fillna(0).astype(float)
+    seconds = parts.loc[ok, "s"].astype(float)
+    out.loc[seconds.index] = hours * 3600 + minutes * 60 + seconds
+
+    # Exoten (z.B. '+1.2', '1 LAP', '1:2:3:4') wie bisher Zelle für Zelle
+    rest = text[~ok]
+    if len(rest):
+        out.loc[rest.index] = rest.map(parse_time_to_seconds).astype(float)
+
+    out.index = index
+    return out
+
+
+def parse_gap_column(values: pd.Series) -> pd.Series:
+    """Spaltenweise Variante von parse_gap_to_seconds (gleiche Ergebnisse)."""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(float)
+
+    index = values.index
+    values = values.reset_index(drop=True)
+    out = pd.Series(np.nan, index=values.index, dtype=float)
+
+    text = values[values.notna()].astype(str).str.strip()
+    text = text[~text.isin(NO_VALUE_TOKENS) & ~text.str.upper().str.contains("LAP", regex=False)]
+    parts = text.str.extract(_GAP_RE)
+    ok = parts["s"].notna()
+    seconds = parts.loc[ok, "s"].astype(float)
+    out.loc[seconds.index] = seconds
+
+    rest = text[~ok]
+    if len(rest):
+        out.loc[rest.index] = rest.map(parse_gap_to_seconds).astype(float)
+
+    out.index = index
+    return out
+
+
+def parse_laps_down_column(values: pd.Series) -> pd.Series:
+    """
+    Rückstand in Runden aus Gap-Angaben wie '1 LAP' oder '+3 LAPS'
+    (Float, sonst NaN). Ergänzt gap_s, wo dort für Überrundete NaN steht.
+    """
+    index = values.index
+    values = values.reset_index(drop=True)
+    out = pd.Series(np.nan, index=values.index, dtype=float)
+
+    text = values[values.notna()].astype(str).str.strip()
+    laps = text.str.extract(_LAPS_RE, flags=re.IGNORECASE)["n"].dropna()
+    out.loc[laps.index] = laps.astype(float)
+
+    out.index = index
+    return out
@@ -16,24 +16,11 @@ def find_project_root(start: Path) -> Path:
 
 
 def build_validation_lookup(project_root: Path, out_path: Path) -> None:
-    csv_files = list(project_root.rglob("*.csv"))
-
-    found = []
-    for fp in csv_files:
-        try:
-            cols = pd.read_csv(fp, nrows=1).columns.str.lower().tolist()
-            if "f1_entry" in cols and "driver_code" in cols:
-                found.append(fp)
-        except Exception:
-            pass
-
-    if not found:
-        raise FileNotFoundError(
-            "Ich finde keine CSV im Projekt, die driver_code und f1_entry enthält. "
-            "Dann kann ich die Validierung nicht automatisch bauen."
-        )
+    from common.manifest import label_source
 
-    source = found[0]
+    # Über das Manifest statt rglob über alle CSVs; Quelle ist deterministisch
+    source = label_source(project_root)
+    print("Label-Quelle:", source)
     df = pd.read_csv(source)
 
     df["driver_code"] = df["driver_code"].astype(str).str.upper().str.strip()
@@ -198,32 +185,31 @@ def main() -> None:
 
     kb_engine = RacingIntelligenceEngine()
 
-    def _safe_get(row: pd.Series, key: str, default):
-        v = row.get(key, default)
-        if pd.isna(v):
-            return default
-        return v
-
-    def kb_context(row: pd.Series) -> dict:
-        driver_input = {
-            "age": int(_safe_get(row, "age", 20)),
-            "nationality": str(_safe_get(row, "nationality", "unknown")),
-            "superlicense_points": float(_safe_get(row, "superlicense_points", 0)),
-            "junior_series_years": float(_safe_get(row, "junior_series_years", 0)),
-            "years_in_f3": float(_safe_get(row, "years_in_f3", 0)),
-            "previous_series": str(_safe_get(row, "previous_series", "")),
-            "social_media_behavior": str(_safe_get(row, "social_media_behavior", "neutral")),
-            "weight_kg": float(_safe_get(row, "weight_kg", 70)),
-            "neck_cm": float(_safe_get(row, "neck_cm", 42)),
-            "sponsor_capital_chf": float(_safe_get(row, "sponsor_capital_chf", 0)),
-        }
-
-        team_input = {"team_name": str(_safe_get(row, "team_name", ""))}
-        vehicle_input = {"engine_status": "ok", "drs_active": False, "tire_status": "ok"}
-
-        return kb_engine.generate_full_profile(driver_input, team_input, vehicle_input)
-
-    kb_df = base.apply(kb_context, axis=1, result_type="expand")
+    # Eingaben spaltenweise: fehlend/NaN -> Standardwert, dann Typ wie im Einzelpfad
+    kb_defaults = {
+        "age": (20, int),
+        "nationality": ("unknown", str),
+        "superlicense_points": (0, float),
+        "junior_series_years": (0, float),
+        "years_in_f3": (0, float),
+        "previous_series": ("", str),
+        "social_media_behavior": ("neutral", str),
+        "weight_kg": (70, float),
+        "neck_cm": (42, float),
+        "sponsor_capital_chf": (0, float),
+        "team_name": ("", str),
+    }
+    kb_inputs = pd.DataFrame(index=base.index)
+    for key, (default, cast) in kb_defaults.items():
+        values = base[key] if key in base.columns else pd.Series(default, index=base.index)
+        values = values.where(values.notna(), default)
+        kb_inputs[key] = values.astype(float).astype(int) if cast is int else values.astype(cast)
+    kb_inputs["engine_status"] = "ok"
+    kb_inputs["drs_active"] = False
+    kb_inputs["tire_status"] = "ok"
+
+    # Ein Durchlauf über alle Zeilen; float wie bisher beim zeilenweisen apply
+    kb_df = kb_engine.generate_profiles(kb_inputs).astype(float)
     hybrid = pd.concat([base.reset_index(drop=True), kb_df.reset_index(drop=True)], axis=1)
 
     preferred_cols = [
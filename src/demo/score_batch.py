@@ -0,0 +1,125 @@
+"""
+Batch-Scoring aller Jahres-Inputs mit einem einzigen Modell-Load.
+
+run_demo.py rendert genau eine CSV aus demo/input. Hier werden Modell
+(logreg_model.joblib) und Drop-Spalten (drop_cols.txt) einmal geladen, alle
+Dateien aus demo/input_by_year (drivers_YYYY.csv oder ein eigener Glob)
+zusammengelegt und mit einem predict_proba-Aufruf bewertet. Geschrieben wird
+pro Datei ein Ranking und eine gemeinsame Rangliste über alle Jahre:
+
+    demo/output/scores/drivers_2019_ranked.csv
+    demo/output/scores/leaderboard.csv
+
+Beispiel:
+    python -m src.demo.score_batch
+    rookie-invest score --glob "demo/input_by_year/drivers_202*.csv"
+"""
+from __future__ import annotations
+
+import argparse
+import glob as globlib
+import re
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+ARTIFACT_DIR = Path("demo/artifacts")
+MODEL_PATH = ARTIFACT_DIR / "logreg_model.joblib"
+DROP_COLS_PATH = ARTIFACT_DIR / "drop_cols.txt"
+INPUT_GLOB = "demo/input_by_year/drivers_*.csv"
+OUTPUT_DIR = Path("demo/output/scores")
+
+YEAR_PATTERN = re.compile(r"(19|20)\d{2}")
+
+
+def load_drop_cols(path: str | Path = DROP_COLS_PATH) -> list[str]:
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return sorted({c.strip() for c in lines if c.strip()})
+
+
+def load_scoring_model(model_path: str | Path = MODEL_PATH, drop_cols_path: str | Path = DROP_COLS_PATH):
+    """Modell und Drop-Spalten (Input-Vertrag) einmal laden."""
+    return joblib.load(model_path), load_drop_cols(drop_cols_path)
+
+
+def feature_matrix(df: pd.DataFrame, model, drop_cols: list[str]) -> pd.DataFrame:
+    """Modell-Input wie in run_demo (Drop-Spalten weg), in der Spaltenreihenfolge des Modells."""
+    X = df.drop(columns=drop_cols, errors="ignore")
+    expected = getattr(model, "feature_names_in_", None)
+    if expected is not None:
+        missing = [c for c in expected if c not in X.columns]
+        if missing:
+            raise ValueError(f"Input fehlen Modell-Features: {missing}")
+        X = X[list(expected)]
+    return X
+
+
+def score_frame(df: pd.DataFrame, model, drop_cols: list[str]) -> pd.DataFrame:
+    """df plus predicted_probability (ein predict_proba-Aufruf)."""
+    out = df.copy()
+    out["predicted_probability"] = model.predict_proba(feature_matrix(df, model, drop_cols))[:, 1]
+    return out
+
+
+def year_label(path: Path) -> str:
+    m = YEAR_PATTERN.search(path.name)
+    return m.group(0) if m else path.stem
+
+
+def rank_frame(df: pd.DataFrame) -> pd.DataFrame:
+    ranked = df.sort_values("predicted_probability", ascending=False, kind="mergesort").reset_index(drop=True)
+    ranked.insert(0, "rank", range(1, len(ranked) + 1))
+    return ranked
+
+
+def score_files(
+    pattern: str = INPUT_GLOB,
+    output_dir: str | Path = OUTPUT_DIR,
+    model_path: str | Path = MODEL_PATH,
+    drop_cols_path: str | Path = DROP_COLS_PATH,
+) -> pd.DataFrame:
+    """Alle Dateien zu pattern bewerten; gibt die Rangliste über alle Dateien zurück."""
+    files = sorted(Path(p) for p in globlib.glob(pattern))
+    if not files:
+        raise FileNotFoundError(f"Keine Input-Dateien für: {pattern}")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    model, drop_cols = load_scoring_model(model_path, drop_cols_path)
+
+    frames = [pd.read_csv(p).assign(source_file=p.name, input_year=year_label(p)) for p in files]
+    combined = pd.concat(frames, ignore_index=True)
+    scored = score_frame(combined, model, drop_cols)
+
+    for (name, label), part in scored.groupby(["source_file", "input_year"], sort=False):
+        out_path = output_dir / f"{Path(name).stem}_ranked.csv"
+        rank_frame(part.drop(columns=["source_file", "input_year"])).to_csv(out_path, index=False)
+        print(f"✅ {label}: {len(part)} Fahrer -> {out_path}")
+
+    leaderboard = rank_frame(scored)
+    leaderboard_path = output_dir / "leaderboard.csv"
+    leaderboard.to_csv(leaderboard_path, index=False)
+    print(f"✅ Leaderboard written to: {leaderboard_path} (rows={len(leaderboard)}, files={len(files)})")
+    return leaderboard
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--glob", default=INPUT_GLOB, help="Input-Dateien (Standard: drivers_*.csv)")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--drop-cols", type=Path, default=DROP_COLS_PATH)
+
+
+def run(args: argparse.Namespace) -> None:
+    score_files(args.glob, args.output_dir, args.model, args.drop_cols)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Alle Jahres-Inputs mit einem Modell-Load bewerten")
+    add_arguments(parser)
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
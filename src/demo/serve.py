@@ -0,0 +1,445 @@
+"""
+Lokaler Scoring-Server mit warmem Modell und Knowledge Base.
+
+Ein Prozess lädt Modell (logreg_model.joblib), Drop-Spalten und die
+kompilierten KB-Regeln einmal und beantwortet danach Anfragen über HTTP.
+Gleichzeitige Anfragen werden in Micro-Batches gesammelt (bis max_batch_rows
+Zeilen oder max_wait_ms nach der ersten Anfrage) und mit einem
+predict_proba-Aufruf bewertet; die KB-Features laufen über
+generate_profiles, einmal pro Batch und Satz gelieferter Felder (fehlende
+Felder bekommen so die KB-Defaults). Schlägt ein Batch fehl, wird
+jede Anfrage einzeln nachgerechnet, damit nur die fehlerhafte den Fehler
+bekommt. Modell-Features, die keine Zahl sind, werden schon vor der
+Warteschlange abgewiesen.
+
+Endpunkte:
+    POST /score     ein Fahrer als JSON-Objekt oder mehrere als JSON-Liste
+                    -> {"results": [{"predicted_probability": ..., <KB-Features>}, ...]}
+                    400 bei ungültigem Input, 503 nach Ablauf des Timeouts
+    GET  /metrics   Anfragen, Zeilen, Batches, Latenz p50/p99 (ms), Zeilen/s
+    GET  /health
+
+Beispiel:
+    rookie-invest serve --port 8765
+    curl -s localhost:8765/score -d @driver.json
+    curl -s localhost:8765/metrics
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from src.demo.score_batch import DROP_COLS_PATH, MODEL_PATH, feature_matrix, load_scoring_model
+from src.knowledge_base.racing_intelligence_engine import RacingIntelligenceEngine
+
+HOST = "127.0.0.1"
+PORT = 8765
+MAX_BATCH_ROWS = 512
+MAX_WAIT_MS = 2.0
+REQUEST_TIMEOUT_S = 30.0
+
+# Spalten, die zur Zuordnung in der Antwort mitgegeben werden (falls vorhanden)
+ID_COLUMNS = ["driver_name", "driver_code", "series", "year"]
+
+# Fenster für Latenz-Perzentile und Durchsatz
+METRICS_WINDOW = 10_000
+THROUGHPUT_WINDOW_S = 60.0
+
+
+class ScoringMetrics:
+    """Zähler plus gleitendes Fenster der letzten Anfragen (thread-sicher)."""
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self._recent: deque[tuple[float, float, int]] = deque(maxlen=window)
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.batch_seconds = 0.0
+
+    def record_request(self, latency: float, rows: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.rows += rows
+            self._recent.append((time.perf_counter(), latency, rows))
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def record_batch(self, rows: int, seconds: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batch_rows += rows
+            self.batch_seconds += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.perf_counter()
+            uptime = now - self.started
+            recent = list(self._recent)
+            counters = {
+                "requests": self.requests,
+                "rows": self.rows,
+                "errors": self.errors,
+                "batches": self.batches,
+                "avg_batch_rows": self.batch_rows / self.batches if self.batches else 0.0,
+                "avg_batch_ms": 1000 * self.batch_seconds / self.batches if self.batches else 0.0,
+            }
+
+        latencies = np.array([lat for _, lat, _ in recent]) * 1000
+        span = min(THROUGHPUT_WINDOW_S, uptime)
+        window_rows = sum(rows for t, _, rows in recent if now - t <= THROUGHPUT_WINDOW_S)
+        window_requests = sum(1 for t, _, _ in recent if now - t <= THROUGHPUT_WINDOW_S)
+        return {
+            **counters,
+            "uptime_s": round(uptime, 3),
+            "latency_ms": {
+                "p50": float(np.percentile(latencies, 50)) if len(latencies) else None,
+                "p99": float(np.percentile(latencies, 99)) if len(latencies) else None,
+                "max": float(latencies.max()) if len(latencies) else None,
+                "window": len(latencies),
+            },
+            "throughput": {
+                "window_s": round(span, 3),
+                "rows_per_s": window_rows / span if span > 0 else 0.0,
+                "requests_per_s": window_requests / span if span > 0 else 0.0,
+            },
+        }
+
+
+@dataclass
+class _Job:
+    rows: list[dict]
+    future: Future = field(default_factory=Future)
+
+
+def _numeric_features(model) -> list[str]:
+    """Spalten, die das Modell als Zahlen liest (Transformer 'num' der Vorverarbeitung)."""
+    for _, step in getattr(model, "steps", []):
+        for name, _, columns in getattr(step, "transformers_", []):
+            if name == "num":
+                return list(columns)
+    return []
+
+
+def _is_number(value) -> bool:
+    """Wert, den das Modell als Zahl lesen kann (None = fehlend, wird imputiert)."""
+    if value is None or isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
+    return False
+
+
+class ScoringService:
+    """
+    Warmes Modell + KB-Engine hinter einer Warteschlange. Ein Worker-Thread
+    sammelt Anfragen zu Micro-Batches; score() blockiert, bis das Ergebnis
+    der eigenen Zeilen da ist.
+    """
+
+    def __init__(
+        self,
+        model,
+        drop_cols: list[str],
+        engine: RacingIntelligenceEngine,
+        max_batch_rows: int = MAX_BATCH_ROWS,
+        max_wait_ms: float = MAX_WAIT_MS,
+        request_timeout_s: float = REQUEST_TIMEOUT_S,
+    ):
+        self.model = model
+        self.drop_cols = drop_cols
+        self.engine = engine
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.request_timeout = request_timeout_s
+        self.metrics = ScoringMetrics()
+        self.required = [c for c in getattr(model, "feature_names_in_", []) if c not in drop_cols]
+        self.numeric = [c for c in _numeric_features(model) if c not in drop_cols]
+
+        self._queue: queue.Queue[_Job | None] = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="scoring-batcher", daemon=True)
+        self._worker.start()
+
+    def score(self, rows: list[dict], timeout: float | None = None) -> list[dict]:
+        """
+        Zeilen bewerten (über den nächsten Micro-Batch). ValueError bei
+        ungültigem Input, concurrent.futures.TimeoutError nach timeout
+        Sekunden (Standard: request_timeout_s).
+        """
+        t0 = time.perf_counter()
+        if not rows or not all(isinstance(r, dict) for r in rows):
+            raise ValueError("Erwartet ein JSON-Objekt oder eine nicht-leere Liste von Objekten")
+        columns = frozenset().union(*rows)
+        missing = [c for c in self.required if c not in columns]
+        if missing:
+            raise ValueError(f"Input fehlen Modell-Features: {missing}")
+        # sonst scheitert erst predict_proba, und zwar für den ganzen Batch
+        invalid = sorted({c for row in rows for c in self.numeric if not _is_number(row.get(c))})
+        if invalid:
+            raise ValueError(f"Modell-Features sind keine Zahlen: {invalid}")
+
+        job = _Job(rows)
+        self._queue.put(job)
+        try:
+            results = job.future.result(timeout=self.request_timeout if timeout is None else timeout)
+        except FutureTimeout:
+            # noch nicht im Batch -> gar nicht mehr rechnen
+            job.future.cancel()
+            raise
+        self.metrics.record_request(time.perf_counter() - t0, len(rows))
+        return results
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self) -> tuple[list[_Job], bool]:
+        """
+        Erste Anfrage abwarten, dann bis max_wait weitere einsammeln.
+        Abgebrochene Anfragen (Timeout beim Aufrufer) werden übersprungen.
+        """
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return [], True
+            if first.future.set_running_or_notify_cancel():
+                break
+        jobs, rows = [first], len(first.rows)
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return jobs, True
+            if job.future.set_running_or_notify_cancel():
+                jobs.append(job)
+                rows += len(job.rows)
+        return jobs, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            jobs, stop = self._collect()
+            if not jobs:
+                continue
+            t0 = time.perf_counter()
+            try:
+                results = self.score_jobs(jobs)
+            except Exception as exc:
+                results = self._score_one_by_one(jobs) if len(jobs) > 1 else [exc]
+            self.metrics.record_batch(sum(len(j.rows) for j in jobs), time.perf_counter() - t0)
+            for job, result in zip(jobs, results):
+                if isinstance(result, Exception):
+                    job.future.set_exception(result)
+                else:
+                    job.future.set_result(result)
+
+    def _score_one_by_one(self, jobs: list[_Job]) -> list:
+        """Nach einem Batch-Fehler: jede Anfrage einzeln, Ergebnis oder Exception pro Anfrage."""
+        results = []
+        for job in jobs:
+            try:
+                results.append(self.score_jobs([job])[0])
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    def score_jobs(self, jobs: list[_Job]) -> list[list[dict]]:
+        """Ein predict_proba über alle Anfragen; Ergebnisse wieder pro Anfrage aufgeteilt."""
+        # ein DataFrame für den ganzen Batch statt einem pro Anfrage
+        rows = [row for job in jobs for row in job.rows]
+        combined = pd.DataFrame(rows)
+        proba = self.model.predict_proba(feature_matrix(combined, self.model, self.drop_cols))[:, 1]
+
+        # KB pro Schlüsselsatz der Zeile: fehlende Felder sollen Standardwerte bekommen,
+        # nicht die NaN, die beim Zusammenlegen unterschiedlicher Zeilen entstehen
+        by_keys: dict[frozenset[str], list[int]] = {}
+        for i, row in enumerate(rows):
+            by_keys.setdefault(frozenset(row), []).append(i)
+        if len(by_keys) == 1:
+            kb = self.engine.generate_profiles(combined)
+            kb_names, kb_values = list(kb.columns), kb.to_numpy(dtype=float)
+        else:
+            kb_values = None
+            for keys, pos in by_keys.items():
+                part = combined.iloc[pos][[c for c in combined.columns if c in keys]]
+                kb = self.engine.generate_profiles(part)
+                if kb_values is None:
+                    kb_names, kb_values = list(kb.columns), np.empty((len(combined), kb.shape[1]))
+                kb_values[pos] = kb.to_numpy(dtype=float)
+
+        # Antwort-Dicts einmal für den ganzen Batch (spaltenweise); IDs nur, wo die Zeile sie hat
+        names = ["predicted_probability"] + kb_names
+        values = _json_rows(np.column_stack([proba, kb_values]))
+        records = [
+            {**{c: _json_value(row[c]) for c in ID_COLUMNS if c in row}, **dict(zip(names, v))}
+            for row, v in zip(rows, values)
+        ]
+
+        offsets = np.cumsum([0] + [len(job.rows) for job in jobs])
+        return [records[offsets[i]:offsets[i + 1]] for i in range(len(jobs))]
+
+
+def _json_rows(values: np.ndarray) -> list[list]:
+    """Zahlenmatrix als Listen, NaN als None (NaN ist kein gültiges JSON)."""
+    missing = np.isnan(values)
+    if not missing.any():
+        return values.tolist()
+    out = values.astype(object)
+    out[missing] = None
+    return out.tolist()
+
+
+def _json_value(value):
+    return None if isinstance(value, float) and value != value else value
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "rookie-invest"
+    # Header und Body gehen getrennt raus; mit Nagle + Delayed ACK kostet das ~40 ms
+    disable_nagle_algorithm = True
+
+    @property
+    def service(self) -> ScoringService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        # kein Log pro Anfrage (kostet Latenz); Kennzahlen stehen unter /metrics
+        pass
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload, allow_nan=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send_json(200, self.service.metrics.snapshot())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unbekannter Pfad: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send_json(404, {"error": f"Unbekannter Pfad: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+            rows = [payload] if isinstance(payload, dict) else payload
+            if not isinstance(rows, list):
+                raise ValueError("Erwartet ein JSON-Objekt oder eine Liste von Objekten")
+            self._send_json(200, {"results": self.service.score(rows)})
+        except ValueError as exc:  # inkl. JSONDecodeError
+            self.service.metrics.record_error()
+            self._send_json(400, {"error": str(exc)})
+        except FutureTimeout:
+            self.service.metrics.record_error()
+            self._send_json(503, {"error": f"Kein Ergebnis nach {self.service.request_timeout:g} s"})
+        except Exception as exc:
+            self.service.metrics.record_error()
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Standard-Backlog (5) ist für viele gleichzeitige Clients zu klein
+    request_queue_size = 128
+
+    def __init__(self, address: tuple[str, int], service: ScoringService):
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+def make_server(
+    service: ScoringService,
+    host: str = HOST,
+    port: int = PORT,
+) -> ThreadingHTTPServer:
+    return _Server((host, port), service)
+
+
+def serve(
+    host: str = HOST,
+    port: int = PORT,
+    model_path=MODEL_PATH,
+    drop_cols_path=DROP_COLS_PATH,
+    max_batch_rows: int = MAX_BATCH_ROWS,
+    max_wait_ms: float = MAX_WAIT_MS,
+    request_timeout_s: float = REQUEST_TIMEOUT_S,
+) -> None:
+    model, drop_cols = load_scoring_model(model_path, drop_cols_path)
+    service = ScoringService(
+        model, drop_cols, RacingIntelligenceEngine(), max_batch_rows, max_wait_ms, request_timeout_s
+    )
+    server = make_server(service, host, port)
+    print(f"✅ Scoring-Server läuft auf http://{host}:{server.server_port} (POST /score, GET /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("ℹ️ Server wird beendet")
+    finally:
+        server.server_close()
+        service.close()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--drop-cols", default=DROP_COLS_PATH)
+    parser.add_argument("--max-batch-rows", type=int, default=MAX_BATCH_ROWS, help="Zeilen pro Micro-Batch (obere Grenze)")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS,
+                        help="So lange nach der ersten Anfrage auf weitere warten")
+    parser.add_argument("--request-timeout-s", type=float, default=REQUEST_TIMEOUT_S,
+                        help="Danach antwortet /score mit 503")
+
+
+def run(args: argparse.Namespace) -> None:
+    serve(
+        args.host,
+        args.port,
+        args.model,
+        args.drop_cols,
+        args.max_batch_rows,
+        args.max_wait_ms,
+        args.request_timeout_s,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Lokaler Scoring-Server (warmes Modell + KB, Micro-Batching)")
+    add_arguments(parser)
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: Fahrer-Saison-Aggregation mit Lambda-Reduktionen (alt), mit
+eingebauten groupby-Reduktionen auf Indikatorspalten (builtin) und mit
+aggregate_f1_driver_seasons (Season-Engine aus src/common/season_agg.py).
+
+Die Fahrer-Rennen-Tabelle wird k-fach vervielfacht (1x, 10x, 100x der
+aktuellen results.csv). IDs werden pro Kopie verschoben, damit auch die
+Anzahl Gruppen mitwächst. Alle Varianten müssen exakt dieselben Ergebnisse
+liefern.
+
+Beispiel:
+    python -m src.f1.analysis.bench_season_kernel --scales 1 10 100
+    python -m src.f1.analysis.bench_season_kernel --skip-lambda
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.f1.build.build_features import aggregate_f1_driver_seasons, prepare_f1_race_rows
+from src.f1.prep.clean import clean_f1_race_driver_frame
+from src.f1.prep.ingest import join_f1_race_driver, load_f1_raw_tables
+
+
+def aggregate_driver_seasons_lambda(df_season: pd.DataFrame) -> pd.DataFrame:
+    """Bisherige Variante: eine Python-Lambda pro Gruppe und Zähl-Spalte."""
+    driver_group = df_season.groupby(["year", "driver_id"], dropna=False)
+    return (
+        driver_group.agg(
+            n_races=("race_id", "nunique"),
+            total_points=("points", "sum"),
+            avg_points=("points", "mean"),
+            avg_grid=("grid_position", "mean"),
+            avg_finish=("finishing_order", "mean"),
+            best_finish=("finishing_order", "min"),
+            worst_finish=("finishing_order", "max"),
+            wins=("finishing_order", lambda s: (s == 1).sum()),
+            podiums=("finishing_order", lambda s: (s <= 3).sum()),
+            points_finishes=("is_points_finish", lambda s: s.fillna(False).sum()),
+            top10_finishes=("finishing_order", lambda s: (s <= 10).sum()),
+            total_laps=("laps_completed", "sum"),
+            avg_kph=("fastest_lap_speed", "mean"),
+            finish_std=("finishing_order", "std"),
+            points_std=("points", "std"),
+            avg_pos_change=("pos_change", "mean"),
+            pos_change_std=("pos_change", "std"),
+            dnf_count=("is_dnf", lambda s: s.fillna(False).sum()),
+        )
+        .reset_index()
+    )
+
+
+def aggregate_driver_seasons_builtin(df_season: pd.DataFrame) -> pd.DataFrame:
+    """Zähl-Features als Indikatorspalten, dann nur eingebaute groupby-Reduktionen."""
+    pos = df_season["finishing_order"]
+    work = df_season.assign(
+        _win=(pos == 1).to_numpy(dtype=bool, na_value=False),
+        _podium=(pos <= 3).to_numpy(dtype=bool, na_value=False),
+        _top10=(pos <= 10).to_numpy(dtype=bool, na_value=False),
+        _points_finish=df_season["is_points_finish"].to_numpy(dtype=bool, na_value=False),
+        _dnf=df_season["is_dnf"].to_numpy(dtype=bool, na_value=False),
+    )
+    driver_group = work.groupby(["year", "driver_id"], dropna=False)
+    return (
+        driver_group.agg(
+            n_races=("race_id", "nunique"),
+            total_points=("points", "sum"),
+            avg_points=("points", "mean"),
+            avg_grid=("grid_position", "mean"),
+            avg_finish=("finishing_order", "mean"),
+            best_finish=("finishing_order", "min"),
+            worst_finish=("finishing_order", "max"),
+            wins=("_win", "sum"),
+            podiums=("_podium", "sum"),
+            points_finishes=("_points_finish", "sum"),
+            top10_finishes=("_top10", "sum"),
+            total_laps=("laps_completed", "sum"),
+            avg_kph=("fastest_lap_speed", "mean"),
+            finish_std=("finishing_order", "std"),
+            points_std=("points", "std"),
+            avg_pos_change=("pos_change", "mean"),
+            pos_change_std=("pos_change", "std"),
+            dnf_count=("_dnf", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def replicate(df: pd.DataFrame, k: int) -> pd.DataFrame:
+    """k Kopien mit verschobenen driver/race/constructor IDs."""
+    if k == 1:
+        return df
+    copies = []
+    for i in range(k):
+        part = df.copy()
+        for col in ["driver_id", "race_id", "constructor_id"]:
+            part[col] = part[col] + i * 1_000_000
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True)
+
+
+def _best_of(func, df: pd.DataFrame, repeat: int) -> tuple[float, pd.DataFrame]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der F1 Season-Aggregation")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-lambda", action="store_true", help="Lambda-Variante nicht messen (langsam ab 10x)")
+    args = parser.parse_args(argv)
+
+    base = prepare_f1_race_rows(clean_f1_race_driver_frame(join_f1_race_driver(load_f1_raw_tables())))
+    print(f"Basis: {len(base):,} Fahrer-Rennen-Zeilen")
+
+    for k in args.scales:
+        df = replicate(base, k)
+        t_builtin, builtin = _best_of(aggregate_driver_seasons_builtin, df, args.repeat)
+        t_new, new = _best_of(aggregate_f1_driver_seasons, df, args.repeat)
+        # die Engine liefert zusätzlich die Raten
+        _assert_equal(builtin, new[builtin.columns])
+        line = f"{k:>4}x  rows={len(df):>10,}  groups={len(new):>8,}  "
+        if not args.skip_lambda:
+            t_old, old = _best_of(aggregate_driver_seasons_lambda, df, args.repeat)
+            _assert_equal(old, new[old.columns])
+            line += f"lambda={t_old:8.3f}s  "
+        print(line + f"builtin={t_builtin:8.3f}s  spec={t_new:8.3f}s  speedup_vs_builtin={t_builtin / t_new:5.2f}x")
+
+    print("✅ Ergebnisse exakt gleich")
+
+
+def _assert_equal(expected: pd.DataFrame, actual: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_exact=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Speicherbericht für das Laden der F1-Rohtabellen.
+
+Vergleicht je Tabelle pd.read_csv ohne Schema (alle Spalten, geratene
+Typen, \\N als Text) mit dem typisierten Laden über F1_RAW_SCHEMAS:
+Peak-Speicher während des Lesens (tracemalloc) und Grösse des fertigen
+DataFrames (memory_usage(deep=True)).
+
+Beispiel:
+    python -m src.f1.analysis.raw_memory_report --raw-dir data/f1/raw
+"""
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from src.f1.prep.ingest import OPTIONAL_TABLES, RAW_DIR, REQUIRED_TABLES, read_f1_raw_csv
+
+
+def _measure(path: Path, name: str, typed: bool) -> tuple[int, int]:
+    """(Peak beim Lesen, Grösse des DataFrames) in Bytes."""
+    tracemalloc.start()
+    try:
+        df = read_f1_raw_csv(path, name, typed=typed)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, int(df.memory_usage(deep=True).sum())
+
+
+def raw_memory_report(raw_dir: str | Path = RAW_DIR) -> pd.DataFrame:
+    raw_dir = Path(raw_dir)
+    rows = []
+    for name in REQUIRED_TABLES + OPTIONAL_TABLES:
+        path = raw_dir / f"{name}.csv"
+        if not path.exists():
+            continue
+        peak_default, size_default = _measure(path, name, typed=False)
+        peak_typed, size_typed = _measure(path, name, typed=True)
+        rows.append(
+            {
+                "table": name,
+                "peak_default_mb": peak_default / 1e6,
+                "peak_typed_mb": peak_typed / 1e6,
+                "size_default_mb": size_default / 1e6,
+                "size_typed_mb": size_typed / 1e6,
+            }
+        )
+
+    report = pd.DataFrame(rows)
+    total = report.drop(columns="table").sum()
+    report = pd.concat([report, pd.DataFrame([{"table": "TOTAL", **total}])], ignore_index=True)
+    report["peak_saved_pct"] = 100 * (1 - report["peak_typed_mb"] / report["peak_default_mb"])
+    report["size_saved_pct"] = 100 * (1 - report["size_typed_mb"] / report["size_default_mb"])
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Speicherbericht F1-Rohtabellen")
+    parser.add_argument("--raw-dir", type=Path, default=RAW_DIR)
+    args = parser.parse_args(argv)
+
+    report = raw_memory_report(args.raw_dir)
+    print(report.to_string(index=False, float_format=lambda x: f"{x:8.2f}"))
+
+
+if __name__ == "__main__":
+    main()
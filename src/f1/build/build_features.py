@@ -1,22 +1,48 @@
 from __future__ import annotations
 from pathlib import Path
 import pandas as pd
-from src.common.features import require_columns
+from src.common.features import groupwise_mode, require_columns
+from src.common.io import read_table
+from src.common.season_agg import aggregate_groups, load_feature_spec
 from src.schema.core_features import CORE_FEATURES
 
 INTERIM_DIR = Path("data/f1/interim")
 PROCESSED_DIR = Path("data/f1/processed")
 
-
-def load_f1_clean(path: str | Path = INTERIM_DIR / "f1_race_driver_clean.csv") -> pd.DataFrame:
+# Spalten, die der Season-Build wirklich braucht (Projektion beim Lesen)
+FEATURE_INPUT_COLUMNS = [
+    "year",
+    "round",
+    "race_id",
+    "driver_id",
+    "constructor_id",
+    "grid_position",
+    "finishing_position",
+    "finishing_order",
+    "laps_completed",
+    "points",
+    "result_ms",
+    "fastest_lap_speed",
+    "status_text",
+    "driver_name",
+    "driver_code",
+    "driver_nationality",
+    "constructor_name",
+]
+
+
+def load_f1_clean(
+    path: str | Path = INTERIM_DIR / "f1_race_driver_clean.parquet",
+    columns: list[str] | None = FEATURE_INPUT_COLUMNS,
+) -> pd.DataFrame:
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Clean F1 race-driver file not found: {path}")
-    return pd.read_csv(path, low_memory=False)
+    return read_table(path, columns=columns)
 
 
 def build_f1_season_features(
-    input_path: str | Path = INTERIM_DIR / "f1_race_driver_clean.csv",
+    input_path: str | Path = INTERIM_DIR / "f1_race_driver_clean.parquet",
     output_path: str | Path = PROCESSED_DIR / "f1_features.csv",
     core_output_path: str | Path = PROCESSED_DIR / "f1_features_core.csv",
 ) -> tuple[Path, Path]:
@@ -34,7 +60,31 @@ def build_f1_season_features(
     output_path.parent.mkdir(parents=True, exist_ok=True)
     core_output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    df = load_f1_clean(input_path)
+    season_full, season_core = build_f1_season_frames(load_f1_clean(input_path))
+
+    season_full.to_csv(output_path, index=False)
+    print(f"✅ F1 season features written to: {output_path}")
+
+    season_core.to_csv(core_output_path, index=False)
+    print(f"✅ F1 core features written to: {core_output_path}")
+
+    return output_path, core_output_path
+
+
+def build_f1_season_frames(
+    df: pd.DataFrame,
+    team_strategy: str = "first",
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Season-Aggregation von build_f1_season_features ohne Datei-I/O.
+    Gibt (volles Featureset, Core-Featureset) zurück.
+
+    team_strategy: welches Team einem Fahrer pro Saison zugeordnet wird.
+        "first" - Team im ersten Rennen der Saison (bisheriges Verhalten)
+        "mode"  - Team mit den meisten Rennen (bei Gleichstand kleinste constructor_id)
+    """
+    if team_strategy not in ("first", "mode"):
+        raise ValueError(f"Unbekannte team_strategy: {team_strategy!r} (erlaubt: 'first', 'mode')")
 
     required_cols = {
         "year",
@@ -50,81 +100,10 @@ def build_f1_season_features(
     }
     require_columns(df.columns, required_cols, "F1 features")
 
-    # --- Grundtypen setzen ---
-    df["year"] = pd.to_numeric(df.get("year"), errors="coerce").astype("Int64")
-    df["round"] = pd.to_numeric(df.get("round"), errors="coerce").astype("Int64")
-
-    for col in ["grid_position", "finishing_position", "finishing_order", "laps_completed"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df["points"] = pd.to_numeric(df.get("points"), errors="coerce")
-    df["result_ms"] = pd.to_numeric(df.get("result_ms"), errors="coerce")
-    df["fastest_lap_speed"] = pd.to_numeric(df.get("fastest_lap_speed"), errors="coerce")
-
-    # Positionsveränderung: Start vs. Endposition (Order, damit auch DNFs enthalten sind)
-    if "grid_position" in df.columns and "finishing_order" in df.columns:
-        df["pos_change"] = df["grid_position"] - df["finishing_order"]
-    else:
-        df["pos_change"] = pd.NA
-
-    # Safety: Flags sicherstellen
-    if "status_text" in df.columns:
-        df["is_classified_finish"] = df["status_text"].astype(str).str.contains("Finished", na=False)
-        df["is_dnf"] = ~df["is_classified_finish"]
-    else:
-        df["is_dnf"] = False
+    df_season = prepare_f1_race_rows(df)
 
-    df["is_points_finish"] = df["points"].fillna(0) > 0
-
-    # Nur Zeilen mit gültigem Jahr / Fahrer
-    df_season = df.dropna(subset=["year", "driver_id"]).copy()
-
-    # --- Team-Aggregation pro Jahr & Team ---
-    team_group = df_season.groupby(["year", "constructor_id"], dropna=False)
-    team_agg = (
-        team_group.agg(
-            team_total_points=("points", "sum"),
-            team_avg_points=("points", "mean"),
-            team_avg_pos_season=("finishing_order", "mean"),
-            team_speed=("fastest_lap_speed", "mean"),
-            team_n_races=("race_id", "nunique"),
-        )
-        .reset_index()
-    )
-
-    # --- Fahrer-Saison-Aggregation ---
-    driver_group = df_season.groupby(["year", "driver_id"], dropna=False)
-    driver_agg = (
-        driver_group.agg(
-            n_races=("race_id", "nunique"),
-            total_points=("points", "sum"),
-            avg_points=("points", "mean"),
-            avg_grid=("grid_position", "mean"),
-            avg_finish=("finishing_order", "mean"),
-            best_finish=("finishing_order", "min"),
-            worst_finish=("finishing_order", "max"),
-            wins=("finishing_order", lambda s: (s == 1).sum()),
-            podiums=("finishing_order", lambda s: (s <= 3).sum()),
-            points_finishes=("is_points_finish", lambda s: s.fillna(False).sum()),
-            top10_finishes=("finishing_order", lambda s: (s <= 10).sum()),
-            total_laps=("laps_completed", "sum"),
-            avg_kph=("fastest_lap_speed", "mean"),
-            finish_std=("finishing_order", "std"),
-            points_std=("points", "std"),
-            avg_pos_change=("pos_change", "mean"),
-            pos_change_std=("pos_change", "std"),
-            dnf_count=("is_dnf", lambda s: s.fillna(False).sum()),
-        )
-        .reset_index()
-    )
-
-    # Raten aus den Counts ableiten
-    driver_agg["win_rate"] = driver_agg["wins"] / driver_agg["n_races"]
-    driver_agg["podium_rate"] = driver_agg["podiums"] / driver_agg["n_races"]
-    driver_agg["points_rate"] = driver_agg["points_finishes"] / driver_agg["n_races"]
-    driver_agg["top10_rate"] = driver_agg["top10_finishes"] / driver_agg["n_races"]
-    driver_agg["dnf_rate"] = driver_agg["dnf_count"] / driver_agg["n_races"]
+    team_agg = aggregate_f1_team_seasons(df_season)
+    driver_agg = aggregate_f1_driver_seasons(df_season)
 
     # --- Meta-Infos je Fahrer/Saison ---
     meta_cols = [
@@ -143,6 +122,16 @@ def build_f1_season_features(
         .reset_index()
     )
 
+    if team_strategy == "mode" and "constructor_id" in meta.columns:
+        meta = meta.drop(columns=["constructor_id"]).merge(
+            groupwise_mode(df_season, ["year", "driver_id"], "constructor_id").reset_index(),
+            on=["year", "driver_id"],
+            how="left",
+        )
+        if "constructor_name" in meta.columns:
+            names = df_season.drop_duplicates("constructor_id").set_index("constructor_id")["constructor_name"]
+            meta["constructor_name"] = meta["constructor_id"].map(names)
+
     season = driver_agg.merge(meta, on=["year", "driver_id"], how="left")
     season = season.merge(team_agg, on=["year", "constructor_id"], how="left")
 
@@ -208,9 +197,6 @@ def build_f1_season_features(
     # Sortieren für Lesbarkeit
     season_full = season_full.sort_values(["year", "driver_name"]).reset_index(drop=True)
 
-    season_full.to_csv(output_path, index=False)
-    print(f"✅ F1 season features written to: {output_path}")
-
     # --- Core Version für Merge mit F2/F3 ---
     core_cols = [
         "series",
@@ -245,10 +231,59 @@ def build_f1_season_features(
         raise ValueError(f"F1 core columns missing: {missing}")
 
     season_core = season_full[core_cols].copy()
-    season_core.to_csv(core_output_path, index=False)
-    print(f"✅ F1 core features written to: {core_output_path}")
 
-    return output_path, core_output_path
+    return season_full, season_core
+
+
+def prepare_f1_race_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Setzt Typen und Hilfsspalten (pos_change, DNF-/Punkte-Flags) auf der
+    Fahrer-Rennen-Tabelle und behält nur Zeilen mit Jahr und Fahrer.
+    """
+    # --- Grundtypen setzen ---
+    df["year"] = pd.to_numeric(df.get("year"), errors="coerce").astype("Int64")
+    df["round"] = pd.to_numeric(df.get("round"), errors="coerce").astype("Int64")
+
+    for col in ["grid_position", "finishing_position", "finishing_order", "laps_completed"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df["points"] = pd.to_numeric(df.get("points"), errors="coerce")
+    df["result_ms"] = pd.to_numeric(df.get("result_ms"), errors="coerce")
+    df["fastest_lap_speed"] = pd.to_numeric(df.get("fastest_lap_speed"), errors="coerce")
+
+    # Positionsveränderung: Start vs. Endposition (Order, damit auch DNFs enthalten sind)
+    if "grid_position" in df.columns and "finishing_order" in df.columns:
+        df["pos_change"] = df["grid_position"] - df["finishing_order"]
+    else:
+        df["pos_change"] = pd.NA
+
+    # Safety: Flags sicherstellen
+    if "status_text" in df.columns:
+        df["is_classified_finish"] = df["status_text"].astype(str).str.contains("Finished", na=False)
+        df["is_dnf"] = ~df["is_classified_finish"]
+    else:
+        df["is_dnf"] = False
+
+    df["is_points_finish"] = df["points"].fillna(0) > 0
+
+    # Nur Zeilen mit gültigem Jahr / Fahrer
+    df_season = df.dropna(subset=["year", "driver_id"]).copy()
+
+    return df_season
+
+
+def aggregate_f1_team_seasons(df_season: pd.DataFrame) -> pd.DataFrame:
+    """Team-Aggregation pro Jahr & Team (Spec 'f1_team' in configs/features_schema.yaml)."""
+    return aggregate_groups(df_season, load_feature_spec("f1_team"))
+
+
+def aggregate_f1_driver_seasons(df_season: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fahrer-Saison-Aggregation inkl. Raten
+    (Spec 'f1_driver' in configs/features_schema.yaml).
+    """
+    return aggregate_groups(df_season, load_feature_spec("f1_driver"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+"""
+Inkrementelles Update der F1 Season-Features.
+
+Kommt ein neuer Grand Prix in data/f1/raw/results.csv dazu, muss nicht die
+ganze Historie neu gejoint, bereinigt und aggregiert werden. Neben
+f1_features.csv liegt dafür eine Zustandsdatei (f1_features.csv.races.json)
+mit den race_ids, die schon in den Features stecken.
+
+Beim Update werden nur die (year, driver_id)- und (year, constructor_id)-
+Gruppen neu gerechnet, die ein neues Rennen berührt. Fährt ein betroffener
+Fahrer in derselben Saison auch für ein anderes Team (oder umgekehrt),
+kommt diese Gruppe mit dazu, damit Team-Werte und Fahrer-Meta stimmen.
+Die übrigen Zeilen der beiden CSVs bleiben unverändert.
+
+Fehlt die Zustandsdatei oder sind race_ids verschwunden, wird einmal
+komplett neu gebaut.
+
+Beispiel:
+    python -m src.f1.build.update_features
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from src.f1.build.build_features import PROCESSED_DIR, build_f1_season_frames
+from src.f1.prep.clean import clean_f1_race_driver_frame
+from src.f1.prep.ingest import RAW_DIR, join_f1_race_driver, load_f1_raw_tables
+
+
+def state_path(output_path: str | Path) -> Path:
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + ".races.json")
+
+
+def read_state(output_path: str | Path) -> set[int] | None:
+    """race_ids, die in output_path enthalten sind (None, wenn unbekannt)."""
+    sp = state_path(output_path)
+    if not Path(output_path).exists() or not sp.exists():
+        return None
+    try:
+        return {int(r) for r in json.loads(sp.read_text(encoding="utf-8"))["race_ids"]}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_state(output_path: str | Path, race_ids) -> None:
+    payload = {"race_ids": sorted(int(r) for r in race_ids)}
+    state_path(output_path).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def affected_groups(rows: pd.DataFrame, new_race_ids: set[int]) -> tuple[set, set]:
+    """
+    Betroffene (year, driver_id)- und (year, constructor_id)-Schlüssel.
+
+    Ausgehend von den Zeilen der neuen Rennen wird pro Saison so lange
+    erweitert, bis jede Fahrer-Gruppe alle ihre Teams und jede Team-Gruppe
+    alle ihre Fahrer enthält.
+    """
+    pairs = rows[["year", "driver_id", "constructor_id"]].drop_duplicates()
+    new_rows = rows[rows["race_id"].isin(new_race_ids)]
+
+    drivers = set(zip(new_rows["year"], new_rows["driver_id"]))
+    teams = set(zip(new_rows["year"], new_rows["constructor_id"]))
+
+    while True:
+        driver_keys = pd.Series(list(zip(pairs["year"], pairs["driver_id"])), index=pairs.index)
+        team_keys = pd.Series(list(zip(pairs["year"], pairs["constructor_id"])), index=pairs.index)
+        hit = pairs[driver_keys.isin(drivers) | team_keys.isin(teams)]
+
+        new_drivers = drivers | set(zip(hit["year"], hit["driver_id"]))
+        new_teams = teams | set(zip(hit["year"], hit["constructor_id"]))
+        if new_drivers == drivers and new_teams == teams:
+            return drivers, teams
+        drivers, teams = new_drivers, new_teams
+
+
+def update_f1_season_features(
+    raw_dir: str | Path = RAW_DIR,
+    output_path: str | Path = PROCESSED_DIR / "f1_features.csv",
+    core_output_path: str | Path = PROCESSED_DIR / "f1_features_core.csv",
+) -> tuple[Path, Path]:
+    """
+    Patcht f1_features.csv und f1_features_core.csv für neu angehängte Rennen.
+    """
+    raw_dir = Path(raw_dir)
+    output_path = Path(output_path)
+    core_output_path = Path(core_output_path)
+
+    tables = load_f1_raw_tables(raw_dir, include_optional=False)
+    all_race_ids = set(tables["results"]["raceId"].astype(int))
+
+    known = read_state(output_path) if core_output_path.exists() else None
+    if known is None or not known <= all_race_ids:
+        print("ℹ️ Kein gültiger Zustand für ein Update gefunden, baue komplett neu")
+        season_full, season_core = build_f1_season_frames(
+            clean_f1_race_driver_frame(join_f1_race_driver(tables))
+        )
+        _write(season_full, season_core, output_path, core_output_path, all_race_ids)
+        return output_path, core_output_path
+
+    new_race_ids = all_race_ids - known
+    if not new_race_ids:
+        print("✅ F1 season features already up to date")
+        return output_path, core_output_path
+
+    # Nur die Saisons der neuen Rennen joinen und bereinigen
+    races = tables["races"]
+    years = set(races.loc[races["raceId"].isin(new_race_ids), "year"])
+    season_race_ids = races.loc[races["year"].isin(years), "raceId"]
+    tables["races"] = races[races["raceId"].isin(season_race_ids)]
+    tables["results"] = tables["results"][tables["results"]["raceId"].isin(season_race_ids)]
+
+    rows = clean_f1_race_driver_frame(join_f1_race_driver(tables))
+    rows = rows.dropna(subset=["year", "driver_id"])
+
+    drivers, teams = affected_groups(rows, new_race_ids)
+    driver_keys = pd.Series(list(zip(rows["year"], rows["driver_id"])), index=rows.index)
+    rows = rows[driver_keys.isin(drivers)].reset_index(drop=True)
+
+    patch_full, _ = build_f1_season_frames(rows)
+
+    # round_trip: unveränderte Zeilen werden beim Schreiben wieder bitgleich
+    existing = pd.read_csv(output_path, low_memory=False, float_precision="round_trip")
+    existing = _match_dtypes(existing, patch_full)
+    existing_keys = pd.Series(list(zip(existing["year"], existing["driver_id"])), index=existing.index)
+    season_full = pd.concat([existing[~existing_keys.isin(drivers)], patch_full], ignore_index=True)
+
+    # Gleiche Reihenfolge wie beim vollen Build (year, driver_name; stabil nach driver_id)
+    season_full = season_full.sort_values(["year", "driver_name", "driver_id"]).reset_index(drop=True)
+    core_cols = pd.read_csv(core_output_path, nrows=0).columns.tolist()
+    season_core = season_full[core_cols].copy()
+
+    _write(season_full, season_core, output_path, core_output_path, all_race_ids)
+    print(
+        f"ℹ️ {len(new_race_ids)} neue Rennen, {len(drivers)} Fahrer-Saisons "
+        f"und {len(teams)} Team-Saisons neu berechnet"
+    )
+    return output_path, core_output_path
+
+
+def _match_dtypes(existing: pd.DataFrame, patch: pd.DataFrame) -> pd.DataFrame:
+    """
+    Spaltentypen der eingelesenen CSV an den frischen Build angleichen
+    (Int64/Float64/int32 statt int64/float64), damit concat nichts hochcastet.
+    Kategorien bleiben Text: die Kategorien des Patches decken nicht alle
+    bestehenden Werte ab.
+    """
+    existing = existing.copy()
+    for col, dtype in patch.dtypes.items():
+        if col not in existing.columns or existing[col].dtype == dtype or isinstance(dtype, pd.CategoricalDtype):
+            continue
+        existing[col] = existing[col].astype(dtype)
+    return existing
+
+
+def _write(
+    season_full: pd.DataFrame,
+    season_core: pd.DataFrame,
+    output_path: Path,
+    core_output_path: Path,
+    race_ids,
+) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    core_output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    season_full.to_csv(output_path, index=False)
+    print(f"✅ F1 season features written to: {output_path}")
+
+    season_core.to_csv(core_output_path, index=False)
+    print(f"✅ F1 core features written to: {core_output_path}")
+
+    write_state(output_path, race_ids)
+
+
+if __name__ == "__main__":
+    update_f1_season_features()
@@ -0,0 +1,69 @@
+"""F1-Pipeline: Kaggle-Rohdaten -> Join -> Cleaning -> Season-Features."""
+import pandas as pd
+
+from src.common.season_agg import FEATURE_SPEC_PATH
+from src.f1.build.build_features import PROCESSED_DIR, build_f1_season_frames
+from src.f1.prep.clean import INTERIM_DIR, clean_f1_race_driver_frame
+from src.f1.prep.ingest import RAW_DIR, join_f1_race_driver, load_f1_raw_tables
+from src.pipeline.registry import SeriesPlugin
+from src.pipeline.runner import Artifact, Pipeline, Stage
+
+
+F1_PIPELINE = Pipeline(
+    name="f1",
+    stages=[
+        Stage(
+            "load_raw",
+            load_f1_raw_tables,
+            outputs=("f1_raw_tables",),
+            params={"raw_dir": RAW_DIR},
+            sources=(RAW_DIR,),
+        ),
+        Stage(
+            "ingest",
+            join_f1_race_driver,
+            inputs=("f1_raw_tables",),
+            outputs=("f1_race_driver_raw",),
+        ),
+        Stage(
+            "clean",
+            clean_f1_race_driver_frame,
+            inputs=("f1_race_driver_raw",),
+            outputs=("f1_race_driver_clean",),
+        ),
+        Stage(
+            "build",
+            build_f1_season_frames,
+            inputs=("f1_race_driver_clean",),
+            outputs=("f1_features", "f1_features_core"),
+            # "mode": Team mit den meisten Rennen statt Team im ersten Rennen
+            params={"team_strategy": "first"},
+            sources=(FEATURE_SPEC_PATH,),
+        ),
+    ],
+    artifacts={
+        "f1_race_driver_raw": Artifact(INTERIM_DIR / "f1_race_driver_raw.parquet"),
+        "f1_race_driver_clean": Artifact(
+            INTERIM_DIR / "f1_race_driver_clean.parquet", partition_cols=("year",)
+        ),
+        "f1_features": Artifact(PROCESSED_DIR / "f1_features.csv", final=True),
+        "f1_features_core": Artifact(PROCESSED_DIR / "f1_features_core.csv", final=True),
+    },
+)
+
+
+def prepare_master_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Teamname heisst in F1 'constructor_name'."""
+    if "team_name" not in df.columns and "constructor_name" in df.columns:
+        df["team_name"] = df["constructor_name"]
+    return df
+
+
+SERIES = SeriesPlugin(
+    name="F1",
+    pipeline=F1_PIPELINE,
+    features="f1_features",
+    core="f1_features_core",
+    level=5,
+    prepare=prepare_master_columns,
+)
@@ -1,37 +1,49 @@
 from pathlib import Path
 import pandas as pd
 from src.common.features import require_columns
+from src.common.io import read_table, write_table
 
 
 INTERIM_DIR = Path("data/f1/interim")
 PROCESSED_DIR = Path("data/f1/processed")
 
 
-def load_race_driver_raw(path: str | Path = INTERIM_DIR / "f1_race_driver_raw.csv") -> pd.DataFrame:
+def load_race_driver_raw(path: str | Path = INTERIM_DIR / "f1_race_driver_raw.parquet") -> pd.DataFrame:
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Raw race-driver file not found: {path}")
-    # low_memory=False, damit Pandas die Typen besser erkennen kann
-    return pd.read_csv(path, low_memory=False)
+    return read_table(path)
 
 
 def clean_f1_race_driver(
-    input_path: str | Path = INTERIM_DIR / "f1_race_driver_raw.csv",
-    output_path: str | Path = INTERIM_DIR / "f1_race_driver_clean.csv",
+    input_path: str | Path = INTERIM_DIR / "f1_race_driver_raw.parquet",
+    output_path: str | Path = INTERIM_DIR / "f1_race_driver_clean.parquet",
 ) -> Path:
     """
     Leichtes Cleaning für F1:
     - Typen setzen
     - Helferspalten erstellen (DNF, Classified, Points-Finish)
     - Optionale Filter (z.B. nach Jahr) vorbereiten
+
+    Der Output wird als Parquet nach year partitioniert, damit Folgestufen
+    einzelne Saisons lesen können (bei .csv-Endung als CSV).
     """
 
     input_path = Path(input_path)
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    df = load_race_driver_raw(input_path)
+    df = clean_f1_race_driver_frame(load_race_driver_raw(input_path))
+
+    # Speichern
+    partition_cols = ["year"] if output_path.suffix == ".parquet" else None
+    write_table(df, output_path, partition_cols=partition_cols)
+    print(f"✅ F1 race-driver CLEAN table written to: {output_path}")
+
+    return output_path
 
+
+def clean_f1_race_driver_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Cleaning-Schritte von clean_f1_race_driver auf einem DataFrame."""
     require_columns(
         df.columns,
         {
@@ -101,11 +113,7 @@ def clean_f1_race_driver(
     if sort_cols:
         df = df.sort_values(sort_cols).reset_index(drop=True)
 
-    # Speichern
-    df.to_csv(output_path, index=False)
-    print(f"✅ F1 race-driver CLEAN table written to: {output_path}")
-
-    return output_path
+    return df
 
 
 if __name__ == "__main__":
@@ -1,56 +1,230 @@
 from pathlib import Path
 import pandas as pd
 from src.common.features import require_columns
+from src.common.io import write_table
 
 
 # Standardpfade (relativ zum Projekt-Root)
 RAW_DIR = Path("data/f1/raw")
 INTERIM_DIR = Path("data/f1/interim")
 
+# Kaggle markiert fehlende Werte mit \N
+RAW_NA_VALUES = ["\\N"]
 
-def load_f1_raw_tables(raw_dir: Path = RAW_DIR) -> dict:
+_ID = "int32"
+_INT = "int16"
+_OPT_INT = "Int16"
+_CAT = "category"
+
+# Schema je Rohtabelle: nur diese Spalten werden gelesen (url & Co. nicht).
+# Schlüssel und Zähler als schmale NumPy-Ints, Spalten mit \N-Lücken
+# (Startnummer, Position, Zeiten) als Nullable-Int; wenige, oft
+# wiederholte Texte (Status, Nationalität, Teamname) als category.
+F1_RAW_SCHEMAS: dict[str, dict[str, str]] = {
+    "races": {
+        "raceId": _ID,
+        "year": _INT,
+        "round": _INT,
+        "circuitId": _ID,
+        "name": _CAT,
+        "date": "str",
+        "time": "str",
+    },
+    "results": {
+        "resultId": _ID,
+        "raceId": _ID,
+        "driverId": _ID,
+        "constructorId": _ID,
+        "number": _OPT_INT,
+        "grid": _INT,
+        "position": _OPT_INT,
+        "positionText": _CAT,
+        "positionOrder": _INT,
+        "points": "float64",
+        "laps": _INT,
+        "time": "str",
+        "milliseconds": "Int64",
+        "fastestLap": _OPT_INT,
+        "rank": _OPT_INT,
+        "fastestLapTime": "str",
+        "fastestLapSpeed": "float64",
+        "statusId": _ID,
+    },
+    "drivers": {
+        "driverId": _ID,
+        "driverRef": "str",
+        "number": _OPT_INT,
+        "code": "str",
+        "forename": "str",
+        "surname": "str",
+        "dob": "str",
+        "nationality": _CAT,
+    },
+    "constructors": {
+        "constructorId": _ID,
+        "constructorRef": "str",
+        "name": _CAT,
+        "nationality": _CAT,
+    },
+    "circuits": {
+        "circuitId": _ID,
+        "circuitRef": "str",
+        "name": "str",
+        "location": "str",
+        "country": _CAT,
+        "lat": "float64",
+        "lng": "float64",
+        "alt": "float64",
+    },
+    "status": {
+        "statusId": _ID,
+        "status": _CAT,
+    },
+    "lap_times": {
+        "raceId": _ID,
+        "driverId": _ID,
+        "lap": _INT,
+        "position": _OPT_INT,
+        "time": "str",
+        "milliseconds": "int32",
+    },
+    "pit_stops": {
+        "raceId": _ID,
+        "driverId": _ID,
+        "stop": _INT,
+        "lap": _INT,
+        "time": "str",
+        "duration": "str",
+        "milliseconds": "int32",
+    },
+    "qualifying": {
+        "qualifyId": _ID,
+        "raceId": _ID,
+        "driverId": _ID,
+        "constructorId": _ID,
+        "number": _OPT_INT,
+        "position": _OPT_INT,
+        "q1": "str",
+        "q2": "str",
+        "q3": "str",
+    },
+    "sprint_results": {
+        "resultId": _ID,
+        "raceId": _ID,
+        "driverId": _ID,
+        "constructorId": _ID,
+        "number": _OPT_INT,
+        "grid": _INT,
+        "position": _OPT_INT,
+        "positionText": _CAT,
+        "positionOrder": _INT,
+        "points": "float64",
+        "laps": _INT,
+        "time": "str",
+        "milliseconds": "Int64",
+        "fastestLap": _OPT_INT,
+        "fastestLapTime": "str",
+        "statusId": _ID,
+    },
+    "driver_standings": {
+        "driverStandingsId": _ID,
+        "raceId": _ID,
+        "driverId": _ID,
+        "points": "float64",
+        "position": _INT,
+        "positionText": _CAT,
+        "wins": _INT,
+    },
+    "constructor_standings": {
+        "constructorStandingsId": _ID,
+        "raceId": _ID,
+        "constructorId": _ID,
+        "points": "float64",
+        "position": _INT,
+        "positionText": _CAT,
+        "wins": _INT,
+    },
+    "constructor_results": {
+        "constructorResultsId": _ID,
+        "raceId": _ID,
+        "constructorId": _ID,
+        "points": "float64",
+        "status": _CAT,
+    },
+    "seasons": {
+        "year": _INT,
+    },
+}
+
+REQUIRED_TABLES = ["races", "results", "drivers", "constructors", "circuits", "status"]
+OPTIONAL_TABLES = [
+    "lap_times",
+    "pit_stops",
+    "qualifying",
+    "sprint_results",
+    "driver_standings",
+    "constructor_standings",
+    "constructor_results",
+    "seasons",
+]
+
+
+def read_f1_raw_csv(path: str | Path, name: str, typed: bool = True) -> pd.DataFrame:
+    """
+    Liest eine Kaggle-Rohtabelle.
+
+    typed=True: nur die Spalten aus F1_RAW_SCHEMAS, mit festen dtypes und
+    \\N als fehlendem Wert. typed=False: pandas-Standard (alle Spalten, geratene Typen).
+    """
+    if not typed:
+        return pd.read_csv(path)
+
+    schema = F1_RAW_SCHEMAS[name]
+    return pd.read_csv(
+        path,
+        usecols=lambda c: c in schema,
+        dtype=schema,
+        na_values=RAW_NA_VALUES,
+    )
+
+
+def load_f1_raw_tables(
+    raw_dir: Path = RAW_DIR,
+    include_optional: bool = True,
+    typed: bool = True,
+) -> dict:
     """
     Lädt alle relevanten F1-Roh-CSV-Dateien und gibt sie als Dict zurück.
     Erwartet das klassische F1-Kaggle-Schema.
+
+    include_optional=False lädt nur die Tabellen, die der Join braucht.
+    typed=False liest ohne Schema (nur für Vergleiche, z.B. Speicherbericht).
     """
     raw_dir = Path(raw_dir)
 
     tables = {}
 
-    def read_csv(name: str) -> pd.DataFrame:
+    for name in REQUIRED_TABLES:
         path = raw_dir / f"{name}.csv"
         if not path.exists():
             raise FileNotFoundError(f"Expected raw file not found: {path}")
-        return pd.read_csv(path)
+        tables[name] = read_f1_raw_csv(path, name, typed=typed)
 
-    tables["races"] = read_csv("races")
-    tables["results"] = read_csv("results")
-    tables["drivers"] = read_csv("drivers")
-    tables["constructors"] = read_csv("constructors")
-    tables["circuits"] = read_csv("circuits")
-    tables["status"] = read_csv("status")
+    if not include_optional:
+        return tables
 
     # Optional – können wir später für Features nutzen
-    for optional in [
-        "lap_times",
-        "pit_stops",
-        "qualifying",
-        "sprint_results",
-        "driver_standings",
-        "constructor_standings",
-        "constructor_results",
-        "seasons",
-    ]:
+    for optional in OPTIONAL_TABLES:
         path = raw_dir / f"{optional}.csv"
         if path.exists():
-            tables[optional] = pd.read_csv(path)
+            tables[optional] = read_f1_raw_csv(path, optional, typed=typed)
 
     return tables
 
 
 def build_f1_race_driver_raw(
     raw_dir: str | Path = RAW_DIR,
-    output_path: str | Path = INTERIM_DIR / "f1_race_driver_raw.csv",
+    output_path: str | Path = INTERIM_DIR / "f1_race_driver_raw.parquet",
 ) -> Path:
     """
     Baut eine grundlegende "one row per driver per race"-Tabelle,
@@ -62,10 +236,21 @@ def build_f1_race_driver_raw(
 
     raw_dir = Path(raw_dir)
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    tables = load_f1_raw_tables(raw_dir)
+    df = join_f1_race_driver(load_f1_raw_tables(raw_dir))
+
+    # Speichern (Format über die Endung, Standard: Parquet)
+    write_table(df, output_path)
+    print(f"✅ F1 race-driver raw table written to: {output_path}")
+
+    return output_path
+
 
+def join_f1_race_driver(tables: dict) -> pd.DataFrame:
+    """
+    Join-Teil von build_f1_race_driver_raw ohne Datei-I/O, damit der
+    Pipeline-Runner das Ergebnis direkt an die Clean-Stufe weitergeben kann.
+    """
     races = tables["races"].copy()
     results = tables["results"].copy()
     drivers = tables["drivers"].copy()
@@ -217,11 +402,7 @@ def build_f1_race_driver_raw(
     # Ein bisschen sortieren für bessere Lesbarkeit
     df = df.sort_values(["year", "round", "race_id", "finishing_order"]).reset_index(drop=True)
 
-    # Speichern
-    df.to_csv(output_path, index=False)
-    print(f"✅ F1 race-driver raw table written to: {output_path}")
-
-    return output_path
+    return df
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""
+Benchmark: Fahrer-Zelle der FIA-Tabellen zerlegen.
+
+Alt:  df["driver_info"].apply(parse_driver_info)   (eine pd.Series pro Zeile)
+Neu:  parse_driver_info_column                    (zwei str.extract über die Spalte)
+
+Die Testspalte wird synthetisch im FIA-Format erzeugt (optionaler Status,
+Startnummer, Name mit Initiale, Dreier-Code, Team, ab und zu \\xa0 und
+Zellen ohne Code oder leer). Beide Varianten müssen dieselben Werte liefern.
+
+Die alte Variante baut pro Zeile eine pd.Series und braucht bei einer
+Million Zeilen mehrere GB; sie läuft deshalb nur auf den ersten
+--apply-rows Zeilen, ihre Zeit wird linear auf --rows hochgerechnet.
+
+Beispiel:
+    python -m src.f2.analysis.bench_driver_info --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.f2.prep.clean_f2_results import parse_driver_info, parse_driver_info_column
+
+SURNAMES = ["Daruvala", "Vips", "Hauger", "Bortoleto", "Verschoor", "Maini", "Crawford", "Martins"]
+TEAMS = ["Prema Racing", "Hitech Grand Prix", "MP Motorsport", "Invicta Virtuosi Racing", "ART Grand Prix"]
+STATUSES = ["", "", "", "", "DNF", "DNS", "DSQ"]
+
+
+def synthetic_driver_cells(n_rows: int, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    surname = rng.choice(SURNAMES, n_rows)
+    team = rng.choice(TEAMS, n_rows)
+    status = rng.choice(STATUSES, n_rows)
+    number = rng.integers(1, 30, n_rows).astype(str)
+    initial = rng.choice(list("ABCDEFGHJKLMNOPRSTVZ"), n_rows)
+    code = pd.Series(surname).str[:3].str.upper()
+    sep = rng.choice([" ", "\xa0", ""], n_rows, p=[0.2, 0.1, 0.7])
+
+    cells = (
+        pd.Series(status) + pd.Series(number) + pd.Series(sep)
+        + pd.Series(initial) + ". " + pd.Series(surname) + code + pd.Series(team)
+    ).astype(object)
+
+    # ein paar Sonderfälle: ohne Code, ohne Startnummer, leer
+    special = rng.random(n_rows)
+    cells[special < 0.01] = pd.Series(number)[special < 0.01] + " tbc"
+    cells[(special >= 0.01) & (special < 0.015)] = "Withdrawn"
+    cells[(special >= 0.015) & (special < 0.02)] = None
+    return cells
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der F2 Fahrer-Zellen-Zerlegung")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--apply-rows", type=int, default=50_000, help="Zeilen für die alte apply-Variante")
+    args = parser.parse_args(argv)
+
+    cells = synthetic_driver_cells(args.rows)
+    sample = cells.iloc[: min(args.apply_rows, len(cells))]
+    print(f"Zeilen: {len(cells):,} (apply auf {len(sample):,})")
+
+    t0 = time.perf_counter()
+    new = parse_driver_info_column(cells)
+    t_new = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    old = sample.apply(parse_driver_info)
+    t_old = (time.perf_counter() - t0) * len(cells) / len(sample)
+
+    new = new.iloc[: len(sample)]
+    old = old.astype(object).where(old.notna(), None)
+    new = new.astype(object).where(new.notna(), None)
+    pd.testing.assert_frame_equal(old, new)
+
+    print(
+        f"apply (hochgerechnet): {t_old:8.2f}s  vektorisiert: {t_new:8.2f}s  "
+        f"speedup: {t_old / t_new:6.1f}x"
+    )
+    print("✅ Ergebnisse identisch")
+
+
+if __name__ == "__main__":
+    main()
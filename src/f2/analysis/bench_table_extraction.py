@@ -0,0 +1,65 @@
+"""
+Benchmark: Klassifikationstabellen aus gespeicherten FIA-Seiten lesen.
+
+Alt:  pd.read_html über die ganze Seite + finde_klassifikationstabelle
+Neu:  extract_classification_tables (erst Header prüfen, nur Treffer parsen)
+
+Gelesen werden alle <race_id>.html eines Ordners, standardmässig der
+HTML-Cache des Scrapers für die FIA-Seite. Geprüft wird zusätzlich, dass die alte Auswahl
+(grösste passende Tabelle) auch im neuen Ergebnis enthalten ist.
+
+Beispiel:
+    python -m src.f2.analysis.bench_table_extraction --pages-dir data/f2/raw/html_cache/www.fiaformula2.com
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from io import StringIO
+from pathlib import Path
+
+import pandas as pd
+
+from src.f2.prep.http_cache import CACHE_DIR, cache_host
+from src.f2.prep.ingest_fia import BASE_URL, extract_classification_tables, finde_klassifikationstabelle
+
+
+def extract_full_page(html: str, race_id: int) -> pd.DataFrame:
+    """Bisherige Variante: jede Tabelle der Seite wird zum DataFrame."""
+    return finde_klassifikationstabelle(pd.read_html(StringIO(html)), race_id)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der FIA-Tabellenextraktion")
+    parser.add_argument("--pages-dir", type=Path, default=CACHE_DIR / cache_host(BASE_URL))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    pages = sorted(args.pages_dir.glob("*.html"))
+    if not pages:
+        raise FileNotFoundError(f"Keine gespeicherten Seiten (*.html) in {args.pages_dir}")
+    htmls = [(int(p.stem), p.read_text(encoding="utf-8")) for p in pages if p.stem.isdigit()]
+
+    t_old = t_new = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        old = [extract_full_page(html, race_id) for race_id, html in htmls]
+        t_old = min(t_old, time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        new = [extract_classification_tables(html, race_id) for race_id, html in htmls]
+        t_new = min(t_new, time.perf_counter() - t0)
+
+    for (race_id, _), old_df, labeled in zip(htmls, old, new):
+        if not any(old_df.equals(df) for _, df in labeled):
+            raise AssertionError(f"race_id={race_id}: alte Auswahl fehlt im neuen Ergebnis")
+
+    n_tables = sum(len(labeled) for labeled in new)
+    n_labeled = sum(label is not None for labeled in new for label, _ in labeled)
+    print(f"Seiten: {len(htmls)}, Klassifikationstabellen: {n_tables} (davon mit Session-Label: {n_labeled})")
+    print(f"ganze Seite: {t_old:8.3f}s  header-first: {t_new:8.3f}s  speedup: {t_old / t_new:5.1f}x")
+    print("✅ Alte Auswahl in allen Seiten enthalten")
+
+
+if __name__ == "__main__":
+    main()
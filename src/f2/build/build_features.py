@@ -1,11 +1,12 @@
 import pandas as pd
-import numpy as np
-import re
 from pathlib import Path
-from src.common.features import require_columns
+from src.common.features import groupwise_mode, require_columns
+from src.common.io import read_table
+from src.common.season_agg import aggregate_groups, load_feature_spec
+from src.common.timeparse import parse_gap_column, parse_laps_down_column, parse_time_column
 from src.schema.core_features import CORE_FEATURES
 
-INPUT_PATH = Path("data/f2/interim/f2_results_fia_drivers_clean.csv")
+INPUT_PATH = Path("data/f2/interim/f2_results_fia_drivers_clean.parquet")
 OUTPUT_PATH = Path("data/f2/processed/f2_features.csv")
 
 POINTS_TABLE = {
@@ -22,75 +23,20 @@ POINTS_TABLE = {
 }
 
 
-def parse_time_to_seconds(s: str) -> float:
-    """Konvertiert Zeitstring wie '43:01.023' oder '1:47.175' in Sekunden."""
-    if pd.isna(s):
-        return np.nan
-    if isinstance(s, (int, float)):
-        return float(s)
-
-    s = str(s).strip()
-    if s in ("", "-", "DNF", "DNS", "DSQ"):
-        return np.nan
-
-    # Reine Sekunden
-    if re.match(r"^\d+(\.\d+)?$", s):
-        try:
-            return float(s)
-        except ValueError:
-            return np.nan
-
-    parts = s.split(":")
-
-    try:
-        if len(parts) == 3:
-            h = int(parts[0])
-            m = int(parts[1])
-            sec = float(parts[2])
-            return h * 3600 + m * 60 + sec
-        elif len(parts) == 2:
-            m = int(parts[0])
-            sec = float(parts[1])
-            return m * 60 + sec
-        else:
-            return float(s)
-    except ValueError:
-        return np.nan
-
-
-def parse_gap_to_seconds(s: str) -> float:
-    """Konvertiert Gap in Sekunden falls möglich, ignoriert Angaben wie '1 LAP'."""
-    if pd.isna(s):
-        return np.nan
-
-    s = str(s).strip()
-    if s in ("", "-", "DNF", "DNS", "DSQ"):
-        return np.nan
-
-    if "LAP" in s.upper():
-        return np.nan
-
-    s_clean = s.replace("+", "")
-    try:
-        return float(s_clean)
-    except ValueError:
-        return np.nan
-
-
-def mode_or_first(s: pd.Series):
-    """Gibt den häufigsten Wert oder den ersten Wert zurück."""
-    if s.isna().all():
-        return np.nan
-    m = s.mode()
-    if len(m) > 0:
-        return m.iloc[0]
-    return s.iloc[0]
-
-
 def build_f2_features() -> None:
     print(f"Lade Daten aus {INPUT_PATH} ...")
-    df = pd.read_csv(INPUT_PATH)
+    agg = build_f2_feature_frame(read_table(INPUT_PATH))
+
+    # Ausgabeordner anlegen
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"Speichere Features nach {OUTPUT_PATH} ...")
+    agg.to_csv(OUTPUT_PATH, index=False)
+    print("Fertig. Anzahl Fahrer Saison Kombinationen:", len(agg))
+
 
+def build_f2_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Season-Aggregation von build_f2_features ohne Datei-I/O."""
     required_cols = {
         "season",
         "race_id",
@@ -115,9 +61,11 @@ def build_f2_features() -> None:
 
     # Zeiten und Geschwindigkeiten vorbereiten
     print("Konvertiere Zeiten und Gaps in Sekunden ...")
-    df["race_time_s"] = df["race_time"].apply(parse_time_to_seconds)
-    df["best_lap_time_s"] = df["best_lap_time"].apply(parse_time_to_seconds)
-    df["gap_s"] = df["gap"].apply(parse_gap_to_seconds)
+    df["race_time_s"] = parse_time_column(df["race_time"])
+    df["best_lap_time_s"] = parse_time_column(df["best_lap_time"])
+    df["gap_s"] = parse_gap_column(df["gap"])
+    # Überrundete: Rückstand in Runden statt NaN (-> avg_laps_down)
+    df["gap_laps"] = parse_laps_down_column(df["gap"])
 
     # Zielposition pro Rennen
     print("Berechne Zielposition pro Rennen ...")
@@ -141,39 +89,17 @@ def build_f2_features() -> None:
 
     # Aggregation pro Fahrer und Saison
     print("Aggregiere Features pro Fahrer und Saison ...")
-    group_cols = ["series", "year", "driver_code"]
-
-    agg = (
-        df.groupby(group_cols)
-        .agg(
-            driver_name=("driver_name", mode_or_first),
-            team_name=("team_name", mode_or_first),
-            n_races=("finish_position", "count"),
-            total_points=("points", "sum"),
-            avg_points=("points", "mean"),
-            avg_finish=("finish_position", "mean"),
-            best_finish=("finish_position", "min"),
-            worst_finish=("finish_position", "max"),
-            wins=("finish_position", lambda s: (s == 1).sum()),
-            podiums=("finish_position", lambda s: (s <= 3).sum()),
-            points_finishes=("finish_position", lambda s: (s <= 10).sum()),
-            top10_finishes=("finish_position", lambda s: (s <= 10).sum()),
-            total_laps=("laps", "sum"),
-            avg_kph=("kph", "mean"),
-            avg_best_lap_s=("best_lap_time_s", "mean"),
-            finish_std=("finish_position", "std"),
-            points_std=("points", "std"),
-            dnf_count=("is_dnf_or_dq", "sum"),
-        )
-        .reset_index()
-    )
+    spec = load_feature_spec("f2")
+    group_cols = list(spec.group_by)
+
+    agg = aggregate_groups(df, spec)
 
-    # Raten bauen
-    agg["win_rate"] = agg["wins"] / agg["n_races"]
-    agg["podium_rate"] = agg["podiums"] / agg["n_races"]
-    agg["points_rate"] = agg["points_finishes"] / agg["n_races"]
-    agg["top10_rate"] = agg["top10_finishes"] / agg["n_races"]
-    agg["dnf_rate"] = agg["dnf_count"] / agg["n_races"]
+    # Häufigster Name / häufigstes Team pro Fahrer und Saison
+    modes = pd.concat(
+        [groupwise_mode(df, group_cols, "driver_name"), groupwise_mode(df, group_cols, "team_name")],
+        axis=1,
+    ).reset_index()
+    agg = agg.merge(modes, on=group_cols, how="left")
 
     # Spalten in die gleiche Reihenfolge wie beim F3 Featureset bringen
     col_order = [
@@ -203,15 +129,9 @@ def build_f2_features() -> None:
         "points_std",
         "dnf_count",
         "dnf_rate",
+        "avg_laps_down",
     ]
-    agg = agg[col_order]
-
-    # Ausgabeordner anlegen
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    print(f"Speichere Features nach {OUTPUT_PATH} ...")
-    agg.to_csv(OUTPUT_PATH, index=False)
-    print("Fertig. Anzahl Fahrer Saison Kombinationen:", len(agg))
+    return agg[col_order]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,58 @@
+"""F2-Pipeline: FIA-Scraper -> Cleaning -> Namen -> Season-Features."""
+from pathlib import Path
+
+from src.common.season_agg import FEATURE_SPEC_PATH
+from src.f2.build import build_features
+from src.f2.prep import clean_f2_results, clean_name, ingest_fia
+from src.pipeline.registry import SeriesPlugin
+from src.pipeline.runner import Artifact, Pipeline, Stage
+
+
+# Start ab den gespeicherten Rohdaten (ohne neu zu scrapen):
+#   python -m src.pipeline.runner f2 --start-at clean
+F2_PIPELINE = Pipeline(
+    name="f2",
+    stages=[
+        Stage(
+            "load_meta",
+            ingest_fia.load_manual_race_list,
+            outputs=("f2_race_meta",),
+            params={"path": ingest_fia.MANUAL_META_PATH},
+            sources=(ingest_fia.MANUAL_META_PATH,),
+        ),
+        Stage(
+            "ingest",
+            ingest_fia.scrape_all_races,
+            inputs=("f2_race_meta",),
+            outputs=("f2_results_fia",),
+        ),
+        Stage(
+            "clean",
+            clean_f2_results.clean_f2_results_frame,
+            inputs=("f2_results_fia",),
+            outputs=("f2_results_fia_clean",),
+        ),
+        Stage(
+            "names",
+            clean_name.split_driver_names,
+            inputs=("f2_results_fia_clean",),
+            outputs=("f2_results_fia_drivers_clean",),
+        ),
+        Stage(
+            "build",
+            build_features.build_f2_feature_frame,
+            inputs=("f2_results_fia_drivers_clean",),
+            outputs=("f2_features",),
+            sources=(FEATURE_SPEC_PATH,),
+        ),
+    ],
+    artifacts={
+        "f2_results_fia": Artifact(ingest_fia.OUTPUT_PATH),
+        "f2_results_fia_clean": Artifact(clean_f2_results.OUTPUT),
+        "f2_results_fia_drivers_clean": Artifact(Path(clean_name.OUTPUT_PATH)),
+        "f2_features": Artifact(build_features.OUTPUT_PATH, final=True),
+    },
+)
+
+
+SERIES = SeriesPlugin(name="F2", pipeline=F2_PIPELINE, features="f2_features", core="f2_features", level=4)
@@ -2,10 +2,19 @@ import pandas as pd
 import re
 from pathlib import Path
 from src.common.features import require_columns
+from src.common.io import read_table, write_table
 
 # Pfade anpassen falls nötig
 INPUT = Path("data/f2/raw/f2_results_fia.csv")
-OUTPUT = Path("data/f2/interim/f2_results_fia_clean.csv")
+OUTPUT = Path("data/f2/interim/f2_results_fia_clean.parquet")
+
+DRIVER_INFO_COLUMNS = ["status", "car_number", "driver_name", "driver_code", "team_name"]
+
+# Gleiche Muster wie in parse_driver_info, nur für str.extract:
+# optionaler Status, Startnummer, Rest ...
+_DRIVER_CELL_RE = r"^(?P<status>[A-Z]+)?(?P<number>\d+)\s*(?P<rest>.*)$"
+# ... und im Rest der erste Dreierblock Grossbuchstaben als Driver Code
+_DRIVER_REST_RE = r"^(?P<name>.*?)(?P<code>[A-Z]{3})(?P<team>.*)$"
 
 
 def parse_driver_info(cell):
@@ -54,10 +63,52 @@ def parse_driver_info(cell):
     )
 
 
+def parse_driver_info_column(cells: pd.Series) -> pd.DataFrame:
+    """
+    Vektorisierte Variante von parse_driver_info für eine ganze Spalte:
+    zwei str.extract-Durchläufe statt einer pd.Series pro Zeile.
+    Liefert dieselben Werte (fehlende Teile als NA).
+    """
+    out = pd.DataFrame(index=cells.index, columns=DRIVER_INFO_COLUMNS, dtype=object)
+
+    present = cells.notna()
+    text = cells[present].astype(str).str.strip().str.replace("\xa0", " ", regex=False)
+
+    m = text.str.extract(_DRIVER_CELL_RE)
+    matched = m["number"].notna()
+
+    # Kein Treffer: ganzer Text als Name
+    out.loc[text.index[~matched], "driver_name"] = text[~matched]
+
+    rest = m.loc[matched, "rest"].str.strip()
+    out.loc[rest.index, "status"] = m.loc[matched, "status"]
+    out.loc[rest.index, "car_number"] = m.loc[matched, "number"]
+
+    m2 = rest.str.extract(_DRIVER_REST_RE)
+    has_code = m2["code"].notna()
+
+    # Kein Driver Code: Rest als Name
+    out.loc[rest.index[~has_code], "driver_name"] = rest[~has_code]
+
+    coded = m2[has_code]
+    # Punkt nach Initialen entfernen
+    out.loc[coded.index, "driver_name"] = coded["name"].str.strip().str.replace(".", " ", regex=False).str.strip()
+    out.loc[coded.index, "driver_code"] = coded["code"]
+    out.loc[coded.index, "team_name"] = coded["team"].str.strip()
+
+    return out
+
+
 def main():
     print(f"Lade Rohdaten aus {INPUT}")
-    df = pd.read_csv(INPUT)
+    df = clean_f2_results_frame(read_table(INPUT))
 
+    write_table(df, OUTPUT)
+    print(f"Fertig. Gespeichert unter {OUTPUT}")
+
+
+def clean_f2_results_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Bereinigt die FIA-Rohtabelle (Spaltennamen, Fahrerinfo, Typen)."""
     # Spaltennamen bereinigen
     df.columns = df.columns.str.strip()
     df.columns = df.columns.str.replace(r"[^\w\s]+", "_", regex=True)
@@ -74,13 +125,13 @@ def main():
     require_columns(df.columns, required_raw_cols, "F2 raw clean")
 
     # Fahrerinfo parsen
-    parsed = df["driver_info"].apply(parse_driver_info)
+    parsed = parse_driver_info_column(df["driver_info"])
 
     # Alte Spalten entfernen falls vorhanden und neue anhängen
     df = pd.concat(
         [
             df.drop(
-                columns=["status", "car_number", "driver_name", "driver_code", "team_name"],
+                columns=DRIVER_INFO_COLUMNS,
                 errors="ignore",
             ),
             parsed,
@@ -97,8 +148,7 @@ def main():
     # optional sortieren
     df = df.sort_values(["season", "round", "session", "race_id"]).reset_index(drop=True)
 
-    df.to_csv(OUTPUT, index=False)
-    print(f"Fertig. Gespeichert unter {OUTPUT}")
+    return df
 
 
 if __name__ == "__main__":
@@ -1,13 +1,25 @@
 import pandas as pd
+from src.common.io import read_table, write_table
 
 # Pfade an dein Projekt anpassen
-INPUT_PATH = "data/f2/interim/f2_results_fia_clean.csv"
-OUTPUT_PATH = "data/f2/interim/f2_results_fia_drivers_clean.csv"
+INPUT_PATH = "data/f2/interim/f2_results_fia_clean.parquet"
+OUTPUT_PATH = "data/f2/interim/f2_results_fia_drivers_clean.parquet"
 
 def main() -> None:
     # 1. Daten laden
-    df = pd.read_csv(INPUT_PATH)
+    df = read_table(INPUT_PATH)
 
+    df = split_driver_names(df)
+
+    # 3. Speichern
+    write_table(df, OUTPUT_PATH)
+
+    print("Fertig. Gespeichert unter:", OUTPUT_PATH)
+    print(df[["driver_name", "driver_initial", "driver_last_name"]].head(10))
+
+
+def split_driver_names(df: pd.DataFrame) -> pd.DataFrame:
+    """Ergänzt driver_initial und driver_last_name direkt nach driver_name."""
     # 2. Treibername aufraeumen
     name = df["driver_name"].astype(str).str.strip()
 
@@ -33,13 +45,7 @@ def main() -> None:
         idx = cols.index("driver_name") + 1
         cols.insert(idx, new_col)
 
-    df = df[cols]
-
-    # 3. Speichern
-    df.to_csv(OUTPUT_PATH, index=False)
-
-    print("Fertig. Gespeichert unter:", OUTPUT_PATH)
-    print(df[["driver_name", "driver_initial", "driver_last_name"]].head(10))
+    return df[cols]
 
 
 if __name__ == "__main__":
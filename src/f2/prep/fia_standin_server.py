@@ -0,0 +1,136 @@
+"""
+Lokaler Ersatz für die FIA F2 Ergebnisseiten.
+
+Liefert gespeicherte Seiten aus einem Ordner (<race_id>.html) unter
+/Results?raceid=<race_id> aus, damit der Scraper ohne Internet und ohne
+die FIA-Seite zu belasten geprüft werden kann. Mit --fail-first N
+antwortet der Server pro Rennen zuerst N-mal mit 503 (Retry-Pfad).
+Mit --delay S (bzw. delays={race_id: S} für einzelne Rennen) kommen Antworten um S Sekunden
+verzögert, mit --slow-first N nur die ersten N pro Rennen (Timeout-Pfad).
+Jede Seite bekommt ein ETag und Last-Modified; passende bedingte
+Requests werden mit 304 beantwortet (HTML-Cache).
+
+Beispiel:
+    python -m src.f2.prep.fia_standin_server data/f2/raw/html --port 8765
+    python -m src.f2.prep.ingest_fia --base-url "http://127.0.0.1:8765/Results?raceid={race_id}" --rps 20
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+
+def make_handler(
+    pages_dir: Path,
+    fail_first: int = 0,
+    delay: float = 0.0,
+    delays: dict[int, float] | None = None,
+    slow_first: int = 0,
+):
+    """
+    delay: Verzögerung jeder Antwort in Sekunden, delays: abweichend pro
+    race_id; slow_first: nur die ersten N Antworten pro Rennen verzögern
+    (0 = alle).
+    """
+    pages_dir = Path(pages_dir)
+    delays = {str(race_id): float(seconds) for race_id, seconds in (delays or {}).items()}
+    calls: Counter = Counter()
+    lock = threading.Lock()
+
+    class FiaStandInHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 (Name von BaseHTTPRequestHandler vorgegeben)
+            url = urlparse(self.path)
+            race_id = parse_qs(url.query).get("raceid", [""])[0]
+            page = pages_dir / f"{race_id}.html"
+
+            if url.path.rstrip("/").lower() != "/results" or not race_id.isdigit() or not page.exists():
+                self.send_error(404)
+                return
+
+            with lock:
+                calls[race_id] += 1
+                n_calls = calls[race_id]
+            seconds = delays.get(race_id, delay)
+            if seconds and (slow_first <= 0 or n_calls <= slow_first):
+                time.sleep(seconds)
+            if n_calls <= fail_first:
+                self.send_error(503)
+                return
+
+            body = page.read_bytes()
+            etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+            last_modified = formatdate(page.stat().st_mtime, usegmt=True)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            try:
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # Client hat wegen Timeout schon aufgegeben (verzögerte Antwort)
+                pass
+
+        def log_message(self, format, *args):  # noqa: A002
+            pass
+
+    return FiaStandInHandler
+
+
+def serve_in_background(
+    pages_dir: str | Path,
+    port: int = 0,
+    fail_first: int = 0,
+    delay: float = 0.0,
+    delays: dict[int, float] | None = None,
+    slow_first: int = 0,
+) -> tuple[ThreadingHTTPServer, str]:
+    """
+    Startet den Server in einem Daemon-Thread.
+    Gibt (Server, URL-Vorlage für ingest_fia) zurück; server.shutdown() beendet ihn.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(Path(pages_dir), fail_first, delay, delays, slow_first))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, real_port = server.server_address[:2]
+    return server, f"http://{host}:{real_port}/Results?raceid={{race_id}}"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Lokaler Ersatz für FIA F2 Ergebnisseiten")
+    parser.add_argument("pages_dir", type=Path, help="Ordner mit <race_id>.html")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-first", type=int, default=0, help="Pro Rennen zuerst N-mal 503 senden")
+    parser.add_argument("--delay", type=float, default=0.0, help="Antworten um S Sekunden verzögern")
+    parser.add_argument("--slow-first", type=int, default=0, help="Nur die ersten N Antworten pro Rennen verzögern")
+    args = parser.parse_args(argv)
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", args.port),
+        make_handler(args.pages_dir, args.fail_first, args.delay, slow_first=args.slow_first),
+    )
+    print(f"✅ FIA stand-in läuft: http://127.0.0.1:{args.port}/Results?raceid={{race_id}}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
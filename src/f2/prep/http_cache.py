@@ -0,0 +1,159 @@
+"""
+Plattencache für die FIA F2 Ergebnisseiten.
+
+Pro Host und race_id liegen zwei Dateien im Cache-Ordner:
+    <host>/<race_id>.html  rohes HTML, wie vom Server geliefert
+    <host>/<race_id>.json  Metadaten (URL, Zeitpunkt, Status, ETag, Last-Modified)
+
+<host> kommt aus der URL-Vorlage (z.B. www.fiaformula2.com oder
+127.0.0.1_8765 für den lokalen Ersatzserver). Seiten eines Test-Servers
+landen so nie im Cache der echten FIA-Seite und werden offline auch nicht
+als FIA-Daten ausgeliefert.
+
+Ist eine Seite im Cache, wird sie beim nächsten Abruf nur bedingt neu
+angefragt (If-None-Match / If-Modified-Since); bei 304 bleibt das HTML aus
+dem Cache. Im Offline-Modus wird gar nicht angefragt, nur gelesen. So
+kostet ein erneutes Parsen nach einem Parser-Fix lokale I/O statt eines
+kompletten Crawls.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+
+CACHE_DIR = Path("data/f2/raw/html_cache")
+
+
+class CacheMiss(LookupError):
+    """Seite ist nicht im Cache (nur im Offline-Modus ein Fehler)."""
+
+
+@dataclass
+class CacheEntry:
+    race_id: int
+    url: str
+    fetched_at: str
+    status_code: int
+    etag: str | None = None
+    last_modified: str | None = None
+    revalidated_at: str | None = None
+
+
+def cache_host(url: str) -> str:
+    """Ordnername für den Host einer URL(-Vorlage): 'host' bzw. 'host_port'."""
+    netloc = urlparse(url).netloc.lower()
+    if not netloc:
+        raise ValueError(f"URL ohne Host: {url}")
+    return netloc.replace(":", "_")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class HtmlCache:
+    """Cache für die Seiten eines Hosts (base_url) unter cache_dir/<host>/."""
+
+    def __init__(self, base_url: str, cache_dir: str | Path = CACHE_DIR):
+        self.host = cache_host(base_url)
+        self.cache_dir = Path(cache_dir) / self.host
+
+    def html_path(self, race_id: int) -> Path:
+        return self.cache_dir / f"{int(race_id)}.html"
+
+    def meta_path(self, race_id: int) -> Path:
+        return self.cache_dir / f"{int(race_id)}.json"
+
+    def get(self, race_id: int) -> tuple[str, CacheEntry] | None:
+        html_path, meta_path = self.html_path(race_id), self.meta_path(race_id)
+        if not html_path.exists() or not meta_path.exists():
+            return None
+        try:
+            entry = CacheEntry(**json.loads(meta_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+        if cache_host(entry.url) != self.host:
+            # von Hand kopierter Eintrag eines anderen Servers
+            return None
+        return html_path.read_text(encoding="utf-8"), entry
+
+    def put(self, race_id: int, html: str, entry: CacheEntry) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # erst HTML, dann Metadaten: ohne .json gilt der Eintrag als nicht vorhanden
+        _write_atomic(self.html_path(race_id), html)
+        self._put_meta(race_id, entry)
+
+    def _put_meta(self, race_id: int, entry: CacheEntry) -> None:
+        _write_atomic(self.meta_path(race_id), json.dumps(asdict(entry), indent=2))
+
+    def fetch(
+        self,
+        session: requests.Session,
+        race_id: int,
+        url: str,
+        timeout: float,
+        offline: bool = False,
+    ) -> str:
+        """
+        HTML für race_id, aus dem Cache oder vom Server.
+
+        offline=True: nur Cache, bei fehlendem Eintrag CacheMiss.
+        Sonst bedingter Request, falls ein Eintrag existiert.
+        """
+        cached = self.get(race_id)
+        if offline:
+            if cached is None:
+                raise CacheMiss(f"race_id={race_id} nicht im Cache {self.cache_dir} (offline)")
+            return cached[0]
+
+        headers = {}
+        if cached is not None:
+            _, entry = cached
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        resp = session.get(url, timeout=timeout, headers=headers)
+
+        if resp.status_code == 304:
+            if cached is None:
+                # raise_for_status() lässt 304 durch; der leere Body wäre sonst "gültiges" HTML
+                raise requests.HTTPError(
+                    f"304 Not Modified für race_id={race_id}, aber kein Eintrag in {self.cache_dir}",
+                    response=resp,
+                )
+            html, entry = cached
+            entry.revalidated_at = _now()
+            self._put_meta(race_id, entry)
+            return html
+
+        resp.raise_for_status()
+        self.put(
+            race_id,
+            resp.text,
+            CacheEntry(
+                race_id=int(race_id),
+                url=url,
+                fetched_at=_now(),
+                status_code=resp.status_code,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            ),
+        )
+        return resp.text
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # Mehrere Scraper-Threads schreiben parallel -> erst temporär, dann umbenennen
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
@@ -1,18 +1,87 @@
+import argparse
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from io import StringIO
 from pathlib import Path
 from typing import List
 
+import lxml.html
 import pandas as pd
 import requests
 
+from src.f2.prep.http_cache import CACHE_DIR, HtmlCache
+
 
 BASE_URL = "https://www.fiaformula2.com/Results?raceid={race_id}"
 MANUAL_META_PATH = Path("data/f2/raw/f2_dataset_manuell.xlsx")
 OUTPUT_PATH = Path("data/f2/raw/f2_results_fia.csv")
+REPORT_PATH = Path("data/f2/raw/f2_ingest_report.csv")
+
+# Falls du weniger aggressiv scrapen willst, hier senken:
+# globales Budget an Requests pro Sekunde (über alle Threads) ...
+REQUESTS_PER_SECOND = 1.0
+# ... und maximal gleichzeitig offene Requests
+MAX_CONCURRENT_REQUESTS = 4
+
+# Wiederholungen bei 5xx / 429 / Timeouts, Wartezeit verdoppelt sich jedes Mal
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+class TokenBucket:
+    """
+    Thread-sicherer Token-Bucket: im Mittel höchstens `rate` Requests pro
+    Sekunde, kurzzeitig bis zu `capacity` am Stück.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate muss > 0 sein")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blockiert, bis ein Token verfügbar ist."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class RaceOutcome:
+    """Ergebnis des Scrapings für ein Rennen (eine Zeile im Report)."""
+
+    season: int
+    round: int
+    race_id: int
+    status: str
+    attempts: int
+    rows: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+def ist_klassifikations_header(header_str: str) -> bool:
+    """
+    Sehr einfache, robuste Bedingung: wir erwarten Spalten zu
+    Position, Runden und Zeit.
+    """
+    h_up = header_str.upper()
+    return "POS" in h_up and "LAPS" in h_up and "TIME" in h_up
 
-# Falls du weniger aggressiv scrapen willst, hier erhöhen
-REQUEST_SLEEP_SECONDS = 1.0
 
 def finde_klassifikationstabelle(tables: list[pd.DataFrame], race_id: int) -> pd.DataFrame:
     """
@@ -31,11 +100,7 @@ def finde_klassifikationstabelle(tables: list[pd.DataFrame], race_id: int) -> pd
         header_str = " | ".join(str(c) for c in df.columns)
         header_strings.append(header_str)
 
-        h_up = header_str.upper()
-
-        # sehr einfache, robuste Bedingung
-        # wir erwarten Spalten zu Position, Runden und Zeit
-        if "POS" in h_up and "LAPS" in h_up and "TIME" in h_up:
+        if ist_klassifikations_header(header_str):
             candidates.append(df)
 
     if not candidates:
@@ -121,29 +186,143 @@ def load_manual_race_list(path: Path) -> pd.DataFrame:
     return df
 
 
-def fetch_race_html(session: requests.Session, race_id: int) -> str:
+def fetch_race_html(
+    session: requests.Session,
+    race_id: int,
+    base_url: str = BASE_URL,
+    timeout: float = REQUEST_TIMEOUT_SECONDS,
+    cache: HtmlCache | None = None,
+    offline: bool = False,
+) -> str:
     """
     Lädt die HTML Seite für ein gegebenes race_id von der FIA F2 Seite.
+
+    Mit cache wird die Seite auf der Platte abgelegt und beim nächsten Mal
+    nur bedingt neu angefragt (ETag / Last-Modified). offline=True liest
+    ausschliesslich aus dem Cache.
     """
-    url = BASE_URL.format(race_id=race_id)
-    resp = session.get(url, timeout=30)
+    url = base_url.format(race_id=race_id)
+    if cache is not None:
+        return cache.fetch(session, race_id, url, timeout=timeout, offline=offline)
+    if offline:
+        raise ValueError("Offline-Modus braucht einen Cache")
+    resp = session.get(url, timeout=timeout)
     resp.raise_for_status()
     return resp.text
 
-def extract_classification_tables_from_html(html: str, race_id: int) -> list[pd.DataFrame]:
+
+def is_retryable(exc: Exception) -> bool:
+    """5xx, 429, Timeouts und Verbindungsabbrüche lohnen einen neuen Versuch, 4xx nicht."""
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        code = exc.response.status_code
+        return code >= 500 or code == 429
+    return False
+
+
+def fetch_race_html_with_retries(
+    session: requests.Session,
+    race_id: int,
+    limiter: TokenBucket,
+    base_url: str = BASE_URL,
+    max_retries: int = MAX_RETRIES,
+    backoff_seconds: float = BACKOFF_SECONDS,
+    cache: HtmlCache | None = None,
+    timeout: float = REQUEST_TIMEOUT_SECONDS,
+) -> tuple[str, int]:
+    """
+    fetch_race_html mit Rate-Limit und exponentiellem Backoff.
+    Gibt (html, Anzahl Versuche) zurück.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        limiter.acquire()
+        try:
+            return fetch_race_html(session, race_id, base_url=base_url, timeout=timeout, cache=cache), attempt
+        except requests.RequestException as exc:
+            if attempt > max_retries or not is_retryable(exc):
+                exc.attempts = attempt
+                raise
+            delay = backoff_seconds * 2 ** (attempt - 1)
+            time.sleep(delay + random.uniform(0, delay / 2))
+
+SESSION_KEYWORDS = {
+    "sprint": "Sprint Race",
+    "feature": "Feature Race",
+}
+
+
+def _table_header_text(table) -> str:
+    """Text der Kopfzeile (thead bzw. erste Zeile), ohne die Tabelle zu parsen."""
+    rows = table.xpath("./thead/tr") or table.xpath("./tr|./tbody/tr")
+    if not rows:
+        return ""
+    return " | ".join(cell.text_content().strip() for cell in rows[0].xpath("./th|./td"))
+
+
+def _session_label_from_context(table, max_depth: int = 4, max_siblings: int = 3) -> str | None:
+    """
+    Sucht vor der Tabelle (Caption, vorangehende Geschwister, auch die der
+    umgebenden Container) nach "Sprint" bzw. "Feature". Stösst die Suche
+    auf eine andere Tabelle, gehört der Text schon zur vorigen Session.
+    """
+    texts = [c.text_content() for c in table.xpath("./caption")]
+    node = table
+    for _ in range(max_depth):
+        if node is None:
+            break
+        for i, sib in enumerate(node.itersiblings(preceding=True)):
+            if i >= max_siblings or sib.tag == "table" or sib.xpath(".//table"):
+                break
+            texts.append(sib.text_content())
+        node = node.getparent()
+
+    for text in texts:
+        lower = text.lower()
+        for keyword, label in SESSION_KEYWORDS.items():
+            if keyword in lower:
+                return label
+    return None
+
+
+def extract_classification_tables(html: str, race_id: int) -> list[tuple[str | None, pd.DataFrame]]:
     """
-    Liest alle Tabellen aus dem HTML und delegiert die Auswahl
-    der Klassifikationstabelle an 'finde_klassifikationstabelle'.
+    Prüft zuerst nur die Kopfzeilen aller Tabellen und wandelt allein die
+    Klassifikationstabellen in DataFrames um (die übrigen Tabellen der Seite
+    werden nie geparst). Gibt (Session-Label oder None, Tabelle) in
+    Reihenfolge der Seite zurück; doppelte Tabellen (z.B. Mobile-Ansicht)
+    werden nur einmal übernommen.
+
+    Findet der Header-Check nichts, wird wie bisher die ganze Seite gelesen.
     """
+    doc = lxml.html.fromstring(html)
+
+    found: list[tuple[str | None, pd.DataFrame]] = []
+    for table in doc.iter("table"):
+        if not ist_klassifikations_header(_table_header_text(table)):
+            continue
+        table_html = lxml.html.tostring(table, encoding="unicode")
+        df = pd.read_html(StringIO(table_html))[0]
+        if any(df.equals(other) for _, other in found):
+            continue
+        found.append((_session_label_from_context(table), df))
+
+    if not found:
+        # Fallback: ganze Seite, liefert die bekannte Diagnose mit allen Headern
+        found = [(None, finde_klassifikationstabelle(pd.read_html(StringIO(html)), race_id))]
+
+    return found
 
-    # Tabellen extrahieren (robust dank StringIO)
-    tables = pd.read_html(StringIO(html))
 
-    # Nur die eine Klassifikationstabelle auswählen
-    klass_df = finde_klassifikationstabelle(tables, race_id)
+def extract_classification_tables_from_html(html: str, race_id: int) -> list[pd.DataFrame]:
+    """
+    Nur die Klassifikationstabellen der Seite (siehe
+    extract_classification_tables), ohne Session-Labels.
+    """
+    return [df for _, df in extract_classification_tables(html, race_id)]
 
-    # In Liste zurückgeben, weil parse_fia_race mehrere Sessions erwartet
-    return [klass_df]
 
 def normalize_result_table(
     df: pd.DataFrame,
@@ -241,6 +420,7 @@ def parse_fia_race(
     season: int,
     round_number: int,
     race_id: int,
+    html: str | None = None,
 ) -> pd.DataFrame:
     """
     Lädt die FIA Ergebnisseite für ein Rennen und gibt ein DataFrame
@@ -251,21 +431,28 @@ def parse_fia_race(
         - Feature Race Results
 
     Wenn der Lauf nicht gefunden oder anders strukturiert ist,
-    wird eine Exception geworfen.
+    wird eine Exception geworfen. Ist html schon geladen, wird nicht
+    erneut angefragt.
     """
-    html = fetch_race_html(session, race_id)
-    tables = extract_classification_tables_from_html(html, race_id)
+    if html is None:
+        html = fetch_race_html(session, race_id)
+    labeled = extract_classification_tables(html, race_id)
+    tables = [df for _, df in labeled]
 
-    # Wir gehen davon aus, dass in der Reihenfolge zuerst Sprint, dann Feature kommt.
-    # Das ist eine Annahme, die man später verfeinern kann.
-    session_labels = []
+    # Ohne Überschrift auf der Seite gehen wir davon aus, dass in der
+    # Reihenfolge zuerst Sprint, dann Feature kommt.
     if len(tables) == 1:
-        session_labels = ["Race"]
+        fallback_labels = ["Race"]
     elif len(tables) == 2:
-        session_labels = ["Sprint Race", "Feature Race"]
+        fallback_labels = ["Sprint Race", "Feature Race"]
     else:
         # Mehr als zwei Klassifikationstabellen. Wir labeln generisch.
-        session_labels = [f"Race {i + 1}" for i in range(len(tables))]
+        fallback_labels = [f"Race {i + 1}" for i in range(len(tables))]
+
+    session_labels = [
+        label if label is not None else fallback
+        for (label, _), fallback in zip(labeled, fallback_labels)
+    ]
 
     result_frames: List[pd.DataFrame] = []
     for tbl, label in zip(tables, session_labels):
@@ -282,67 +469,177 @@ def parse_fia_race(
     return combined
 
 
-def ingest_all_races() -> None:
+def ingest_all_races(
+    meta_path: Path = MANUAL_META_PATH,
+    output_path: Path = OUTPUT_PATH,
+    report_path: Path = REPORT_PATH,
+    **scrape_kwargs,
+) -> None:
     """
     Top Level Routine:
         - Metadatei laden
-        - Alle Rennen iterieren
+        - Alle Rennen (parallel, rate-limitiert) laden
         - Ergebnisse in eine kombinierte CSV Datei schreiben
+        - Report pro Rennen daneben ablegen
     """
-    meta = load_manual_race_list(MANUAL_META_PATH)
+    meta = load_manual_race_list(meta_path)
 
-    session = get_http_session()
+    combined, report = scrape_races(meta, **scrape_kwargs)
 
-    all_results: List[pd.DataFrame] = []
-    success_count = 0
-    fail_count = 0
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(report_path, index=False, encoding="utf-8")
+    print(f"Report gespeichert unter: {report_path}")
 
-    for _, row in meta.iterrows():
-        season = int(row["season"])
-        round_number = int(row["round"])
-        race_id = int(row["race_id"])
+    if combined.empty:
+        raise RuntimeError("Keine Rennen erfolgreich geladen")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    combined.to_csv(output_path, index=False, encoding="utf-8")
+    print(f"Gespeichert unter: {output_path}")
+
+
+def scrape_all_races(meta: pd.DataFrame, **scrape_kwargs) -> pd.DataFrame:
+    """
+    Lädt alle Rennen der Metadatei und gibt die kombinierten Ergebnisse
+    als DataFrame zurück (ohne zu speichern). Parameter wie scrape_races.
+    """
+    combined, _ = scrape_races(meta, **scrape_kwargs)
+    if combined.empty:
+        raise RuntimeError("Keine Rennen erfolgreich geladen")
+    return combined
 
-        url = BASE_URL.format(race_id=race_id)
-        print(
-            f"⏳ Hole {season} round {round_number} "
-            f"race_id={race_id} ({url})"
-        )
 
+def scrape_races(
+    meta: pd.DataFrame,
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    max_retries: int = MAX_RETRIES,
+    backoff_seconds: float = BACKOFF_SECONDS,
+    base_url: str = BASE_URL,
+    cache_dir: Path | None = CACHE_DIR,
+    offline: bool = False,
+    timeout: float = REQUEST_TIMEOUT_SECONDS,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Lädt die Rennen der Metadatei mit einem Thread-Pool.
+
+    max_workers begrenzt die gleichzeitig offenen Requests,
+    requests_per_second ist ein globales Budget über alle Threads,
+    timeout gilt pro Request (Sekunden).
+    cache_dir: HTML-Cache (None = ohne Cache), getrennt nach Host von
+    base_url. offline=True liest nur aus dem Cache und stellt keine Requests.
+    Gibt (kombinierte Ergebnisse in Reihenfolge der Metadatei,
+    Report mit einer Zeile pro Rennen) zurück.
+    """
+    if offline and cache_dir is None:
+        raise ValueError("Offline-Modus braucht einen Cache")
+    cache = HtmlCache(base_url, cache_dir) if cache_dir is not None else None
+    limiter = TokenBucket(requests_per_second)
+    local = threading.local()
+
+    def thread_session() -> requests.Session:
+        # requests.Session ist nicht garantiert thread-sicher -> eine pro Thread
+        if not hasattr(local, "session"):
+            local.session = get_http_session()
+        return local.session
+
+    def scrape_one(season: int, round_number: int, race_id: int):
+        t0 = time.perf_counter()
+        url = base_url.format(race_id=race_id)
+        print(f"⏳ Hole {season} round {round_number} race_id={race_id} ({url})")
+        attempts = 0
         try:
+            if offline:
+                html = fetch_race_html(None, race_id, base_url=base_url, cache=cache, offline=True)
+            else:
+                html, attempts = fetch_race_html_with_retries(
+                    thread_session(),
+                    race_id,
+                    limiter,
+                    base_url=base_url,
+                    max_retries=max_retries,
+                    backoff_seconds=backoff_seconds,
+                    cache=cache,
+                    timeout=timeout,
+                )
             df_race = parse_fia_race(
-                session=session,
+                session=thread_session(),
                 season=season,
                 round_number=round_number,
                 race_id=race_id,
-            )
-            all_results.append(df_race)
-            success_count += 1
-            print(
-                f"✅ Erfolgreich: season={season}, round={round_number}, "
-                f"race_id={race_id} mit {len(df_race)} Zeilen"
+                html=html,
             )
         except Exception as exc:
-            fail_count += 1
+            attempts = getattr(exc, "attempts", attempts)
             print(
                 f"❌ Fehler bei season={season}, round={round_number}, "
                 f"race_id={race_id}: {exc}"
             )
+            outcome = RaceOutcome(
+                season, round_number, race_id, "failed", attempts,
+                seconds=time.perf_counter() - t0, error=str(exc),
+            )
+            return None, outcome
 
-        time.sleep(REQUEST_SLEEP_SECONDS)
+        print(
+            f"✅ Erfolgreich: season={season}, round={round_number}, "
+            f"race_id={race_id} mit {len(df_race)} Zeilen"
+        )
+        outcome = RaceOutcome(
+            season, round_number, race_id, "ok", attempts,
+            rows=len(df_race), seconds=time.perf_counter() - t0,
+        )
+        return df_race, outcome
 
-    if not all_results:
-        raise RuntimeError("Keine Rennen erfolgreich geladen")
+    jobs = [
+        (int(row["season"]), int(row["round"]), int(row["race_id"]))
+        for _, row in meta.iterrows()
+    ]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        # map hält die Reihenfolge der Metadatei, egal wann ein Rennen fertig wird
+        results = list(pool.map(lambda job: scrape_one(*job), jobs))
 
-    combined = pd.concat(all_results, ignore_index=True)
+    all_results: List[pd.DataFrame] = [df for df, _ in results if df is not None]
+    report = pd.DataFrame([asdict(outcome) for _, outcome in results])
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_csv(OUTPUT_PATH, index=False, encoding="utf-8")
+    combined = pd.concat(all_results, ignore_index=True) if all_results else pd.DataFrame()
 
+    success_count = int((report["status"] == "ok").sum()) if not report.empty else 0
     print()
     print(f"Fertig. Erfolgreich geladene Rennen: {success_count}")
-    print(f"Fehlgeschlagene Rennen: {fail_count}")
-    print(f"Gespeichert unter: {OUTPUT_PATH}")
+    print(f"Fehlgeschlagene Rennen: {len(report) - success_count}")
+    if success_count < len(report):
+        print(report[report["status"] != "ok"].to_string(index=False))
+
+    return combined, report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="FIA F2 Ergebnisse scrapen")
+    parser.add_argument("--meta", type=Path, default=MANUAL_META_PATH)
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--report", type=Path, default=REPORT_PATH)
+    parser.add_argument("--workers", type=int, default=MAX_CONCURRENT_REQUESTS)
+    parser.add_argument("--rps", type=float, default=REQUESTS_PER_SECOND, help="Requests pro Sekunde (global)")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES)
+    parser.add_argument("--base-url", default=BASE_URL, help="URL-Vorlage mit {race_id}")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Ohne HTML-Cache laden")
+    parser.add_argument("--offline", action="store_true", help="Nur aus dem HTML-Cache lesen")
+    args = parser.parse_args(argv)
+
+    ingest_all_races(
+        meta_path=args.meta,
+        output_path=args.output,
+        report_path=args.report,
+        max_workers=args.workers,
+        requests_per_second=args.rps,
+        max_retries=args.retries,
+        base_url=args.base_url,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        offline=args.offline,
+    )
 
 
 if __name__ == "__main__":
-    ingest_all_races()
+    main()
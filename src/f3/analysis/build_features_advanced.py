@@ -2,6 +2,8 @@
 from pathlib import Path
 import pandas as pd
 import numpy as np
+from src.common.io import read_table
+from src.common.season_agg import aggregate_groups, load_feature_spec
 
 
 INTERIM_DIR = Path("data/f3/interim")
@@ -32,8 +34,17 @@ def build_f3_season_features_advanced(
             f"Advanced F3 race features file not found: {input_path}"
         )
 
-    df = pd.read_csv(input_path, low_memory=False)
+    agg = build_f3_advanced_frame(read_table(input_path))
 
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    agg.to_csv(output_path, index=False)
+    print(f"F3 advanced season features written to: {output_path}")
+
+    return output_path
+
+
+def build_f3_advanced_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Erweiterte Season-Aggregation ohne Datei-I/O."""
     # numerische Typen
     num_cols = [
         "season",
@@ -63,54 +74,8 @@ def build_f3_season_features_advanced(
         if col in df.columns:
             df[col] = df[col].astype(str).str.strip()
 
-    # Fahrer Saison Aggregation
-    group_cols = ["season", "driver_name", "driver_code", "team_name"]
-    group = df.groupby(group_cols)
-
-    agg = group.agg(
-        n_races=("race_id", "nunique"),
-
-        # Finishing Performance
-        avg_finish=("position_clean", "mean"),
-        best_finish=("position_clean", "min"),
-        worst_finish=("position_clean", "max"),
-        finish_std=("position_clean", "std"),
-        wins=("position_clean", lambda s: (s == 1).sum()),
-        podiums=("position_clean", lambda s: (s <= 3).sum()),
-        top10_finishes=("position_clean", lambda s: (s <= 10).sum()),
-
-        # Ausfälle
-        dnf_count=("is_dnf", "sum"),
-        dnf_rate=("is_dnf", "mean"),
-        dns_count=("is_dns", "sum"),
-        dns_rate=("is_dns", "mean"),
-        dsq_count=("is_dsq", "sum"),
-        dsq_rate=("is_dsq", "mean"),
-
-        # Runden und Speed
-        total_laps=("laps", "sum"),
-        avg_kph=("kph", "mean"),
-        avg_lap_time_s=("avg_lap_time_s", "mean"),
-        avg_time_from_winner_s=("time_from_winner_s", "mean"),
-        avg_best_lap_from_best_s=("best_lap_from_best_s", "mean"),
-
-        # Pace relativ zu Team und Feld
-        driver_speed_mean=("driver_speed", "mean"),
-        team_speed_mean=("team_speed", "mean"),
-        team_avg_pos_season_mean=("team_avg_pos_season", "mean"),
-
-        driver_vs_team_mean=("driver_vs_team", "mean"),
-        driver_vs_team_best=("driver_vs_team", "min"),
-        driver_vs_team_std=("driver_vs_team", "std"),
-
-        lap_vs_race_avg_mean=("lap_vs_race_avg", "mean"),
-        lap_vs_race_avg_std=("lap_vs_race_avg", "std"),
-    ).reset_index()
-
-    # Raten
-    agg["win_rate"] = agg["wins"] / agg["n_races"]
-    agg["podium_rate"] = agg["podiums"] / agg["n_races"]
-    agg["top10_rate"] = agg["top10_finishes"] / agg["n_races"]
+    # Fahrer Saison Aggregation inkl. Raten (Spec 'f3_advanced')
+    agg = aggregate_groups(df, load_feature_spec("f3_advanced"))
 
     # Serienlabel
     agg["series"] = "F3"
@@ -161,11 +126,7 @@ def build_f3_season_features_advanced(
     # sortieren für Lesbarkeit
     agg = agg.sort_values(["season", "driver_name"]).reset_index(drop=True)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    agg.to_csv(output_path, index=False)
-    print(f"F3 advanced season features written to: {output_path}")
-
-    return output_path
+    return agg
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 from src.common.features import require_columns
+from src.common.io import read_table
+from src.common.season_agg import aggregate_groups, load_feature_spec
+from src.common.timeparse import parse_gap_column, parse_laps_down_column, parse_time_column
 from src.schema.core_features import CORE_FEATURES
 
 INTERIM_DIR = Path("data/f3/interim")
@@ -15,13 +18,13 @@ def load_f3_races_clean(path: str | Path = INTERIM_DIR / "f3_races_clean.csv") -
       - season, race_id
       - driver_name, driver_code, team_name
       - laps, kph
-      - time_s, best_lap_s, gap_s
+      - time_s, best_lap_s, gap_s (oder die Rohspalten time, best, gap)
       - status
     """
     path = Path(path)
     if not path.exists():
         raise FileNotFoundError(f"Clean F3 races file not found: {path}")
-    return pd.read_csv(path, low_memory=False)
+    return read_table(path)
 
 
 def build_f3_season_features(
@@ -37,9 +40,39 @@ def build_f3_season_features(
 
     input_path = Path(input_path)
     output_path = Path(output_path)
+
+    agg = build_f3_season_frame(load_f3_races_clean(input_path))
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    agg.to_csv(output_path, index=False)
+    print(f"✅ F3 season features written to: {output_path}")
+
+    return output_path
+
+
+def add_f3_time_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Leitet time_s, best_lap_s, gap_s und gap_laps aus den Rohspalten
+    time, best und gap ab, soweit die Vorstufe sie nicht schon liefert.
+    """
+    parsers = [
+        ("time_s", "time", parse_time_column),
+        ("best_lap_s", "best", parse_time_column),
+        ("gap_s", "gap", parse_gap_column),
+        ("gap_laps", "gap", parse_laps_down_column),
+    ]
+    for target, source, parse in parsers:
+        if target not in df.columns and source in df.columns:
+            df[target] = parse(df[source])
+    return df
+
 
-    df = load_f3_races_clean(input_path)
+def build_f3_season_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Season-Aggregation von build_f3_season_features ohne Datei-I/O."""
+    df = add_f3_time_columns(df)
+    if "gap_laps" not in df.columns:
+        # nur gap_s geliefert: Rückstand in Runden unbekannt
+        df["gap_laps"] = np.nan
 
     required_cols = {
         "season",
@@ -76,30 +109,9 @@ def build_f3_season_features(
     df = df.sort_values(["season", "race_id", "time_s", "gap_s"])
     df["finishing_position"] = df.groupby(["season", "race_id"]).cumcount() + 1
 
-    # --- Fahrer-Saison-Aggregation ---
-
-    group_cols = ["season", "driver_name", "driver_code", "team_name"]
-    group = df.groupby(group_cols)
-
-    agg = group.agg(
-        n_races=("race_id", "nunique"),
-        avg_finish=("finishing_position", "mean"),
-        best_finish=("finishing_position", "min"),
-        worst_finish=("finishing_position", "max"),
-        wins=("finishing_position", lambda s: (s == 1).sum()),
-        podiums=("finishing_position", lambda s: (s <= 3).sum()),
-        top10_finishes=("finishing_position", lambda s: (s <= 10).sum()),
-        total_laps=("laps", "sum"),
-        avg_kph=("kph", "mean"),
-        avg_best_lap_s=("best_lap_s", "mean"),
-        finish_std=("finishing_position", "std"),
-    ).reset_index()
-
-    # --- Raten berechnen ---
+    # --- Fahrer-Saison-Aggregation (inkl. Raten, Spec 'f3') ---
 
-    agg["win_rate"] = agg["wins"] / agg["n_races"]
-    agg["podium_rate"] = agg["podiums"] / agg["n_races"]
-    agg["top10_rate"] = agg["top10_finishes"] / agg["n_races"]
+    agg = aggregate_groups(df, load_feature_spec("f3"))
 
     # Punkte & DNF analog F2 erstmal als Platzhalter
     agg["total_points"] = np.nan
@@ -142,6 +154,7 @@ def build_f3_season_features(
         "points_std",
         "dnf_count",
         "dnf_rate",
+        "avg_laps_down",
     ]
 
     col_order = [c for c in col_order if c in agg.columns]
@@ -154,11 +167,7 @@ def build_f3_season_features(
     if "season" in agg.columns and "year" not in agg.columns:
         agg = agg.rename(columns={"season": "year"})
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    agg.to_csv(output_path, index=False)
-    print(f"✅ F3 season features written to: {output_path}")
-
-    return output_path
+    return agg
 
 
 if __name__ == "__main__":
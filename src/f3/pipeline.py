@@ -0,0 +1,73 @@
+"""F3-Pipeline: bereinigte Race-Daten -> Season-Features (Basic + Advanced)."""
+import pandas as pd
+
+from src.common.io import read_table
+from src.common.season_agg import FEATURE_SPEC_PATH
+from src.f3.analysis.build_features_advanced import build_f3_advanced_frame
+from src.f3.build.build_features import (
+    INTERIM_DIR,
+    PROCESSED_DIR,
+    build_f3_season_frame,
+    load_f3_races_clean,
+)
+from src.pipeline.registry import SeriesPlugin
+from src.pipeline.runner import Artifact, Pipeline, Stage
+
+RACES_CLEAN_PATH = INTERIM_DIR / "f3_races_clean.csv"
+RACE_FEATURES_PATH = PROCESSED_DIR / "f3_2019_2025_races_features.csv"
+
+
+F3_PIPELINE = Pipeline(
+    name="f3",
+    stages=[
+        Stage(
+            "load",
+            load_f3_races_clean,
+            outputs=("f3_races_clean",),
+            params={"path": RACES_CLEAN_PATH},
+            sources=(RACES_CLEAN_PATH,),
+        ),
+        Stage(
+            "build",
+            build_f3_season_frame,
+            inputs=("f3_races_clean",),
+            outputs=("f3_features",),
+            sources=(FEATURE_SPEC_PATH,),
+        ),
+        Stage(
+            "load_race_features",
+            read_table,
+            outputs=("f3_race_features",),
+            params={"path": RACE_FEATURES_PATH},
+            sources=(RACE_FEATURES_PATH,),
+        ),
+        Stage(
+            "build_advanced",
+            build_f3_advanced_frame,
+            inputs=("f3_race_features",),
+            outputs=("f3_features_advanced",),
+            sources=(FEATURE_SPEC_PATH,),
+        ),
+    ],
+    artifacts={
+        "f3_features": Artifact(PROCESSED_DIR / "f3_features.csv", final=True),
+        "f3_features_advanced": Artifact(PROCESSED_DIR / "f3_features_advanced.csv", final=True),
+    },
+)
+
+
+def prepare_master_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """F3-Features benutzen 'season' als Jahres-Spalte."""
+    if "season" in df.columns and "year" not in df.columns:
+        df = df.rename(columns={"season": "year"})
+    return df
+
+
+SERIES = SeriesPlugin(
+    name="F3",
+    pipeline=F3_PIPELINE,
+    features="f3_features",
+    core="f3_features",
+    level=3,
+    prepare=prepare_master_columns,
+)
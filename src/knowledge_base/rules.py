@@ -0,0 +1,353 @@
+"""
+Regel-Compiler für die Knowledge Base.
+
+Die Regeln (welches Feature aus welchen Fahrer-/Team-/Fahrzeugwerten)
+stehen deklarativ in racing_rules.yaml, die Schwellen in
+racing_criteria.json. Beim Laden wird jeder Ausdruck einmal geparst
+(Python-Syntax über ast, nur eine kleine Whitelist an Knoten) und in eine
+Kette von NumPy-Operationen übersetzt; kb.<pfad>-Verweise werden dabei
+gleich durch die Werte aus racing_criteria.json ersetzt. Ausgewertet wird
+danach spaltenweise über einen ganzen DataFrame, ohne Dict-Zugriffe oder
+Python-Verzweigungen pro Fahrer.
+
+Kompilierte Regelsätze werden pro Inhalt (SHA-256 über Regel- und
+Kriterien-Datei) im Prozess gehalten; jede weitere Engine-Instanz liest
+nur noch die Bytes und hasht sie.
+
+Beispiel:
+    from src.knowledge_base.rules import load_rule_set
+    rules = load_rule_set()
+    features = rules.evaluate(df)                     # DataFrame, eine Zeile pro Fahrer
+    rules.evaluate_one({"age": 20}, groups=("biometrics",))
+"""
+from __future__ import annotations
+
+import ast
+import functools
+import hashlib
+import json
+import operator
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import yaml
+
+RULES_PATH = Path(__file__).with_name("racing_rules.yaml")
+CRITERIA_PATH = Path(__file__).with_name("racing_criteria.json")
+
+INPUT_TYPES = ("number", "text", "bool")
+RULE_TYPES = ("flag", "score")
+GROUPS = ("eligibility", "biometrics", "team", "vehicle")
+
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+_BINOP = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+# max ignoriert NaN wie Pythons max(0, nan) im früheren Einzelpfad
+_FUNCS = {"min": np.minimum, "max": np.fmax, "abs": np.abs}
+
+# kompilierte Regelsätze pro Inhalts-Hash
+_COMPILED: dict[str, "RuleSet"] = {}
+
+
+@dataclass(frozen=True)
+class InputDef:
+    name: str
+    type: str
+    default: Any = None
+
+
+@dataclass(frozen=True)
+class Rule:
+    feature: str
+    group: str
+    type: str
+    expr: str
+    evaluate: Callable[["_Inputs"], Any] = field(repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """Kompilierte Regeln plus die Kriterien, aus denen sie ihre Schwellen haben."""
+
+    rules: tuple[Rule, ...]
+    inputs: dict[str, InputDef]
+    criteria: dict
+    digest: str
+
+    @property
+    def features(self) -> list[str]:
+        return [r.feature for r in self.rules]
+
+    def evaluate(self, df: pd.DataFrame, groups: tuple[str, ...] | None = None) -> pd.DataFrame:
+        """Feature-Frame (gleicher Index wie df) für alle Regeln bzw. nur groups."""
+        inputs = _Inputs(df, self.inputs)
+        n = len(df)
+        out = {}
+        for rule in self.rules:
+            if groups is not None and rule.group not in groups:
+                continue
+            value = np.broadcast_to(np.asarray(rule.evaluate(inputs)), (n,))
+            if rule.type == "flag":
+                out[rule.feature] = value.astype(bool).astype(np.int64)
+            else:
+                out[rule.feature] = value.astype(float)
+        return pd.DataFrame(out, index=df.index)
+
+    def evaluate_one(self, data: dict, groups: tuple[str, ...] | None = None) -> dict:
+        """Ein Fahrer als Dict -> Features als Python-Zahlen (int für flags, float für scores)."""
+        row = self.evaluate(pd.DataFrame([data], index=[0]), groups).iloc[0]
+        types = {r.feature: r.type for r in self.rules}
+        return {k: int(v) if types[k] == "flag" else float(v) for k, v in row.items()}
+
+
+class _Inputs:
+    """Spalten des DataFrames, einmal pro (Spalte, Default) umgewandelt."""
+
+    def __init__(self, df: pd.DataFrame, defs: dict[str, InputDef]):
+        self.df = df
+        self.defs = defs
+        self._cache: dict[tuple[str, Any], np.ndarray] = {}
+
+    def get(self, name: str, default: Any) -> np.ndarray | pd.Series:
+        key = (name, default)
+        if key not in self._cache:
+            self._cache[key] = self._convert(name, default)
+        return self._cache[key]
+
+    def _convert(self, name: str, default: Any) -> np.ndarray | pd.Series:
+        """Zahlen und Flags als NumPy-Array, Text bleibt Series (schnelles isin/== auf str-Spalten)."""
+        kind = self.defs[name].type
+        n = len(self.df)
+        if name not in self.df.columns:
+            if kind == "number":
+                return np.full(n, np.nan if default is None else float(default))
+            if kind == "bool":
+                return np.full(n, bool(default))
+            return pd.Series(np.full(n, default, dtype=object), index=self.df.index)
+
+        values = self.df[name]
+        if kind == "number":
+            return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+        if kind == "bool":
+            return _truthy(values)
+        return values
+
+
+def _truthy(values: pd.Series) -> np.ndarray:
+    """bool(x) pro Wert wie im Einzelpfad (NaN zählt als wahr)."""
+    if values.dtype == bool:
+        return values.to_numpy()
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        x = values.to_numpy(dtype=float)
+        return (x != 0) | np.isnan(x)
+    return np.fromiter((bool(v) for v in values), dtype=bool, count=len(values))
+
+
+def _array(values) -> np.ndarray:
+    return values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+
+
+def _isin(values, options: tuple) -> np.ndarray:
+    if not isinstance(values, pd.Series):
+        values = pd.Series(np.atleast_1d(np.asarray(values, dtype=object)))
+    return values.isin(options).to_numpy()
+
+
+class _Compiler:
+    """Übersetzt den AST eines Regel-Ausdrucks in verschachtelte Closures."""
+
+    def __init__(self, feature: str, inputs: dict[str, InputDef], defaults: dict, criteria: dict):
+        self.feature = feature
+        self.inputs = inputs
+        self.defaults = defaults
+        self.criteria = criteria
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"Regel '{self.feature}': {message}")
+
+    def kb_path(self, node: ast.AST) -> list[str] | None:
+        """kb.a.b.c -> ['a', 'b', 'c']; None, wenn node kein kb-Verweis ist."""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if isinstance(node, ast.Name) and node.id == "kb" and parts:
+            return parts[::-1]
+        return None
+
+    def resolve_kb(self, parts: list[str]) -> Any:
+        value = self.criteria
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                raise self.error(f"kb.{'.'.join(parts)} gibt es in racing_criteria.json nicht")
+            value = value[part]
+        return value
+
+    def static(self, node: ast.AST) -> Any:
+        """Wert, der schon beim Kompilieren feststeht (Konstante, Liste, kb-Verweis)."""
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [self.static(e) for e in node.elts]
+        parts = self.kb_path(node)
+        if parts is not None:
+            return self.resolve_kb(parts)
+        raise self.error(f"rechts von 'in' steht eine Liste oder kb.<pfad>, nicht {ast.unparse(node)!r}")
+
+    def compile(self, node: ast.AST) -> Callable[[_Inputs], Any]:
+        if isinstance(node, ast.Constant):
+            value = node.value
+            return lambda inputs: value
+
+        if isinstance(node, ast.Attribute):
+            parts = self.kb_path(node)
+            if parts is None:
+                raise self.error(f"nur kb.<pfad> ist als Attribut erlaubt: {ast.unparse(node)!r}")
+            value = self.resolve_kb(parts)
+            if isinstance(value, (dict, list)):
+                raise self.error(f"kb.{'.'.join(parts)} ist keine Zahl/kein Text (Listen nur mit 'in')")
+            return lambda inputs: value
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name not in self.inputs:
+                raise self.error(f"unbekannte Eingabe '{name}' (nicht unter inputs)")
+            default = self.defaults.get(name, self.inputs[name].default)
+            return lambda inputs: inputs.get(name, default)
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self.compile(v) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            # paarweise, damit Konstanten/kb-Werte gegen Spalten broadcasten
+            return lambda inputs: functools.reduce(combine, (_array(p(inputs)).astype(bool) for p in parts))
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self.compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda inputs: np.logical_not(_array(operand(inputs)))
+            if isinstance(node.op, ast.USub):
+                return lambda inputs: np.negative(operand(inputs))
+            if isinstance(node.op, ast.UAdd):
+                return operand
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOP:
+            op = _BINOP[type(node.op)]
+            left, right = self.compile(node.left), self.compile(node.right)
+            return lambda inputs: op(left(inputs), right(inputs))
+
+        if isinstance(node, ast.Compare):
+            return self.compile_compare(node)
+
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = self.compile(node.test), self.compile(node.body), self.compile(node.orelse)
+            return lambda inputs: np.where(test(inputs), body(inputs), orelse(inputs))
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCS or node.keywords:
+                raise self.error(f"erlaubte Funktionen: {', '.join(_FUNCS)} (bekommen: {ast.unparse(node)!r})")
+            func = _FUNCS[node.func.id]
+            args = [self.compile(a) for a in node.args]
+            if len(args) != func.nin:
+                raise self.error(f"{node.func.id}() braucht {func.nin} Argument(e)")
+            return lambda inputs: func(*(a(inputs) for a in args))
+
+        raise self.error(f"nicht erlaubter Ausdruck: {ast.unparse(node)!r}")
+
+    def compile_compare(self, node: ast.Compare) -> Callable[[_Inputs], Any]:
+        """a <= x <= b wird zu (a <= x) & (x <= b); 'in' prüft gegen eine feste Liste."""
+        if any(isinstance(op, (ast.In, ast.NotIn)) for op in node.ops):
+            if len(node.ops) != 1:
+                raise self.error(f"'in' nicht mit weiteren Vergleichen verketten: {ast.unparse(node)!r}")
+            options = self.static(node.comparators[0])
+            if not isinstance(options, list):
+                raise self.error(f"rechts von 'in' muss eine Liste stehen: {ast.unparse(node.comparators[0])!r}")
+            options = tuple(options)
+            left = self.compile(node.left)
+            if isinstance(node.ops[0], ast.NotIn):
+                return lambda inputs: ~_isin(left(inputs), options)
+            return lambda inputs: _isin(left(inputs), options)
+
+        for op in node.ops:
+            if type(op) not in _COMPARE:
+                raise self.error(f"nicht erlaubter Vergleich: {ast.unparse(node)!r}")
+        ops = [_COMPARE[type(op)] for op in node.ops]
+        operands = [self.compile(node.left)] + [self.compile(c) for c in node.comparators]
+
+        def evaluate(inputs):
+            values = [o(inputs) for o in operands]
+            result = _array(ops[0](values[0], values[1]))
+            for i in range(1, len(ops)):
+                result = np.logical_and(result, _array(ops[i](values[i], values[i + 1])))
+            return result
+
+        return evaluate
+
+
+def compile_rules(raw: dict, criteria: dict, digest: str = "") -> RuleSet:
+    """Baut einen RuleSet aus dem YAML-Inhalt und prüft ihn."""
+    inputs = {}
+    for name, spec in (raw.get("inputs") or {}).items():
+        spec = spec or {}
+        if spec.get("type") not in INPUT_TYPES:
+            raise ValueError(f"Eingabe '{name}': type muss einer von {INPUT_TYPES} sein")
+        inputs[name] = InputDef(name, spec["type"], spec.get("default"))
+
+    rules = []
+    for feature, spec in (raw.get("rules") or {}).items():
+        spec = spec or {}
+        if "expr" not in spec:
+            raise ValueError(f"Regel '{feature}' braucht 'expr'")
+        if spec.get("type") not in RULE_TYPES:
+            raise ValueError(f"Regel '{feature}': type muss einer von {RULE_TYPES} sein")
+        if spec.get("group") not in GROUPS:
+            raise ValueError(f"Regel '{feature}': group muss einer von {GROUPS} sein")
+        defaults = spec.get("defaults") or {}
+        unknown = sorted(set(defaults) - set(inputs))
+        if unknown:
+            raise ValueError(f"Regel '{feature}': defaults für unbekannte Eingaben {unknown}")
+
+        expr = str(spec["expr"])
+        try:
+            tree = ast.parse(expr, mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Regel '{feature}': Syntaxfehler in expr ({exc.msg})") from exc
+        evaluate = _Compiler(feature, inputs, defaults, criteria).compile(tree.body)
+        rules.append(Rule(feature, spec["group"], spec["type"], expr, evaluate))
+
+    return RuleSet(rules=tuple(rules), inputs=inputs, criteria=criteria, digest=digest)
+
+
+def load_rule_set(
+    rules_path: str | Path = RULES_PATH,
+    criteria_path: str | Path = CRITERIA_PATH,
+) -> RuleSet:
+    """Regelsatz laden; kompiliert wird nur, wenn sich eine der Dateien inhaltlich geändert hat."""
+    rules_path, criteria_path = Path(rules_path), Path(criteria_path)
+    for path in (rules_path, criteria_path):
+        if not path.exists():
+            raise FileNotFoundError(f"Knowledge-Base-Datei nicht gefunden: {path}")
+
+    rules_bytes = rules_path.read_bytes()
+    criteria_bytes = criteria_path.read_bytes()
+    digest = hashlib.sha256(rules_bytes + b"\0" + criteria_bytes).hexdigest()
+
+    if digest not in _COMPILED:
+        raw = yaml.safe_load(rules_bytes) or {}
+        criteria = json.loads(criteria_bytes)
+        _COMPILED[digest] = compile_rules(raw, criteria, digest)
+    return _COMPILED[digest]
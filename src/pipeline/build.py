@@ -0,0 +1,123 @@
+"""
+Kompletter Build: alle Serien parallel, danach der Serien-Merge.
+
+Die Serien-Pipelines (F1, F2, F3, ... aus der Registry) hängen bis zum
+Merge nicht voneinander ab. Sie laufen deshalb gleichzeitig in einem
+Prozess-Pool (ein Prozess pro Serie); danach läuft die all_series-Pipeline
+(Master- und Core-Merge, Personen, Karriere-Features, Labels) im
+Hauptprozess. Die Wall-Time liegt damit nahe bei der langsamsten Serie
+plus Merge, sofern genug Kerne da sind.
+
+Am Ende steht eine Zeitübersicht pro Stufe. Unveränderte Stufen werden wie
+beim Runner über die Fingerprints übersprungen.
+
+Beispiel:
+    rookie-invest build
+    rookie-invest build --series F1 F3 --jobs 2
+    rookie-invest build --start-at f2:clean      # F2 ohne neu zu scrapen
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.common.manifest import refresh_manifest
+from src.pipeline.registry import get_series
+from src.pipeline.runner import run_pipeline
+
+
+def _build_series(
+    name: str,
+    write_interim: bool,
+    start_at: str | None,
+    force: bool,
+) -> tuple[str, dict[str, float], float]:
+    """Worker: eine Serien-Pipeline bauen; zurück gehen nur die Zeiten."""
+    pipeline = get_series((name,))[0].pipeline
+    timings: dict[str, float] = {}
+    t0 = time.perf_counter()
+    run_pipeline(pipeline, write_interim=write_interim, start_at=start_at, force=force, timings=timings)
+    return pipeline.name, timings, time.perf_counter() - t0
+
+
+def parse_start_at(values: list[str] | None) -> dict[str, str]:
+    """'f2:clean' -> {'f2': 'clean'} (Pipeline-Name : Stufe)."""
+    start_at = {}
+    for value in values or []:
+        pipeline, sep, stage = value.partition(":")
+        if not sep or not stage:
+            raise ValueError(f"--start-at erwartet <pipeline>:<stufe>, bekommen: {value}")
+        start_at[pipeline] = stage
+    return start_at
+
+
+def build_all(
+    series: list[str] | None = None,
+    jobs: int | None = None,
+    write_interim: bool = False,
+    start_at: dict[str, str] | None = None,
+    force: bool = False,
+    merge: bool = True,
+) -> dict[str, dict[str, float]]:
+    """
+    Serien parallel bauen, danach all_series. Gibt Sekunden pro
+    Pipeline und Stufe zurück (plus '__total__' je Pipeline).
+    """
+    from src.all_series.pipeline import ALL_SERIES_PIPELINE
+
+    plugins = get_series(tuple(series) if series else None)
+    start_at = start_at or {}
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(plugins)))
+
+    summary: dict[str, dict[str, float]] = {}
+    t_start = time.perf_counter()
+
+    args = [(p.name, write_interim, start_at.get(p.pipeline.name), force) for p in plugins]
+    if jobs == 1:
+        results = [_build_series(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_build_series, *a) for a in args]
+            results = [f.result() for f in futures]
+    for name, timings, total in results:
+        summary[name] = {**timings, "__total__": total}
+    t_series = time.perf_counter() - t_start
+
+    if merge:
+        timings = {}
+        t0 = time.perf_counter()
+        run_pipeline(
+            ALL_SERIES_PIPELINE,
+            write_interim=write_interim,
+            start_at=start_at.get(ALL_SERIES_PIPELINE.name),
+            force=force,
+            timings=timings,
+        )
+        summary[ALL_SERIES_PIPELINE.name] = {**timings, "__total__": time.perf_counter() - t0}
+
+    # Neue/geänderte Outputs gleich ins Dataset-Manifest übernehmen
+    refresh_manifest()
+
+    slowest = max((total for _, _, total in results), default=0.0)
+    print_summary(summary, series_wall=t_series, slowest=slowest, wall=time.perf_counter() - t_start, jobs=jobs)
+    return summary
+
+
+def print_summary(
+    summary: dict[str, dict[str, float]],
+    series_wall: float,
+    slowest: float,
+    wall: float,
+    jobs: int,
+) -> None:
+    print("\n=== Build-Zeiten ===")
+    for pipeline, timings in summary.items():
+        stages = {k: v for k, v in timings.items() if k != "__total__"}
+        print(f"{pipeline:<12} {timings['__total__']:8.2f}s")
+        if not stages:
+            print("  (alles unverändert)")
+        for stage, seconds in stages.items():
+            print(f"  {stage:<22} {seconds:8.2f}s")
+    print(f"Serien parallel ({jobs} Prozesse): {series_wall:.2f}s (langsamste Serie {slowest:.2f}s)")
+    print(f"Gesamt: {wall:.2f}s")
@@ -0,0 +1,105 @@
+"""
+Fingerprints für Pipeline-Stufen.
+
+Eine Stufe gilt als unverändert, wenn ihre Quelldateien, ihre Parameter,
+der Code ihres Moduls (inkl. der importierten src-Module) und die
+Fingerprints ihrer Inputs gleich geblieben sind. Der Fingerprint wird
+neben jedem geschriebenen Output als <output>.stage.json abgelegt.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+
+_CHUNK_SIZE = 1 << 20
+
+
+def hash_path(path: str | Path) -> str:
+    """SHA-256 über den Inhalt einer Datei bzw. aller Dateien eines Ordners."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Quelle für Fingerprint nicht gefunden: {path}")
+
+    h = hashlib.sha256()
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    for fp in files:
+        h.update(str(fp.relative_to(path) if path.is_dir() else fp.name).encode())
+        with open(fp, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def code_fingerprint(func: Callable) -> str:
+    """
+    Hash über den Quelltext des Moduls von func und aller Module aus
+    demselben Top-Level-Paket, die es (transitiv) importiert.
+    """
+    root = func.__module__.split(".")[0]
+    seen: set[str] = set()
+    stack = [func.__module__]
+    while stack:
+        name = stack.pop()
+        if name in seen or name not in sys.modules:
+            continue
+        seen.add(name)
+        for value in vars(sys.modules[name]).values():
+            dep = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+            if isinstance(dep, str) and dep.split(".")[0] == root and dep not in seen:
+                stack.append(dep)
+
+    h = hashlib.sha256()
+    for name in sorted(seen):
+        source = getattr(sys.modules[name], "__file__", None)
+        if source:
+            h.update(name.encode())
+            h.update(Path(source).read_bytes())
+    return h.hexdigest()
+
+
+def stage_fingerprint(
+    stage_name: str,
+    code: str,
+    params: Mapping,
+    sources: Iterable[str],
+    inputs: Iterable[str],
+) -> str:
+    payload = {
+        "stage": stage_name,
+        "code": code,
+        "params": params,
+        "sources": list(sources),
+        "inputs": list(inputs),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+def stamp_path(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".stage.json")
+
+
+def read_stamp(path: str | Path) -> str | None:
+    """Fingerprint, mit dem der Output zuletzt geschrieben wurde (oder None)."""
+    sp = stamp_path(path)
+    if not Path(path).exists() or not sp.exists():
+        return None
+    try:
+        return json.loads(sp.read_text(encoding="utf-8")).get("fingerprint")
+    except (OSError, ValueError):
+        return None
+
+
+def write_stamp(path: str | Path, stage_name: str, fingerprint: str) -> None:
+    stamp = {
+        "stage": stage_name,
+        "fingerprint": fingerprint,
+        "written_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    stamp_path(path).write_text(json.dumps(stamp, indent=2), encoding="utf-8")
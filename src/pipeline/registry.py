@@ -0,0 +1,118 @@
+"""
+Serien-Registry.
+
+Jede Serie bringt ihre Pipeline (Laden, Cleaning, Feature-Build als Stufen)
+mit und meldet sich in ihrem Paket über ein Modul-Attribut an:
+
+    # src/<serie>/pipeline.py
+    SERIES = SeriesPlugin(name="GB3", pipeline=GB3_PIPELINE,
+                          features="gb3_features", level=2)
+
+discover_series() importiert src/*/pipeline.py und sammelt alle SERIES.
+Der Serien-Merge (src/all_series) und der Runner arbeiten nur noch auf der
+Registry; eine neue Serie braucht keine Pfadliste mehr, die man von Hand
+nachführt.
+
+level ordnet die Nachwuchsleiter (höher = näher an der F1):
+    F4 = 1, Regional (FRECA, GB3) = 2, F3 = 3, F2 = 4, F1 = 5
+
+Beispiel:
+    from src.pipeline.registry import discover_series
+    for plugin in discover_series():
+        print(plugin.name, plugin.features_path)
+"""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import pkgutil
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from src.pipeline.runner import Pipeline
+
+PACKAGE = "src"
+PLUGIN_MODULE = "pipeline"
+
+
+def _unchanged(df: pd.DataFrame) -> pd.DataFrame:
+    return df
+
+
+@dataclass(frozen=True)
+class SeriesPlugin:
+    """
+    Anmeldung einer Serie.
+
+    features / core sind Artefakt-Namen der Pipeline: Season-Features für
+    die Master-Tabelle bzw. für das Core-Set (None = nicht im Core-Set).
+    prepare bringt die Season-Features auf die gemeinsamen Spaltennamen
+    (year, team_name, ...), bevor sie gemergt werden.
+    """
+
+    name: str
+    pipeline: Pipeline
+    features: str
+    level: int
+    core: str | None = None
+    prepare: Callable[[pd.DataFrame], pd.DataFrame] = _unchanged
+
+    @property
+    def features_path(self) -> Path:
+        return Path(self.pipeline.artifacts[self.features].path)
+
+    @property
+    def core_path(self) -> Path | None:
+        if self.core is None:
+            return None
+        return Path(self.pipeline.artifacts[self.core].path)
+
+
+_REGISTRY: dict[str, SeriesPlugin] = {}
+_discovered = False
+
+
+def register_series(plugin: SeriesPlugin) -> SeriesPlugin:
+    """Serie von Hand registrieren (z.B. aus einem Notebook)."""
+    existing = _REGISTRY.get(plugin.name)
+    if existing is not None and existing is not plugin:
+        raise ValueError(f"Series already registered: {plugin.name}")
+    _REGISTRY[plugin.name] = plugin
+    return plugin
+
+
+def discover_series() -> list[SeriesPlugin]:
+    """Alle Serien (sortiert nach Name); src/*/pipeline.py wird einmal importiert."""
+    global _discovered
+    if not _discovered:
+        package = importlib.import_module(PACKAGE)
+        for info in pkgutil.iter_modules(package.__path__):
+            if not info.ispkg:
+                continue
+            module_name = f"{PACKAGE}.{info.name}.{PLUGIN_MODULE}"
+            if importlib.util.find_spec(module_name) is None:
+                continue
+            plugin = getattr(importlib.import_module(module_name), "SERIES", None)
+            if isinstance(plugin, SeriesPlugin):
+                register_series(plugin)
+        _discovered = True
+    return [_REGISTRY[name] for name in sorted(_REGISTRY)]
+
+
+def get_series(names: list[str] | tuple[str, ...] | None = None) -> list[SeriesPlugin]:
+    """Registrierte Serien, optional eingeschränkt auf names (in Registry-Reihenfolge)."""
+    plugins = discover_series()
+    if names is None:
+        return plugins
+    unknown = set(names) - {p.name for p in plugins}
+    if unknown:
+        raise ValueError(f"Unknown series: {sorted(unknown)} (registered: {[p.name for p in plugins]})")
+    return [p for p in plugins if p.name in names]
+
+
+def series_levels() -> dict[str, int]:
+    """Serie -> Stufe auf der Nachwuchsleiter."""
+    return {p.name: p.level for p in discover_series()}
@@ -0,0 +1,248 @@
+"""
+In-Process Pipeline-Runner.
+
+Eine Pipeline besteht aus Stufen, die DataFrames direkt im Speicher
+weiterreichen. Auf die Platte geschrieben wird nur, was angefordert ist:
+standardmässig die finalen Outputs (processed), auf Wunsch zusätzlich die
+Zwischenstände (interim). So kostet ein kompletter Rebuild einen
+Prozessstart und ein einziges Parsen der Rohdaten.
+
+Jeder geschriebene Output bekommt einen Fingerprint (siehe cache.py).
+Stimmt er beim nächsten Lauf noch, wird die Stufe übersprungen; mit
+--force wird trotzdem alles neu gerechnet.
+
+Beispiel:
+    python -m src.pipeline.runner f1 f3 all_series --write-interim
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from src.common.io import read_table, write_table
+from src.pipeline.cache import code_fingerprint, hash_path, read_stamp, stage_fingerprint, write_stamp
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """Ablageort eines Stufen-Outputs (Format über die Dateiendung)."""
+
+    path: Path
+    partition_cols: tuple[str, ...] = ()
+    final: bool = False
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    Eine Pipeline-Stufe.
+
+    func bekommt die DataFrames aus inputs (in dieser Reihenfolge) plus
+    params als Keyword-Argumente und gibt einen DataFrame zurück, bzw. ein
+    Tupel, wenn outputs mehrere Namen hat. sources sind Dateien/Ordner, die
+    die Stufe selbst liest; sie fliessen in den Fingerprint ein.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    params: dict[str, Any] = field(default_factory=dict)
+    sources: tuple[Path, ...] = ()
+
+
+@dataclass
+class Pipeline:
+    name: str
+    stages: list[Stage]
+    artifacts: dict[str, Artifact] = field(default_factory=dict)
+
+    def stage(self, name: str) -> Stage:
+        for st in self.stages:
+            if st.name == name:
+                return st
+        raise KeyError(f"Stufe '{name}' existiert nicht in Pipeline '{self.name}'")
+
+    def producer(self, output: str) -> Stage:
+        for st in self.stages:
+            if output in st.outputs:
+                return st
+        raise KeyError(f"Kein Producer für '{output}' in Pipeline '{self.name}'")
+
+
+def _split_outputs(stage: Stage, result) -> dict[str, pd.DataFrame]:
+    if len(stage.outputs) == 1:
+        return {stage.outputs[0]: result}
+    if not isinstance(result, tuple) or len(result) != len(stage.outputs):
+        raise ValueError(
+            f"Stufe '{stage.name}' muss {len(stage.outputs)} DataFrames zurückgeben"
+        )
+    return dict(zip(stage.outputs, result))
+
+
+def _fingerprints(pipeline: Pipeline, skipped: list[Stage]) -> dict[str, str]:
+    """
+    Fingerprint je Output-Name. Outputs von übersprungenen Stufen
+    (vor start_at) werden über den Inhalt ihrer Ablage identifiziert.
+    """
+    fps: dict[str, str] = {}
+    for st in pipeline.stages:
+        if st in skipped:
+            for name in st.outputs:
+                artifact = pipeline.artifacts.get(name)
+                if artifact is not None and artifact.path.exists():
+                    fps[name] = "file:" + hash_path(artifact.path)
+            continue
+        fp = stage_fingerprint(
+            st.name,
+            code_fingerprint(st.func),
+            st.params,
+            [hash_path(src) for src in st.sources],
+            [fps[name] for name in st.inputs],
+        )
+        for name in st.outputs:
+            fps[name] = f"{fp}:{name}"
+    return fps
+
+
+def run_pipeline(
+    pipeline: Pipeline,
+    write: Iterable[str] | None = None,
+    write_interim: bool = False,
+    start_at: str | None = None,
+    force: bool = False,
+    timings: dict[str, float] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Führt die Stufen der Pipeline im selben Prozess aus.
+
+    write:         Namen der Outputs, die geschrieben werden sollen.
+                   Standard: alle Artefakte mit final=True.
+    write_interim: zusätzlich alle Zwischenstände mit Ablageort schreiben.
+    start_at:      Stufe, bei der begonnen wird. Deren Inputs werden von
+                   der Platte gelesen (z.B. nach einem manuellen Fix).
+    force:         Fingerprints ignorieren und alles neu rechnen.
+    timings:       wird (falls übergeben) mit Sekunden pro gelaufener Stufe
+                   befüllt (inkl. Schreiben der Outputs).
+
+    Outputs, deren abgelegter Fingerprint zum aktuellen passt, werden nicht
+    neu gerechnet. Stufen laufen nur, wenn ein angeforderter Output veraltet
+    ist; unveränderte Zwischenstände werden dann von der Platte gelesen.
+
+    Gibt die zuletzt gehaltenen DataFrames (die finalen Outputs) zurück.
+    """
+    if write is None:
+        to_write = {n for n, a in pipeline.artifacts.items() if a.final}
+    else:
+        to_write = set(write)
+    if write_interim:
+        to_write |= set(pipeline.artifacts)
+
+    unknown = to_write - set(pipeline.artifacts)
+    if unknown:
+        raise KeyError(f"Keine Ablage definiert für: {sorted(unknown)}")
+
+    skipped: list[Stage] = []
+    if start_at is not None:
+        skipped = pipeline.stages[: pipeline.stages.index(pipeline.stage(start_at))]
+        skipped_outputs = {n for st in skipped for n in st.outputs}
+        for st in pipeline.stages[len(skipped):]:
+            for name in st.inputs:
+                artifact = pipeline.artifacts.get(name)
+                if name in skipped_outputs and (artifact is None or not artifact.path.exists()):
+                    raise FileNotFoundError(
+                        f"Input '{name}' für Stufe '{st.name}' liegt nicht auf der Platte; "
+                        f"Start bei '{start_at}' nicht möglich"
+                    )
+
+    fps = _fingerprints(pipeline, skipped)
+
+    def is_fresh(name: str) -> bool:
+        if name not in pipeline.artifacts:
+            return False
+        if pipeline.producer(name) in skipped:
+            return True
+        return not force and read_stamp(pipeline.artifacts[name].path) == fps[name]
+
+    # Rückwärts bestimmen, welche Stufen laufen müssen und was geladen wird
+    run: set[str] = {pipeline.producer(n).name for n in to_write if not is_fresh(n)}
+    load: set[str] = set()
+    for st in reversed(pipeline.stages):
+        if st.name not in run:
+            continue
+        for name in st.inputs:
+            if is_fresh(name):
+                load.add(name)
+            else:
+                run.add(pipeline.producer(name).name)
+
+    stages = [st for st in pipeline.stages if st.name in run]
+    for st in pipeline.stages:
+        if st.name not in run and any(n in to_write for n in st.outputs):
+            print(f"[{pipeline.name}] {st.name}: unverändert, übersprungen")
+
+    # Letzte Stufe, die einen Frame braucht -> danach kann er freigegeben werden
+    last_use: dict[str, int] = {}
+    for i, st in enumerate(stages):
+        for name in st.inputs:
+            last_use[name] = i
+
+    frames: dict[str, pd.DataFrame] = {}
+    for i, st in enumerate(stages):
+        for name in st.inputs:
+            if name not in frames and name in load:
+                frames[name] = read_table(pipeline.artifacts[name].path)
+
+        t0 = time.perf_counter()
+        result = st.func(*(frames[name] for name in st.inputs), **st.params)
+        produced = _split_outputs(st, result)
+        print(f"[{pipeline.name}] {st.name}: {time.perf_counter() - t0:.2f}s")
+
+        for name, df in produced.items():
+            if name in to_write:
+                artifact = pipeline.artifacts[name]
+                write_table(df, artifact.path, partition_cols=artifact.partition_cols or None)
+                write_stamp(artifact.path, st.name, fps[name])
+                print(f"✅ {name} written to: {artifact.path}")
+        frames.update(produced)
+        if timings is not None:
+            timings[st.name] = time.perf_counter() - t0
+
+        for name in st.inputs:
+            if last_use.get(name) == i:
+                frames.pop(name, None)
+
+    return frames
+
+
+def main(argv: list[str] | None = None) -> None:
+    from src.all_series.pipeline import ALL_SERIES_PIPELINE
+    from src.pipeline.registry import discover_series
+
+    pipelines = {p.pipeline.name: p.pipeline for p in discover_series()}
+    pipelines[ALL_SERIES_PIPELINE.name] = ALL_SERIES_PIPELINE
+
+    parser = argparse.ArgumentParser(description="Serien-Pipelines im selben Prozess ausführen")
+    parser.add_argument("series", nargs="+", choices=sorted(pipelines))
+    parser.add_argument("--write-interim", action="store_true", help="Zwischenstände zusätzlich schreiben")
+    parser.add_argument("--start-at", default=None, help="Ab dieser Stufe starten (Inputs von Platte)")
+    parser.add_argument("--force", action="store_true", help="Fingerprints ignorieren, alles neu rechnen")
+    args = parser.parse_args(argv)
+
+    for name in args.series:
+        run_pipeline(
+            pipelines[name],
+            write_interim=args.write_interim,
+            start_at=args.start_at,
+            force=args.force,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Master-Tabelle über alle Serien (src/all_series/build_all_master_features.py)."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.all_series.build_all_master_features import SORT_COLUMNS, merge_series_frames
+
+
+def _frames() -> list[pd.DataFrame]:
+    f1 = pd.DataFrame(
+        {
+            "series": "F1",
+            "year": [2021, 2020],
+            "driver_name": ["B", "A"],
+            "n_races": pd.array([22, None], dtype="Int64"),
+            "is_rookie": pd.array([True, None], dtype="boolean"),
+            "wins": [3, 0],
+            "champion": [True, False],
+            "first_race": pd.to_datetime(["2021-03-28", "2020-07-05"]),
+        }
+    )
+    f3 = pd.DataFrame(
+        {
+            "series": "F3",
+            "year": [2020, 2020],
+            "driver_name": ["C", None],
+            "n_races": pd.array([18, 18], dtype="Int64"),
+            "avg_laps_down": [0.0, 0.5],
+            "team_name": ["Prema", "ART"],
+        }
+    )
+    return [f1, f3]
+
+
+def test_missing_columns_keep_dtypes_like_concat():
+    frames = _frames()
+    merged = merge_series_frames(frames)
+
+    expected = (
+        pd.concat(frames, ignore_index=True)
+        .sort_values(SORT_COLUMNS, kind="mergesort", na_position="last")
+        .reset_index(drop=True)
+    )
+    expected = expected[sorted(expected.columns)]
+
+    pd.testing.assert_frame_equal(merged, expected)
+    # nullable bleibt nullable, nicht object
+    assert merged["is_rookie"].dtype == "boolean"
+    assert merged["n_races"].dtype == "Int64"
+    assert merged["wins"].dtype == np.float64
+    assert merged["champion"].dtype == object
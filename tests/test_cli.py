@@ -0,0 +1,40 @@
+"""Einstiegspunkt 'rookie-invest' aus pyproject.toml (src/cli.py)."""
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="module")
+def pyproject() -> dict:
+    tomllib = pytest.importorskip("tomllib")
+    with open(ROOT / "pyproject.toml", "rb") as f:
+        return tomllib.load(f)
+
+
+def test_console_script_resolves(pyproject, capsys):
+    module_name, _, attr = pyproject["project"]["scripts"]["rookie-invest"].partition(":")
+    main = getattr(importlib.import_module(module_name), attr)
+
+    with pytest.raises(SystemExit) as exc:
+        main(["--help"])
+    assert exc.value.code == 0
+    assert "rookie-invest" in capsys.readouterr().out
+
+
+def test_package_discovery_finds_every_module(pyproject):
+    setuptools = pytest.importorskip("setuptools")
+    find = pyproject["tool"]["setuptools"]["packages"]["find"]
+    packages = set(setuptools.find_packages(where=str(ROOT / find["where"][0]), include=find["include"]))
+
+    module_dirs = {
+        ".".join(p.parent.relative_to(ROOT).parts)
+        for p in (ROOT / "src").rglob("*.py")
+        if "__pycache__" not in p.parts
+    }
+    # jedes Verzeichnis mit Code landet im Paket, sonst fehlt es nach der Installation
+    assert module_dirs <= packages
@@ -0,0 +1,111 @@
+"""Personen-Zuordnung über F1/F2/F3 (src/all_series/identity.py) mit kleiner Master-Tabelle."""
+from __future__ import annotations
+
+import pandas as pd
+
+from src.all_series.identity import build_mentions, build_person_crosswalk, candidate_pairs
+
+
+def _master(*mentions) -> pd.DataFrame:
+    """Eine Zeile pro (Serie, Jahr) aus (series, name, code, team, years[, driver_id])."""
+    rows = []
+    for series, name, code, team, years, *driver_id in mentions:
+        for year in years:
+            rows.append(
+                {
+                    "series": series,
+                    "year": year,
+                    "driver_id": driver_id[0] if driver_id else None,
+                    "driver_name": name,
+                    "driver_code": code,
+                    "team_name": team,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def _persons(crosswalk: pd.DataFrame) -> dict[tuple[str, str], str]:
+    return {(s, n): p for s, n, p in zip(crosswalk["series"], crosswalk["driver_name"], crosswalk["person_id"])}
+
+
+def test_different_initials_are_different_persons():
+    crosswalk = build_person_crosswalk(
+        _master(
+            ("F3", "D  Schumacher", "SCH", "Prema", [2019, 2020]),
+            ("F2", "M  Schumacher", "SCH", "Prema", [2019, 2020]),
+            ("F1", "Mick Schumacher", "MSC", "Haas", [2021, 2022], 854),
+        )
+    )
+    persons = _persons(crosswalk)
+
+    assert persons[("F2", "M  Schumacher")] == persons[("F1", "Mick Schumacher")] == "F1-854"
+    # gleicher Code, gleiches Team, passende Jahre - aber andere Initiale
+    assert persons[("F3", "D  Schumacher")] == "F3-d-schumacher-2019"
+
+
+def test_ladder_timing_window():
+    crosswalk = build_person_crosswalk(
+        _master(
+            # F3-Ende 11 Jahre vor dem F2-Start: zu lange her
+            ("F3", "K  Old", "OLD", "Team A", [2004, 2005]),
+            ("F2", "K  Old", "OLD", "Team B", [2016]),
+            # F3 noch 4 Jahre nach dem F2-Start: keine Leiter mehr
+            ("F3", "L  Late", "LAT", "Team A", [2020]),
+            ("F2", "L  Late", "LAT", "Team B", [2016]),
+            # direkter Aufstieg
+            ("F3", "N  Next", "NXT", "Team A", [2020]),
+            ("F2", "N  Next", "NXT", "Team B", [2021, 2022]),
+        )
+    )
+    persons = _persons(crosswalk)
+
+    assert persons[("F3", "K  Old")] != persons[("F2", "K  Old")]
+    assert persons[("F3", "L  Late")] != persons[("F2", "L  Late")]
+    assert persons[("F3", "N  Next")] == persons[("F2", "N  Next")] == "F3-n-next-2020"
+
+
+def test_person_has_at_most_one_mention_per_series():
+    crosswalk = build_person_crosswalk(
+        _master(
+            ("F3", "A  Iwasa", "IWA", "Hitech", [2021]),
+            ("F2", "A  Iwasa", "IWA", "DAMS", [2022, 2023]),
+            # zweite F2-Erwähnung ohne Code (andere Schreibweise im Quellsystem)
+            ("F2", "A  Iwasa", "", "DAMS", [2023]),
+        )
+    )
+
+    assert len(crosswalk) == 3
+    assert crosswalk.groupby("person_id")["series"].apply(lambda s: s.is_unique).all()
+    # der Eintrag mit Code passt besser und gewinnt
+    by_code = dict(zip(crosswalk["series"] + "|" + crosswalk["driver_code"].fillna(""), crosswalk["person_id"]))
+    assert by_code["F3|IWA"] == by_code["F2|IWA"] == "F3-a-iwasa-2021"
+    assert by_code["F2|"] != by_code["F2|IWA"]
+
+
+def test_same_name_same_start_year_gets_numbered_person_ids():
+    crosswalk = build_person_crosswalk(
+        _master(
+            ("F3", "J  Smith", "SMI", "Team A", [2020]),
+            ("F3", "J  Smith", "SMT", "Team B", [2020, 2021]),
+        )
+    )
+
+    assert sorted(crosswalk["person_id"]) == ["F3-j-smith-2020", "F3-j-smith-2020-2"]
+
+
+def test_team_year_blocks_without_shared_trigram():
+    mentions = build_mentions(
+        _master(
+            ("F3", "O  Bearman", "BEA", "Prema", [2022]),
+            ("F2", "O  Bearman", "BE1", "Prema", [2023]),
+            ("F2", "O  Bearman", "BE2", "Campos", [2023]),
+            ("F2", "O  Bearman", "BE3", "Prema", [2025]),
+        )
+    )
+    # max_postings=3: die Nachnamen-Trigramme (4 Erwähnungen) fallen weg, nur Team-Jahre blocken
+    pairs = candidate_pairs(mentions, max_postings=3)
+    keys = mentions["mention_key"].to_numpy()
+    blocked = {(keys[a], keys[b]) for a, b in zip(pairs["m_a"], pairs["m_b"])}
+
+    # Prema 2022 -> Prema 2023; anderes Team bzw. zwei Jahre später blockt nicht
+    assert blocked == {("F3|o bearman|BEA", "F2|o bearman|BE1")}
@@ -0,0 +1,212 @@
+"""Scraper gegen den lokalen FIA-Ersatzserver (src/f2/prep/fia_standin_server.py)."""
+from __future__ import annotations
+
+import shutil
+
+import pandas as pd
+import pytest
+import requests
+
+from src.f2.prep.fia_standin_server import serve_in_background
+from src.f2.prep.http_cache import HtmlCache, cache_host
+from src.f2.prep.ingest_fia import BASE_URL, scrape_races
+
+RACE_IDS = [1001, 1002, 1003, 1004]
+
+
+def _table(race_id: int, drivers: int) -> str:
+    rows = "".join(
+        f"<tr><td>{pos}</td><td>{pos} Driver {race_id}-{pos} Team</td><td>20</td>"
+        f"<td>40:0{pos}.000</td></tr>"
+        for pos in range(1, drivers + 1)
+    )
+    return (
+        "<table><thead><tr><th>POS</th><th>Number / Driver</th><th>LAPS</th><th>TIME</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table>"
+    )
+
+
+def _page(race_id: int) -> str:
+    return (
+        "<html><body>"
+        f"<h3>Sprint Race</h3>{_table(race_id, 2)}"
+        f"<h3>Feature Race</h3>{_table(race_id, 3)}"
+        "</body></html>"
+    )
+
+
+@pytest.fixture
+def pages_dir(tmp_path):
+    for race_id in RACE_IDS:
+        (tmp_path / f"{race_id}.html").write_text(_page(race_id), encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def standin(pages_dir):
+    servers = []
+
+    def start(**kwargs):
+        server, url = serve_in_background(pages_dir, **kwargs)
+        servers.append(server)
+        return url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _meta(race_ids) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"season": 2024, "round": range(1, len(race_ids) + 1), "race_id": list(race_ids)}
+    )
+
+
+def _scrape(meta, url, **kwargs):
+    params = dict(
+        base_url=url,
+        cache_dir=None,
+        requests_per_second=1000,
+        backoff_seconds=0.01,
+        max_workers=4,
+    )
+    params.update(kwargs)
+    return scrape_races(meta, **params)
+
+
+def test_retries_503_until_success(standin):
+    url = standin(fail_first=2)
+    combined, report = _scrape(_meta(RACE_IDS[:2]), url, max_retries=3)
+
+    assert report["status"].tolist() == ["ok", "ok"]
+    assert report["attempts"].tolist() == [3, 3]
+    assert len(combined) == 2 * 5
+
+
+def test_gives_up_after_max_retries(standin):
+    url = standin(fail_first=5)
+    combined, report = _scrape(_meta(RACE_IDS[:1]), url, max_retries=2)
+
+    assert combined.empty
+    assert report.loc[0, "status"] == "failed"
+    assert report.loc[0, "attempts"] == 3
+    assert "503" in report.loc[0, "error"]
+
+
+def test_4xx_fails_fast_without_retry(standin):
+    url = standin()
+    # 9999 hat keine Seite -> 404
+    combined, report = _scrape(_meta([RACE_IDS[0], 9999]), url, max_retries=3)
+
+    assert report["status"].tolist() == ["ok", "failed"]
+    assert report.loc[1, "attempts"] == 1
+    assert "404" in report.loc[1, "error"]
+    assert set(combined["race_id"]) == {RACE_IDS[0]}
+
+
+def test_timeout_is_retried(standin):
+    url = standin(delays={RACE_IDS[0]: 1.0}, slow_first=1)
+    combined, report = _scrape(_meta(RACE_IDS[:1]), url, timeout=0.2, max_retries=2)
+
+    assert report.loc[0, "status"] == "ok"
+    assert report.loc[0, "attempts"] == 2
+    assert len(combined) == 5
+
+
+def test_results_keep_meta_order_under_concurrency(standin):
+    # die ersten Rennen der Metadatei antworten am langsamsten
+    delays = {race_id: 0.05 * (len(RACE_IDS) - i) for i, race_id in enumerate(RACE_IDS)}
+    url = standin(delays=delays)
+    combined, report = _scrape(_meta(RACE_IDS), url, max_workers=len(RACE_IDS))
+
+    assert report["race_id"].tolist() == RACE_IDS
+    assert combined["race_id"].drop_duplicates().tolist() == RACE_IDS
+    assert combined["round"].drop_duplicates().tolist() == [1, 2, 3, 4]
+
+
+def test_report_has_one_row_per_race(standin):
+    url = standin()
+    meta = _meta([RACE_IDS[0], 9999, RACE_IDS[1]])
+    combined, report = _scrape(meta, url)
+
+    assert list(report.columns) == ["season", "round", "race_id", "status", "attempts", "rows", "seconds", "error"]
+    assert report["race_id"].tolist() == meta["race_id"].tolist()
+    assert report["status"].tolist() == ["ok", "failed", "ok"]
+    assert report["rows"].tolist() == [5, 0, 5]
+    assert report.loc[report["status"] == "ok", "error"].eq("").all()
+    assert (report["seconds"] >= 0).all()
+    assert report["rows"].sum() == len(combined)
+    # Session-Labels kommen aus den Überschriften der Seite
+    assert combined.groupby("session").size().to_dict() == {"Feature Race": 6, "Sprint Race": 4}
+
+
+def test_cache_is_separated_by_host(standin, tmp_path):
+    cache_dir = tmp_path / "cache"
+    url = standin()
+    meta = _meta(RACE_IDS[:2])
+    _, report = _scrape(meta, url, cache_dir=cache_dir)
+    assert report["status"].tolist() == ["ok", "ok"]
+
+    # Seiten des Ersatzservers liegen unter dessen Host, nicht unter dem der FIA
+    host_dirs = [p.name for p in cache_dir.iterdir()]
+    assert host_dirs == [cache_host(url)]
+    assert cache_host(url) != cache_host(BASE_URL)
+
+    # offline gegen die echte FIA-URL: nichts im Cache
+    combined, report = _scrape(meta, BASE_URL, cache_dir=cache_dir, offline=True)
+    assert combined.empty
+    assert report["status"].tolist() == ["failed", "failed"]
+
+    # offline gegen den Ersatzserver: Replay aus dessen Cache
+    combined, report = _scrape(meta, url, cache_dir=cache_dir, offline=True)
+    assert report["status"].tolist() == ["ok", "ok"]
+    assert len(combined) == 10
+
+
+def test_cache_ignores_entries_from_another_host(standin, tmp_path):
+    cache_dir = tmp_path / "cache"
+    url = standin()
+    _scrape(_meta(RACE_IDS[:1]), url, cache_dir=cache_dir)
+
+    # Eintrag von Hand in den FIA-Ordner kopiert
+    fia_dir = cache_dir / cache_host(BASE_URL)
+    shutil.copytree(cache_dir / cache_host(url), fia_dir)
+    assert HtmlCache(BASE_URL, cache_dir).get(RACE_IDS[0]) is None
+
+
+def test_second_online_scrape_revalidates_from_cache(standin, tmp_path):
+    cache_dir = tmp_path / "cache"
+    url = standin()
+    meta = _meta(RACE_IDS[:2])
+    _scrape(meta, url, cache_dir=cache_dir)
+    cache = HtmlCache(url, cache_dir)
+    assert cache.get(RACE_IDS[0])[1].revalidated_at is None
+
+    # Markierung im gecachten HTML: kommt sie zurück, stammt die Seite aus dem Cache (304)
+    html_path = cache.html_path(RACE_IDS[0])
+    html_path.write_text(
+        html_path.read_text(encoding="utf-8").replace("Driver 1001-1", "Cached 1001-1"), encoding="utf-8"
+    )
+
+    combined, report = _scrape(meta, url, cache_dir=cache_dir)
+    assert report["status"].tolist() == ["ok", "ok"]
+    assert report["attempts"].tolist() == [1, 1]
+    assert combined["number_driver_team"].str.contains("Cached 1001-1").sum() == 2
+    for race_id in RACE_IDS[:2]:
+        html, entry = cache.get(race_id)
+        assert entry.revalidated_at is not None
+        assert entry.etag
+
+
+def test_304_without_cache_entry_is_an_error(standin, tmp_path):
+    url = standin()
+    cache = HtmlCache(url, tmp_path / "cache")
+    race_url = url.format(race_id=RACE_IDS[0])
+    with requests.Session() as session:
+        etag = session.get(race_url, timeout=5).headers["ETag"]
+        # bedingter Request, obwohl der Cache leer ist -> Server antwortet 304
+        session.headers["If-None-Match"] = etag
+        with pytest.raises(requests.HTTPError, match="304"):
+            cache.fetch(session, RACE_IDS[0], race_url, timeout=5)
+    assert cache.get(RACE_IDS[0]) is None
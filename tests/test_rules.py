@@ -0,0 +1,133 @@
+"""Regel-Compiler der Knowledge Base (src/knowledge_base/rules.py)."""
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from src.knowledge_base.rules import compile_rules, load_rule_set
+
+CRITERIA = {
+    "limits": {"min_age": 18, "max_age": 30, "nations": ["USA", "CHN"], "section": {"a": 1}},
+}
+INPUTS = {
+    "age": {"type": "number", "default": 20},
+    "nationality": {"type": "text", "default": ""},
+    "licensed": {"type": "bool", "default": False},
+}
+
+
+def _compile(expr: str, rule_type: str = "flag"):
+    raw = {"inputs": INPUTS, "rules": {"x": {"group": "eligibility", "type": rule_type, "expr": expr}}}
+    return compile_rules(raw, CRITERIA)
+
+
+def _eval(expr: str, rule_type: str = "flag", **columns) -> list:
+    df = pd.DataFrame(columns or {"age": [10, 20, 40]})
+    return _compile(expr, rule_type).evaluate(df)["x"].tolist()
+
+
+@pytest.mark.parametrize(
+    "expr, message",
+    [
+        ("__import__('os')", "erlaubte Funktionen"),
+        ("age.real > 0", "nur kb.<pfad>"),
+        ("age ** 2", "nicht erlaubter Ausdruck"),
+        ("age is None", "nicht erlaubter Vergleich"),
+        ("[a for a in kb.limits.nations]", "nicht erlaubter Ausdruck"),
+        ("(lambda: 1)()", "erlaubte Funktionen"),
+        ("max(age)", "braucht 2 Argument"),
+        ("weight_kg > 70", "unbekannte Eingabe 'weight_kg'"),
+        ("age >", "Syntaxfehler"),
+    ],
+)
+def test_rejects_expressions_outside_the_whitelist(expr, message):
+    with pytest.raises(ValueError, match=message):
+        _compile(expr)
+
+
+@pytest.mark.parametrize(
+    "expr, message",
+    [
+        ("age > kb.limits.missing", "kb.limits.missing gibt es"),
+        ("age > kb.nope.min_age", "kb.nope.min_age gibt es"),
+        ("age > kb.limits.min_age.deeper", "kb.limits.min_age.deeper gibt es"),
+        ("age > kb.limits.section", "keine Zahl"),
+        ("nationality == kb.limits.nations", "keine Zahl"),
+        ("nationality in kb.limits.min_age", "muss eine Liste stehen"),
+        ("nationality in nationality", "rechts von 'in'"),
+    ],
+)
+def test_reports_bad_kb_paths(expr, message):
+    with pytest.raises(ValueError, match=message):
+        _compile(expr)
+
+
+def test_chained_comparison():
+    assert _eval("kb.limits.min_age <= age <= kb.limits.max_age", age=[17, 18, 30, 31]) == [0, 1, 1, 0]
+    assert _eval("0 < age < 100 != age", age=[50, 100]) == [1, 0]
+
+
+def test_in_and_not_in():
+    nations = ["USA", "CH", "CHN", ""]
+    assert _eval("nationality in kb.limits.nations", nationality=nations) == [1, 0, 1, 0]
+    assert _eval("nationality not in ['USA', 'CH']", nationality=nations) == [0, 0, 1, 1]
+    # fehlende Spalte -> Default aus inputs
+    assert _eval("nationality in ['']", age=[1, 2]) == [1, 1]
+    with pytest.raises(ValueError, match="nicht mit weiteren Vergleichen"):
+        _compile("nationality in ['USA'] == True")
+
+
+@pytest.mark.parametrize(
+    "expr, expected",
+    [
+        ("age > 18 and 1 > 0", [0, 1, 1]),
+        ("age > 18 and kb.limits.min_age > 0", [0, 1, 1]),
+        ("1 > 0 and age > 18 and age < 30", [0, 1, 0]),
+        ("1 > 2 or age > 30", [0, 0, 1]),
+        ("1 > 0 or age > 30", [1, 1, 1]),
+        ("not (1 > 2) and age > 18", [0, 1, 1]),
+        ("'USA' in kb.limits.nations and age > 18", [0, 1, 1]),
+        ("licensed or age > 30", [0, 0, 1]),
+        ("1 > 0", [1, 1, 1]),
+    ],
+)
+def test_constants_broadcast_against_columns(expr, expected):
+    assert _eval(expr) == expected
+
+
+def test_score_with_constant_branches():
+    assert _eval("1.0 if age >= kb.limits.min_age else 0.5", rule_type="score") == [0.5, 1.0, 1.0]
+    assert _eval("max(0, 1.0 - abs(age - 20) * 0.1)", rule_type="score") == pytest.approx([0.0, 1.0, 0.0])
+    assert _eval("2.0 if 1 > 0 else age", rule_type="score") == [2.0, 2.0, 2.0]
+
+
+def test_constant_rule_on_empty_frame():
+    assert _compile("age > 18 and 1 > 0").evaluate(pd.DataFrame({"age": []}))["x"].tolist() == []
+
+
+def test_shipped_rules_batch_matches_single_rows():
+    rules = load_rule_set()
+    drivers = pd.DataFrame(
+        {
+            "age": [17, 16, 24],
+            "nationality": ["USA", "CH", "CHN"],
+            "superlicense_points": [40, 40, 10],
+            "junior_series_years": [2, 2, 3],
+            "team_name": ["Ferrari", "Williams", "Ferrari"],
+            "sponsor_capital_chf": [0.0, 1e12, 1e5],
+            "weight_kg": [70, 60, 80],
+        }
+    )
+    batch = rules.evaluate(drivers)
+
+    assert batch.columns.tolist() == rules.features
+    assert batch["f1_qualified"].tolist() == [1, 0, 0]
+    assert batch["f1_marketing_boost"].tolist() == [1, 0, 1]
+    assert batch["team_political_power"].tolist() == [1, 0, 1]
+    assert batch["phys_weight_score"].tolist() == pytest.approx([1.0, 0.5, 0.5])
+    assert batch["financial_viability"].iloc[1] == 1.0
+    # Fahrzeug-Eingaben fehlen ganz -> Defaults
+    assert batch[["vehicle_engine_damaged", "vehicle_tire_damaged", "aero_mode_attack"]].eq(0).all().all()
+
+    for i, row in enumerate(drivers.to_dict("records")):
+        assert rules.evaluate_one(row) == pytest.approx(batch.iloc[i].to_dict())
@@ -0,0 +1,92 @@
+"""Season-Aggregation aus der Feature-Config (src/common/season_agg.py)."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.common.season_agg import aggregate_groups, parse_feature_spec
+
+RAW_SPEC = {
+    "group_by": ["year", "driver_id"],
+    "features": {
+        "n_races": {"column": "race_id", "stat": "nunique"},
+        "n_finishes": {"column": "pos", "stat": "count"},
+        "total_points": {"column": "points", "stat": "sum"},
+        "avg_points": {"column": "points", "stat": "mean"},
+        "points_std": {"column": "points", "stat": "std"},
+        "best_finish": {"column": "pos", "stat": "min"},
+        "worst_finish": {"column": "pos", "stat": "max"},
+        "total_laps": {"column": "laps", "stat": "sum"},
+        "wins": {"column": "pos", "stat": "count_eq", "value": 1},
+        "podiums": {"column": "pos", "stat": "count_le", "value": 3},
+        "dnf_count": {"column": "is_dnf", "stat": "sum"},
+    },
+    "ratios": {"win_rate": ["wins", "n_races"]},
+}
+
+
+def _races(n: int = 400, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    pos = pd.array(rng.integers(1, 21, n), dtype="Int64")
+    pos[rng.random(n) < 0.1] = pd.NA
+    driver = rng.integers(0, 15, n).astype(float)
+    driver[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame(
+        {
+            "year": rng.integers(2020, 2024, n),
+            "driver_id": driver,
+            "race_id": rng.integers(0, 40, n),
+            "points": np.where(rng.random(n) < 0.1, np.nan, rng.uniform(0, 25, n)),
+            "pos": pos,
+            "laps": rng.integers(0, 60, n),
+            "is_dnf": rng.random(n) < 0.2,
+        }
+    )
+
+
+def _expected(df: pd.DataFrame, dropna: bool) -> pd.DataFrame:
+    pos = df["pos"]
+    out = (
+        df.assign(
+            _win=(pos == 1).to_numpy(dtype=bool, na_value=False),
+            _podium=(pos <= 3).to_numpy(dtype=bool, na_value=False),
+        )
+        .groupby(["year", "driver_id"], dropna=dropna)
+        .agg(
+            n_races=("race_id", "nunique"),
+            n_finishes=("pos", "count"),
+            total_points=("points", "sum"),
+            avg_points=("points", "mean"),
+            points_std=("points", "std"),
+            best_finish=("pos", "min"),
+            worst_finish=("pos", "max"),
+            total_laps=("laps", "sum"),
+            wins=("_win", "sum"),
+            podiums=("_podium", "sum"),
+            dnf_count=("is_dnf", "sum"),
+        )
+        .reset_index()
+    )
+    out["win_rate"] = out["wins"] / out["n_races"]
+    return out
+
+
+@pytest.mark.parametrize("dropna", [True, False])
+def test_matches_pandas_groupby_exactly(dropna):
+    df = _races()
+    result = aggregate_groups(df, parse_feature_spec("test", {**RAW_SPEC, "dropna": dropna}))
+
+    # exakt, inkl. Spaltentypen (nullable Int64 bleibt Int64)
+    pd.testing.assert_frame_equal(result, _expected(df, dropna), check_exact=True)
+    assert result["driver_id"].isna().any() == (not dropna)
+
+
+def test_rejects_unknown_stat_and_dangling_ratio():
+    with pytest.raises(ValueError, match="unbekannte Statistik 'median'"):
+        parse_feature_spec("x", {"group_by": ["a"], "features": {"m": {"column": "b", "stat": "median"}}})
+    with pytest.raises(ValueError, match=r"verweist auf \['n'\]"):
+        parse_feature_spec(
+            "x",
+            {"group_by": ["a"], "features": {"s": {"column": "b", "stat": "sum"}}, "ratios": {"r": ["s", "n"]}},
+        )
@@ -0,0 +1,224 @@
+"""Scoring-Server (src/demo/serve.py) mit einem kleinen, frisch trainierten Modell."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.demo.serve import ScoringService, make_server
+from src.knowledge_base.racing_intelligence_engine import RacingIntelligenceEngine
+
+FEATURES = ["n_races", "total_points", "avg_finish"]
+DROP_COLS = ["driver_code"]
+
+
+def _fit_model() -> Pipeline:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(
+        {
+            "n_races": rng.integers(5, 25, 60).astype(float),
+            "total_points": rng.uniform(0, 300, 60),
+            "avg_finish": rng.uniform(1, 20, 60),
+        }
+    )
+    y = (X["total_points"] > 150).astype(int)
+    numeric = Pipeline([("imputer", SimpleImputer(strategy="median")), ("scaler", StandardScaler())])
+    return Pipeline(
+        [
+            ("preprocessor", ColumnTransformer([("num", numeric, FEATURES)])),
+            ("clf", LogisticRegression()),
+        ]
+    ).fit(X, y)
+
+
+class _FlakyModel:
+    """Das Modell, aber predict_proba scheitert an n_races < 0 und kann bremsen."""
+
+    def __init__(self, model: Pipeline, delay: float = 0.0):
+        self.model = model
+        self.delay = delay
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def predict_proba(self, X):
+        time.sleep(self.delay)
+        if (pd.to_numeric(X["n_races"]) < 0).any():
+            raise RuntimeError("n_races < 0")
+        return self.model.predict_proba(X)
+
+
+def _driver(code: str, n_races=10, **extra) -> dict:
+    return {"driver_code": code, "n_races": n_races, "total_points": 120.0, "avg_finish": 7.5, **extra}
+
+
+@pytest.fixture(scope="module")
+def model():
+    return _fit_model()
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return RacingIntelligenceEngine()
+
+
+@pytest.fixture
+def service(model, engine):
+    services = []
+
+    def start(delay: float = 0.0, **kwargs):
+        svc = ScoringService(_FlakyModel(model, delay), DROP_COLS, engine, **kwargs)
+        services.append(svc)
+        return svc
+
+    yield start
+    for svc in services:
+        svc.close()
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(svc: ScoringService) -> str:
+        srv = make_server(svc, port=0)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+        return f"http://127.0.0.1:{srv.server_port}"
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+
+
+def _strict_json(body: bytes):
+    """Wie json.loads, aber NaN/Infinity (kein gültiges JSON) sind ein Fehler."""
+
+    def reject(constant):
+        raise ValueError(f"ungültiges JSON: {constant}")
+
+    return json.loads(body, parse_constant=reject)
+
+
+def _post(url: str, payload) -> tuple[int, dict]:
+    request = urllib.request.Request(f"{url}/score", data=json.dumps(payload).encode("utf-8"))
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, _strict_json(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, _strict_json(exc.read())
+
+
+def _concurrently(func, items) -> list:
+    """Alle Aufrufe gleichzeitig; Ergebnis oder Exception pro Aufruf."""
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        return list(pool.map(call, items))
+
+
+def test_failing_request_does_not_fail_its_batch(service):
+    # langes Sammelfenster: alle drei Anfragen landen im selben Batch
+    svc = service(max_wait_ms=300)
+    requests = [[_driver("AAA")], [_driver("BAD", n_races=-1)], [_driver("CCC"), _driver("DDD")]]
+    good, bad, pair = _concurrently(svc.score, requests)
+
+    assert isinstance(bad, RuntimeError)
+    assert [r["driver_code"] for r in good] == ["AAA"]
+    assert [r["driver_code"] for r in pair] == ["CCC", "DDD"]
+    assert svc.metrics.batches == 1
+    # Ergebnis wie allein bewertet
+    assert good[0] == svc.score([_driver("AAA")])[0]
+
+
+def test_non_numeric_feature_is_rejected_before_queueing(service):
+    svc = service()
+    with pytest.raises(ValueError, match=r"keine Zahlen: \['n_races'\]"):
+        svc.score([_driver("AAA"), _driver("BAD", n_races="abc")])
+    with pytest.raises(ValueError, match="total_points"):
+        svc.score([_driver("BAD", total_points=[1, 2])])
+    assert svc.metrics.batches == 0
+
+    # Zahlen als Text und fehlende Werte liest das Modell
+    results = svc.score([_driver("AAA", n_races="12"), _driver("BBB", n_races=None)])
+    assert len(results) == 2
+
+
+def test_http_bad_input_is_400_without_affecting_others(service, server):
+    url = server(service(max_wait_ms=100))
+    payloads = [_driver("AAA"), _driver("BAD", n_races="abc"), [_driver("CCC"), _driver("DDD")]]
+    (s1, r1), (s2, r2), (s3, r3) = _concurrently(lambda p: _post(url, p), payloads)
+
+    assert (s1, s2, s3) == (200, 400, 200)
+    assert "n_races" in r2["error"]
+    assert [r["driver_code"] for r in r1["results"] + r3["results"]] == ["AAA", "CCC", "DDD"]
+    assert 0.0 <= r1["results"][0]["predicted_probability"] <= 1.0
+
+    status, body = _post(url, {"driver_code": "AAA"})
+    assert status == 400 and "fehlen" in body["error"]
+
+
+def test_mixed_keys_in_one_request_score_like_single_rows(service):
+    svc = service()
+    rows = [_driver("AAA", weight_kg=95, series="F2"), _driver("BBB")]
+    mixed = svc.score(rows)
+
+    # ohne weight_kg gilt der Default der KB, nicht das NaN aus der anderen Zeile
+    assert mixed == [svc.score([row])[0] for row in rows]
+    assert mixed[1]["phys_weight_score"] == 1.0
+    assert mixed[0]["phys_weight_score"] < 1.0
+    # ID-Spalten nur, wo die Zeile sie hat
+    assert mixed[0]["series"] == "F2"
+    assert "series" not in mixed[1]
+
+
+def test_http_response_is_valid_json_for_mixed_keys(service, server):
+    url = server(service())
+    status, body = _post(url, [_driver("AAA", year=2024), _driver("BBB", year=None), _driver("CCC")])
+
+    assert status == 200
+    results = body["results"]
+    assert [r.get("year", "-") for r in results] == [2024, None, "-"]
+
+
+def test_http_timeout_is_503(service, server):
+    svc = service(delay=0.5, request_timeout_s=0.05)
+    url = server(svc)
+    status, body = _post(url, _driver("AAA"))
+
+    assert status == 503
+    assert "0.05" in body["error"]
+    assert svc.metrics.errors == 1
+
+
+def test_timed_out_request_is_not_scored(service):
+    svc = service(delay=0.3)
+    # erste Anfrage belegt den Worker, die zweite läuft in der Warteschlange ab
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(svc.score, [_driver("AAA")])
+        time.sleep(0.05)
+        with pytest.raises(FutureTimeout):
+            svc.score([_driver("BBB")], timeout=0.05)
+        assert len(first.result()) == 1
+
+    assert svc.score([_driver("CCC")])[0]["driver_code"] == "CCC"
+    assert svc.metrics.batches == 2